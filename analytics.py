@@ -0,0 +1,211 @@
+import sqlite3
+import threading
+import time
+
+from persistence import WriteBehindQueue
+
+EVENT_KINDS = ("view", "like", "save", "watch")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS events (
+        seq INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        kind TEXT NOT NULL,
+        user_id TEXT,
+        reel_id TEXT NOT NULL,
+        topic TEXT,
+        value REAL NOT NULL DEFAULT 1
+    );
+    CREATE INDEX IF NOT EXISTS events_likes ON events (user_id, reel_id, ts, value) WHERE kind = 'like';
+    CREATE TABLE IF NOT EXISTS rollup_reel (
+        reel_id TEXT PRIMARY KEY,
+        views INTEGER NOT NULL DEFAULT 0,
+        likes INTEGER NOT NULL DEFAULT 0,
+        watch_seconds REAL NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS rollup_reel_views ON rollup_reel (views DESC);
+    CREATE TABLE IF NOT EXISTS rollup_topic (
+        topic TEXT PRIMARY KEY,
+        views INTEGER NOT NULL DEFAULT 0,
+        likes INTEGER NOT NULL DEFAULT 0,
+        watch_seconds REAL NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS rollup_day (
+        day TEXT PRIMARY KEY,
+        views INTEGER NOT NULL DEFAULT 0,
+        likes INTEGER NOT NULL DEFAULT 0,
+        watch_seconds REAL NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS rollup_checkpoint (
+        name TEXT PRIMARY KEY,
+        seq INTEGER NOT NULL
+    );
+"""
+
+# Aggregate one seq range of raw events into a rollup table. SQLite does the
+# GROUP BY, so memory stays proportional to the number of distinct keys in
+# the chunk rather than the size of the log.
+ROLLUP_SQL = """
+    INSERT INTO rollup_{name} ({key}, views, likes, watch_seconds)
+    SELECT {expr},
+           SUM(kind = 'view'),
+           SUM(CASE WHEN kind = 'like' THEN value ELSE 0 END),
+           SUM(CASE WHEN kind = 'watch' THEN value ELSE 0 END)
+    FROM events
+    WHERE seq > ? AND seq <= ?
+    GROUP BY 1
+    ON CONFLICT ({key}) DO UPDATE SET
+        views = views + excluded.views,
+        likes = likes + excluded.likes,
+        watch_seconds = watch_seconds + excluded.watch_seconds
+"""
+ROLLUPS = (
+    ("reel", "reel_id", "reel_id"),
+    ("topic", "topic", "COALESCE(topic, 'Other')"),
+    ("day", "day", "date(ts, 'unixepoch')"),
+)
+
+
+def connect(path: str):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class EventLog:
+    """Append-only log of view / like / save / watch events.
+
+    Appends are queued and inserted in batches on a background thread. Like
+    and save events carry +1, or -1 to undo; a watch event carries seconds.
+    """
+
+    def __init__(self, path: str = "bite_sized.db", max_batch: int = 1000, flush_interval: float = 0.25):
+        self.path = path
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(self._insert, max_batch, flush_interval, name="event-log-writer")
+
+    def _insert(self, rows):
+        if self._writer_conn is None:
+            self._writer_conn = connect(self.path)
+        with self._writer_conn as conn:
+            conn.executemany(
+                "INSERT INTO events (ts, kind, user_id, reel_id, topic, value) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def append(self, kind: str, reel_id: str, topic: str = None, user_id: str = None, value: float = 1, ts: float = None):
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind: {kind!r}")
+        self._writes.put((ts or time.time(), kind, user_id, reel_id, topic, value))
+
+    def recent_likes(self, user_id: str, limit: int):
+        """The ``limit`` reels ``user_id`` liked most recently and has not unliked since, oldest first."""
+        with connect(self.path) as conn:
+            rows = conn.execute(
+                "SELECT reel_id FROM events WHERE user_id = ? AND kind = 'like' "
+                "GROUP BY reel_id HAVING SUM(value) > 0 ORDER BY MAX(ts) DESC LIMIT ?",
+                (user_id, limit),
+            ).fetchall()
+        return [reel_id for (reel_id,) in reversed(rows)]
+
+    def flush(self, timeout: float = None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()
+
+
+class RollupEngine:
+    """Folds new events into per-reel, per-topic and per-day totals.
+
+    Progress is tracked by a checkpoint on the event ``seq``; each chunk of
+    events and the checkpoint move are committed together, so restarts resume
+    exactly where the last run stopped and nothing is counted twice.
+    """
+
+    def __init__(self, path: str = "bite_sized.db", chunk_size: int = 100_000):
+        self.path = path
+        self.chunk_size = chunk_size
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def catch_up(self, max_chunks: int = None) -> int:
+        """Roll up pending events; returns how many were folded in."""
+        processed = 0
+        with self._lock, connect(self.path) as conn:
+            row = conn.execute("SELECT seq FROM rollup_checkpoint WHERE name = 'events'").fetchone()
+            checkpoint = row[0] if row else 0
+            (head,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()
+            chunks = 0
+            while checkpoint < head and (max_chunks is None or chunks < max_chunks):
+                upper = min(checkpoint + self.chunk_size, head)
+                with conn:
+                    for name, key, expr in ROLLUPS:
+                        conn.execute(ROLLUP_SQL.format(name=name, key=key, expr=expr), (checkpoint, upper))
+                    conn.execute(
+                        "INSERT INTO rollup_checkpoint (name, seq) VALUES ('events', ?) "
+                        "ON CONFLICT (name) DO UPDATE SET seq = excluded.seq",
+                        (upper,),
+                    )
+                processed += conn.execute(
+                    "SELECT COUNT(*) FROM events WHERE seq > ? AND seq <= ?", (checkpoint, upper)
+                ).fetchone()[0]
+                checkpoint = upper
+                chunks += 1
+        return processed
+
+    def start(self, interval: float = 2.0):
+        """Keep rolling up in a daemon thread every ``interval`` seconds."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="rollup-engine", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.catch_up()
+
+    def _rows(self, sql, params=()):
+        with connect(self.path) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def top_reels(self, limit: int = 20):
+        return self._rows(
+            "SELECT reel_id, views, likes, watch_seconds FROM rollup_reel ORDER BY views DESC LIMIT ?",
+            (limit,),
+        )
+
+    def reel_totals(self, reel_ids):
+        reel_ids = list(reel_ids)
+        if not reel_ids:
+            return []
+        placeholders = ", ".join("?" * len(reel_ids))
+        return self._rows(
+            f"SELECT reel_id, views, likes, watch_seconds FROM rollup_reel WHERE reel_id IN ({placeholders})",
+            reel_ids,
+        )
+
+    def topic_totals(self):
+        return self._rows("SELECT topic, views, likes, watch_seconds FROM rollup_topic ORDER BY views DESC")
+
+    def daily_totals(self, days: int = 30):
+        rows = self._rows(
+            "SELECT day, views, likes, watch_seconds FROM rollup_day ORDER BY day DESC LIMIT ?", (days,)
+        )
+        return rows[::-1]
+
+    def overall_totals(self) -> dict:
+        (row,) = self._rows(
+            "SELECT COALESCE(SUM(views), 0) AS views, COALESCE(SUM(likes), 0) AS likes, "
+            "COALESCE(SUM(watch_seconds), 0) AS watch_seconds FROM rollup_topic"
+        )
+        return row
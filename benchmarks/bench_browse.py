@@ -0,0 +1,81 @@
+"""Faceted browse: FacetIndex bitmap filters vs. a Python loop that re-parses every reel per rerun.
+
+Usage: python benchmarks/bench_browse.py [--reels 1000000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from browse import FacetIndex  # noqa: E402
+from catalog import ReelCatalog  # noqa: E402
+from media import parse_duration  # noqa: E402
+from synthetic import make_reels  # noqa: E402
+
+
+def loop_filter(reels, selected, seconds, min_popularity):
+    """What a browse rerun costs without precomputed columns: parse and compare every reel."""
+    lo, hi = seconds
+    matches = [
+        reel
+        for reel in reels
+        if all(not values or reel[facet] in values for facet, values in selected.items())
+        and lo <= parse_duration(reel["duration"]) <= hi
+        and reel["likes"] + reel["saves"] >= min_popularity
+    ]
+    matches.sort(key=lambda reel: -(reel["likes"] + reel["saves"]))
+    return len(matches), matches[:20]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reels", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    reels = make_reels(args.reels)
+    catalog = ReelCatalog(reels)
+    start = time.perf_counter()
+    index = FacetIndex(catalog)
+    print(f"{args.reels:,} reels: FacetIndex built in {time.perf_counter() - start:.2f} s")
+
+    rng = random.Random(3)
+    topics, difficulties, creators = index.values("topic"), index.values("difficulty"), index.values("creator_id")
+    queries = [
+        (
+            {
+                "topic": set(rng.sample(topics, 2)),
+                "difficulty": set(rng.sample(difficulties, 1)),
+                "creator_id": set(rng.sample(creators, rng.choice((0, 5, 50)))),
+            },
+            (40, 75),
+            rng.choice((0, 1000, 3000)),
+        )
+        for _ in range(args.queries)
+    ]
+    def timed(run, batch):
+        timings, totals = [], []
+        for selected, seconds, min_popularity in batch:
+            start = time.perf_counter()
+            totals.append(run(selected, seconds, min_popularity))
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1e3, totals
+
+    indexed_ms, indexed_totals = timed(
+        lambda selected, seconds, min_popularity: index.query(
+            selected, {"seconds": seconds, "popularity": (min_popularity or None, None)}
+        )[0],
+        queries,
+    )
+    loop_ms, loop_totals = timed(lambda *query: loop_filter(reels, *query)[0], queries[:3])
+    assert loop_totals == indexed_totals[:3], (loop_totals, indexed_totals[:3])
+    print(f"  FacetIndex.query (filter, facet counts, page): {indexed_ms:9.1f} ms")
+    print(f"  Python loop (filter, page):                    {loop_ms:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
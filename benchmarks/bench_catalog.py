@@ -0,0 +1,54 @@
+"""Compare ReelCatalog id lookups against the old linear scan over REELS.
+
+Usage: python benchmarks/bench_catalog.py [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from catalog import ReelCatalog  # noqa: E402
+from synthetic import make_reels  # noqa: E402
+
+
+def linear_get(reels, reel_id):
+    return next((reel for reel in reels if reel["id"] == reel_id), None)
+
+
+def time_lookups(lookup, ids):
+    start = time.perf_counter()
+    for reel_id in ids:
+        lookup(reel_id)
+    return (time.perf_counter() - start) / len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--scan-lookups", type=int, default=50)
+    parser.add_argument("--index-lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    print(f"{'reels':>10} {'build ms':>10} {'scan us/op':>12} {'index us/op':>12} {'speedup':>10}")
+    for size in args.sizes:
+        reels = make_reels(size)
+        start = time.perf_counter()
+        catalog = ReelCatalog(reels)
+        build = time.perf_counter() - start
+
+        ids = [f"r{rng.randint(1, size)}" for _ in range(args.index_lookups)]
+        scan = time_lookups(lambda rid: linear_get(reels, rid), ids[: args.scan_lookups])
+        indexed = time_lookups(catalog.get, ids)
+        print(
+            f"{size:>10,} {build * 1e3:>10.1f} {scan * 1e6:>12.1f} "
+            f"{indexed * 1e6:>12.3f} {scan / indexed:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Process memory and lookup cost of the memory-mapped Arrow catalog vs. in-module reel dicts.
+
+Each variant runs in a fresh process. Private (anonymous) RSS is what every
+Streamlit process pays on its own; file-backed RSS is page cache shared by
+all processes that map the same catalog file.
+
+Usage: python benchmarks/bench_catalog_file.py [--size 1000000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(Path(__file__).resolve().parent)]
+
+from catalog import ReelCatalog  # noqa: E402
+from catalog_file import CatalogFile, write_catalog  # noqa: E402
+from synthetic import make_reels  # noqa: E402
+
+
+def rss_kib() -> dict:
+    """RssAnon / RssFile from /proc (Linux); elsewhere only the peak RSS is available."""
+    try:
+        with open("/proc/self/status") as fh:
+            fields = dict(line.split(":", 1) for line in fh)
+        return {key: int(fields[key].split()[0]) for key in ("RssAnon", "RssFile")}
+    except OSError:
+        import resource
+
+        return {"RssAnon": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "RssFile": 0}
+
+
+def worker(variant: str, size: int, path: str) -> dict:
+    import pyarrow  # noqa: F401  (imported up front so it is part of the baseline)
+
+    ids = [f"r{i}" for i in range(1, size + 1, max(1, size // 10_000))]
+    before = rss_kib()
+    start = time.perf_counter()
+    if variant == "dicts":
+        catalog = ReelCatalog(make_reels(size))
+    else:
+        catalog = CatalogFile(path).snapshot.reels
+    load_s = time.perf_counter() - start
+    timings = []
+    for reel_id in ids:
+        t = time.perf_counter()
+        catalog.get(reel_id)
+        timings.append(time.perf_counter() - t)
+    after = rss_kib()
+    start = time.perf_counter()
+    reels = sum(1 for _ in catalog)
+    iterate_s = time.perf_counter() - start
+    return {
+        "load_s": round(load_s, 2),
+        "get_us": round(statistics.median(timings) * 1e6, 2),
+        "iterate_s": round(iterate_s, 2),
+        "reels": reels,
+        "private_mib": round((after["RssAnon"] - before["RssAnon"]) / 1024, 1),
+        "shared_mib": round((after["RssFile"] - before["RssFile"]) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--worker", choices=("dicts", "arrow"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.size, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.arrow")
+        start = time.perf_counter()
+        write_catalog(path, make_reels(args.size))
+        print(
+            f"wrote {args.size:,} reels in {time.perf_counter() - start:.1f} s "
+            f"({os.path.getsize(path) / 2**20:.0f} MiB)"
+        )
+        for variant in ("dicts", "arrow"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", variant, "--size", str(args.size), "--path", path],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(
+                f"  {variant:<6} load {r['load_s']:6.2f} s  get {r['get_us']:6.2f} µs  "
+                f"iterate {r['iterate_s']:5.2f} s  private {r['private_mib']:7.1f} MiB  "
+                f"shared {r['shared_mib']:6.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
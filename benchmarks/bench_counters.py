@@ -0,0 +1,140 @@
+"""Global like / save / view counters under contention: sharded in-memory counters vs. one lock vs. a write per click.
+
+Every thread increments reels drawn from a Zipf distribution, so a few hot
+reels take most of the clicks, as they would on a popular feed.
+
+Usage: python benchmarks/bench_counters.py [--threads 1 8 32] [--clicks 20000] [--reels 10000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analytics import connect  # noqa: E402
+from counters import REEL_COUNTERS, EngagementCounters  # noqa: E402
+
+
+class GlobalLockCounters:
+    """The naive version: one dict behind one lock for every reel."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def incr(self, reel_id, counter, amount=1):
+        field = REEL_COUNTERS.index(counter)
+        with self.lock:
+            counts = self.counts.get(reel_id)
+            if counts is None:
+                counts = self.counts[reel_id] = [0, 0, 0]
+            counts[field] += amount
+
+
+class PerClickWrites:
+    """An UPDATE committed on every click, one connection per thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        with connect(path) as conn:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS clicks (reel_id TEXT PRIMARY KEY, likes INTEGER, saves INTEGER, "
+                "views INTEGER) WITHOUT ROWID"
+            )
+
+    def incr(self, reel_id, counter, amount=1):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = connect(self.path)
+        with conn:
+            conn.execute(
+                f"INSERT INTO clicks (reel_id, likes, saves, views) VALUES (?, 0, 0, 0) "
+                f"ON CONFLICT (reel_id) DO UPDATE SET {counter} = {counter} + ?",
+                (reel_id, amount),
+            )
+
+
+def zipf_clicks(n, reels, seed, skew=1.1):
+    rng = random.Random(seed)
+    ids = [f"r{i + 1}" for i in range(reels)]
+    weights = [1 / (rank + 1) ** skew for rank in range(reels)]
+    return [(reel_id, rng.choice(REEL_COUNTERS)) for reel_id in rng.choices(ids, weights, k=n)]
+
+
+def hammer(counters, threads, clicks_per_thread, reels):
+    """Clicks per second across ``threads`` and the p99 latency of one ``incr`` in µs."""
+    workloads = [zipf_clicks(clicks_per_thread, reels, seed) for seed in range(threads)]
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def run(i):
+        samples = latencies[i]
+        barrier.wait()
+        for reel_id, counter in workloads[i]:
+            start = time.perf_counter()
+            counters.incr(reel_id, counter)
+            samples.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    all_latencies = sorted(sample for samples in latencies for sample in samples)
+    return threads * clicks_per_thread / elapsed, all_latencies[int(len(all_latencies) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--clicks", type=int, default=20_000, help="increments per thread")
+    parser.add_argument("--reels", type=int, default=10_000)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--sql-clicks", type=int, default=500, help="increments per thread for the per-click writes")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    print(f"{args.reels:,} reels, Zipf clicks; throughput in clicks/s, p99 incr latency in µs")
+    for threads in args.threads:
+        global_lock = hammer(GlobalLockCounters(), threads, args.clicks, args.reels)
+        sharded_counters = EngagementCounters(os.path.join(tmp, f"sharded{threads}.db"), shards=args.shards).start()
+        sharded = hammer(sharded_counters, threads, args.clicks, args.reels)
+        sharded_counters.close()
+        per_click_writes = PerClickWrites(os.path.join(tmp, f"clicks{threads}.db"))
+        per_click = hammer(per_click_writes, threads, args.sql_clicks, args.reels)
+        print(f"{threads:3d} threads")
+        for label, (rate, p99) in (("global lock", global_lock), ("sharded", sharded), ("write per click", per_click)):
+            print(f"  {label:16s} {rate:12,.0f} clicks/s  p99 {p99:9.1f} µs")
+
+    counters = EngagementCounters(os.path.join(tmp, "flush.db"), shards=args.shards)
+    for batch in (1_000, 10_000, 100_000):
+        for reel_id, counter in zipf_clicks(batch, args.reels * 10, seed=batch):
+            counters.incr(reel_id, counter)
+        start = time.perf_counter()
+        written = counters.flush()
+        elapsed = time.perf_counter() - start
+        print(f"flush {batch:7,} clicks: {written:7,} reels in {elapsed * 1e3:7.1f} ms")
+
+    reads = [f"r{random.randrange(args.reels) + 1}" for _ in range(10_000)]
+    timings = []
+    for reel_id in reads:
+        start = time.perf_counter()
+        counters.get(reel_id)
+        timings.append(time.perf_counter() - start)
+    print(f"get (snapshot + {args.shards} shards): {statistics.median(timings) * 1e6:.2f} µs")
+    counters.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Course and playlist progress: maintained per-learner counters vs. walking every module and playlist reel.
+
+Usage: python benchmarks/bench_courses.py [--courses 10000] [--modules 20] [--playlists 10000] [--reels 100000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from courses import CourseIndex, ProgressTracker, playlist_id  # noqa: E402
+from synthetic import make_courses, make_playlists  # noqa: E402
+
+
+def timed_us(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--playlists", type=int, default=10_000)
+    parser.add_argument("--reels", type=int, default=100_000)
+    parser.add_argument("--completed", type=float, default=0.3, help="fraction of modules and reels finished")
+    args = parser.parse_args()
+
+    courses = make_courses(args.courses, args.modules)
+    playlists = make_playlists([{"id": f"r{i + 1}"} for i in range(args.reels)], args.playlists)
+    start = time.perf_counter()
+    index = CourseIndex(courses, playlists)
+    elapsed = (time.perf_counter() - start) * 1e3
+    print(f"index build:      {elapsed:8.1f} ms ({args.courses:,} courses, {args.playlists:,} playlists)")
+
+    rng = random.Random(4)
+    modules = [module["id"] for course in courses for module in course["modules"]]
+    finished_modules = set(rng.sample(modules, int(len(modules) * args.completed)))
+    finished_reels = set(rng.sample([f"r{i + 1}" for i in range(args.reels)], int(args.reels * args.completed)))
+    tracker = ProgressTracker(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    for module_id in finished_modules:
+        tracker.complete("heavy", "module", module_id)
+    for reel_id in finished_reels:
+        tracker.complete("heavy", "reel", reel_id)
+    tracker.flush()
+    tracker = ProgressTracker(tracker.path)  # cold: counters rebuilt from the stored completions
+    start = time.perf_counter()
+    tracker.progress("heavy", "course", courses[0]["id"], index)
+    elapsed = (time.perf_counter() - start) * 1e3
+    done = f"{len(finished_modules):,} modules, {len(finished_reels):,} reels done"
+    print(f"learner load:     {elapsed:8.1f} ms ({done})")
+
+    course_ids = [(rng.choice(courses)["id"],) for _ in range(2_000)]
+    playlist_ids = [(playlist_id(rng.choice(playlists)),) for _ in range(2_000)]
+    course_progress = timed_us(lambda cid: tracker.progress("heavy", "course", cid, index), course_ids)
+    playlist_progress = timed_us(lambda pid: tracker.progress("heavy", "playlist", pid, index), playlist_ids)
+    print(f"course progress:  {course_progress:8.2f} µs")
+    print(f"playlist progress:{playlist_progress:8.2f} µs")
+
+    def walk_course(cid):
+        course = index.course(cid)
+        return sum(module["id"] in finished_modules for module in course["modules"]) / len(course["modules"])
+
+    def walk_playlist(pid):
+        reels = set(index.playlist(pid)["reels"])
+        return sum(reel_id in finished_reels for reel_id in reels) / len(reels)
+
+    print(f"  walk modules:   {timed_us(walk_course, course_ids):8.2f} µs")
+    print(f"  walk reels:     {timed_us(walk_playlist, playlist_ids):8.2f} µs")
+    start = time.perf_counter()
+    for course in courses:
+        walk_course(course["id"])
+    print(f"  all courses, walk:     {(time.perf_counter() - start) * 1e3:8.1f} ms")
+    start = time.perf_counter()
+    tracker.in_progress("heavy", index)
+    print(f"  all courses, counters: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    todo = [(f"r{rng.randrange(args.reels) + 1}",) for _ in range(2_000)]
+    print(f"complete a reel:  {timed_us(lambda rid: tracker.complete('heavy', 'reel', rid), todo):8.2f} µs")
+    tracker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Per-session memory and pickle cost of engagement sets: Python sets of string ids vs. EngagementSet bitmaps.
+
+Builds --sessions learner sessions over a synthetic catalog. Each session has
+liked, saved, followed and completed-quiz sets, and one in --heavy-every
+sessions is a heavy user. String ids are fresh copies, as they are when loaded
+from the state store.
+
+Usage: python benchmarks/bench_engagement.py [--reels 200000] [--sessions 10000]
+"""
+
+import argparse
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from catalog import ReelCatalog  # noqa: E402
+from engagement import EngagementSet, IdSpace  # noqa: E402
+from synthetic import make_reels  # noqa: E402
+
+KINDS = ("liked_reels", "saved_reels", "followed_creators", "completed_quizzes")
+
+
+def make_sessions(catalog, count, heavy_every, rng):
+    reel_ids = catalog.ids()
+    creator_ids = catalog.creator_ids()
+    sessions = []
+    for i in range(count):
+        scale = 20 if i % heavy_every == 0 else 1
+        sessions.append(
+            {
+                "liked_reels": rng.sample(reel_ids, 100 * scale),
+                "saved_reels": rng.sample(reel_ids, 25 * scale),
+                "followed_creators": rng.sample(creator_ids, min(10 * scale, len(creator_ids))),
+                "completed_quizzes": [f"quiz_reel_{reel_id}" for reel_id in rng.sample(reel_ids, 15 * scale)],
+            }
+        )
+    return sessions
+
+
+def measure(build, sessions):
+    tracemalloc.start()
+    start = time.perf_counter()
+    states = [
+        {kind: build(kind, ((item + " ")[:-1] for item in session[kind])) for kind in KINDS} for session in sessions
+    ]
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    sizes = [len(pickle.dumps(state, pickle.HIGHEST_PROTOCOL)) for state in states]
+    pickle_time = time.perf_counter() - start
+    return elapsed, memory, sizes, pickle_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reels", type=int, default=200_000)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--heavy-every", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    catalog = ReelCatalog(make_reels(args.reels))
+    sessions = make_sessions(catalog, args.sessions, args.heavy_every, rng)
+    reels = IdSpace("reels", catalog)
+    spaces = {
+        "liked_reels": reels,
+        "saved_reels": reels,
+        "followed_creators": IdSpace("creators", seed=catalog.creator_ids()),
+        "completed_quizzes": IdSpace("quizzes"),
+    }
+    # Quiz keys are numbered process-wide on first use; number them up front so
+    # that cost is not charged to the sessions.
+    for session in sessions:
+        for key in session["completed_quizzes"]:
+            spaces["completed_quizzes"].encode(key)
+
+    print(f"{args.sessions:,} sessions over {args.reels:,} reels (1 in {args.heavy_every} heavy)")
+    print(f"  {'':<16} {'build s':>8} {'MiB total':>10} {'KiB/session':>12} {'pickle KiB p50/max':>20} {'pickle s':>9}")
+    for label, build in (
+        ("set[str]", lambda kind, items: set(items)),
+        ("EngagementSet", lambda kind, items: EngagementSet(spaces[kind], items)),
+    ):
+        elapsed, memory, sizes, pickle_time = measure(build, sessions)
+        sizes.sort()
+        print(
+            f"  {label:<16} {elapsed:8.2f} {memory / 2**20:10.1f} {memory / len(sessions) / 1024:12.1f} "
+            f"{sizes[len(sizes) // 2] / 1024:9.1f} / {sizes[-1] / 1024:8.1f} {pickle_time:9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
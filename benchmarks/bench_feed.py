@@ -0,0 +1,151 @@
+"""Home Feed payload and server time: one component per card vs. one batched feed component.
+
+Renders --cards synthetic reels on the Home Feed through Streamlit's AppTest,
+once per mode in a fresh process (BITE_SIZED_FEED_COMPONENT is read at
+import). For the first render and a plain rerun it reports server time, the
+serialized size of the ForwardMsgs sent to the browser, how many messages
+that is, and how many component instances the browser has to create (each
+per-card video is its own sandboxed iframe). Browser-side load time is not
+measured here; the instance count is its main driver.
+
+With --check it instead renders the Home Feed in two separate AppTests in
+one process, as a test runner or a restarted server would, and exits
+non-zero if either render fails; use it in CI.
+
+Usage: python benchmarks/bench_feed.py [--cards 20 100 500] [--reruns 5] [--check]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = Path(__file__).resolve().parent
+
+SCRIPT = f"""
+import sys
+sys.path[:0] = [{str(ROOT)!r}, {str(BENCH_DIR)!r}]
+import bite_sized_learning_app as app
+import synthetic
+
+if getattr(app, "_bench_size", None) is None:
+    reels = synthetic.make_reels({{cards}})
+    app.REELS = reels
+    app.PLAYLISTS = synthetic.make_playlists(reels)
+    app._bench_size = len(reels)
+app.main()
+"""
+
+
+def measure(cards: int, reruns: int) -> dict:
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    msgs = []
+    original_run = local_script_runner.LocalScriptRunner.run
+
+    def run(self, *a, **kw):
+        try:
+            return original_run(self, *a, **kw)
+        finally:
+            msgs[:] = self.forward_msgs()
+
+    local_script_runner.LocalScriptRunner.run = run
+
+    def snapshot(elapsed):
+        elements = [msg.delta.new_element for msg in msgs if msg.HasField("delta")]
+        kinds = ("iframe", "component_instance", "bidi_component")
+        return {
+            "ms": elapsed * 1e3,
+            "kib": sum(msg.ByteSize() for msg in msgs) / 1024,
+            "msgs": len(msgs),
+            "components": sum(el.WhichOneof("type") in kinds for el in elements),
+        }
+
+    at = AppTest.from_string(SCRIPT.format(cards=cards), default_timeout=600)
+    at.session_state["feed_cursor"] = cards
+    start = time.perf_counter()
+    at.run()
+    first = snapshot(time.perf_counter() - start)
+    assert not at.exception, at.exception
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return {"first": first, "rerun": snapshot(statistics.median(timings))}
+
+
+def check() -> list:
+    """Errors from rendering the Home Feed in two AppTests that share this process."""
+    from streamlit.testing.v1 import AppTest
+
+    errors = []
+    for attempt in range(2):
+        at = AppTest.from_file(str(ROOT / "bite_sized_learning_app.py"), default_timeout=600).run()
+        errors += [f"render {attempt + 1}: {exception.value}" for exception in at.exception]
+        if not at.exception and not at.get("bidi_component"):
+            errors.append(f"render {attempt + 1}: no feed component")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="only check that repeated AppTest renders work")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.check:
+        tmp = tempfile.mkdtemp()  # background writers may still flush at exit
+        os.environ.update(
+            BITE_SIZED_STORE="memory",
+            BITE_SIZED_DB=os.path.join(tmp, "bench.db"),
+            BITE_SIZED_CATALOG=os.path.join(tmp, "none.arrow"),
+            BITE_SIZED_PREFETCH="0",
+            BITE_SIZED_FEED_COMPONENT="1",
+        )
+        errors = check()
+        print("\n".join(errors) or "Home Feed rendered in two separate AppTests")
+        sys.exit(1 if errors else 0)
+
+    if args.worker is not None:
+        print(json.dumps(measure(args.worker, args.reruns)))
+        return
+
+    for cards in args.cards:
+        print(f"{cards} cards on the Home Feed")
+        for label, flag in (("card per reel", "0"), ("batched component", "1")):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(
+                    os.environ,
+                    BITE_SIZED_STORE="memory",
+                    BITE_SIZED_DB=os.path.join(tmp, "bench.db"),
+                    BITE_SIZED_CATALOG=os.path.join(tmp, "none.arrow"),
+                    BITE_SIZED_PREFETCH="0",
+                    BITE_SIZED_FEED_COMPONENT=flag,
+                )
+                out = subprocess.run(
+                    [sys.executable, __file__, "--worker", str(cards), "--reruns", str(args.reruns)],
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            for run in ("first", "rerun"):
+                row = result[run]
+                print(
+                    f"  {label:<19} {run:<6} {row['ms']:8.1f} ms {row['kib']:9.1f} KiB "
+                    f"{row['msgs']:5d} msgs {row['components']:4d} components"
+                )
+
+
+if __name__ == "__main__":
+    main()
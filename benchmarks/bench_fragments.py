@@ -0,0 +1,118 @@
+"""Server time and payload per reel-card click: full script rerun vs. fragment-scoped rerun.
+
+Renders a Home Feed of --cards synthetic reels through Streamlit's AppTest,
+then clicks Like on one card. Each click is measured twice. The first is a
+full rerun, which is what every click cost before the cards used fragments.
+The second is the fragment-scoped rerun a live browser session sends for a
+click inside st.fragment. Payload is the serialized size of the ForwardMsgs
+the server would send.
+
+Usage: python benchmarks/bench_fragments.py [--cards 200] [--clicks 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = Path(__file__).resolve().parent
+
+SCRIPT = f"""
+import sys
+sys.path[:0] = [{str(ROOT)!r}, {str(BENCH_DIR)!r}]
+import bite_sized_learning_app as app
+import synthetic
+
+if getattr(app, "_bench_size", None) is None:
+    reels = synthetic.make_reels({{cards}})
+    app.REELS = reels
+    app.PLAYLISTS = synthetic.make_playlists(reels)
+    app._bench_size = len(reels)
+app.main()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--clicks", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update(
+        BITE_SIZED_STORE="memory",
+        BITE_SIZED_DB=os.path.join(tmp, "bench.db"),
+        BITE_SIZED_CATALOG=os.path.join(tmp, "none.arrow"),
+        BITE_SIZED_PREFETCH="0",
+        BITE_SIZED_FEED_COMPONENT="0",  # the per-card fragments are what this measures
+    )
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1 import local_script_runner
+
+    # Scope the next run to a fragment the way AppSession does for a click
+    # inside st.fragment, and keep the messages each run sends.
+    scope = {"fragment_ids": [], "msgs": []}
+    original_request_rerun = local_script_runner.LocalScriptRunner.request_rerun
+    original_run = local_script_runner.LocalScriptRunner.run
+
+    def request_rerun(self, rerun_data):
+        if not scope["fragment_ids"]:
+            return original_request_rerun(self, rerun_data)
+        # A new runner starts with a pending full rerun that would absorb a
+        # fragment request, so replace the pending request outright.
+        with self._requests._lock:
+            self._requests._rerun_data = replace(rerun_data, fragment_id_queue=list(scope["fragment_ids"]))
+        return True
+
+    def run(self, *a, **kw):
+        try:
+            return original_run(self, *a, **kw)
+        finally:
+            scope["msgs"] = list(self.forward_msgs())
+
+    local_script_runner.LocalScriptRunner.request_rerun = request_rerun
+    local_script_runner.LocalScriptRunner.run = run
+
+    at = AppTest.from_string(SCRIPT.format(cards=args.cards), default_timeout=600)
+    at.session_state["feed_cursor"] = args.cards
+    at.run()
+    assert not at.exception, at.exception
+    fragment_id = next(
+        msg.delta.fragment_id
+        for msg in scope["msgs"]
+        if msg.HasField("delta") and msg.delta.fragment_id and "like_r1" in msg.delta.new_element.button.id
+    )
+
+    full, partial = [], []
+    for _ in range(args.clicks):
+        at.button(key="like_r1").click()
+        start = time.perf_counter()
+        at.run()
+        full.append((time.perf_counter() - start, sum(m.ByteSize() for m in scope["msgs"]), len(scope["msgs"])))
+
+        # The scoped run only re-renders the fragment; keep the full tree for the next click.
+        tree = at._tree
+        widget_state = at.button(key="like_r1").click().root.get_widget_states()
+        scope["fragment_ids"] = [fragment_id]
+        start = time.perf_counter()
+        at._run(widget_state)
+        partial.append((time.perf_counter() - start, sum(m.ByteSize() for m in scope["msgs"]), len(scope["msgs"])))
+        scope["fragment_ids"] = []
+        at._tree = tree
+
+    print(f"{args.cards} cards on the Home Feed, Like clicked {args.clicks}x (median)")
+    for label, rows in (("full rerun (before)", full), ("fragment rerun", partial)):
+        print(
+            f"  {label:<22} {statistics.median(r[0] for r in rows) * 1e3:8.1f} ms "
+            f"{statistics.median(r[1] for r in rows) / 1024:9.1f} KiB "
+            f"{statistics.median(r[2] for r in rows):6.0f} msgs"
+        )
+
+
+if __name__ == "__main__":
+    main()
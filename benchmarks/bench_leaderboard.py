@@ -0,0 +1,90 @@
+"""Leaderboard build, update, rank and top-N cost vs. re-sorting a dict, at millions of learners.
+
+With --check it instead awards XP through an XPLedger on both sides of a
+week boundary and exits non-zero if the weekly or global scores are off
+(the first award of a week must count once); use it in CI.
+
+Usage: python benchmarks/bench_leaderboard.py [--learners 1000000] [--check]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import xp  # noqa: E402
+from leaderboard import Leaderboard  # noqa: E402
+
+
+def timed(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def check() -> list:
+    """Errors from awarding XP a minute before and a minute after a week starts."""
+    now = [xp.week_start(time.time()) - 60]
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(xp, "time", SimpleNamespace(time=lambda: now[0])):
+        ledger = xp.XPLedger(os.path.join(tmp, "xp.db"))
+        ledger.award("a", "like/r1", "like")
+        now[0] += 120
+        ledger.award("a", "like/r2", "like")
+        ledger.award("b", "like/r2", "like")
+        weekly = {user_id: score for _, user_id, score in ledger.top(10, "weekly")}
+        totals = {user_id: ledger.total(user_id) for user_id in ("a", "b")}
+        ledger.close()
+    errors = []
+    if weekly != {"a": 5, "b": 5}:
+        errors.append(f"weekly scores after the rollover: {weekly}, expected a=5 b=5")
+    if totals != {"a": 10, "b": 5}:
+        errors.append(f"global scores: {totals}, expected a=10 b=5")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--learners", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=2_000)
+    parser.add_argument("--check", action="store_true", help="only check XP awards across a week boundary")
+    args = parser.parse_args()
+
+    if args.check:
+        errors = check()
+        print("\n".join(errors) or "Weekly and global XP are correct across a week boundary")
+        sys.exit(1 if errors else 0)
+
+    rng = random.Random(7)
+    scores = {f"learner_{i}": rng.randint(0, 50_000) for i in range(args.learners)}
+    members = list(scores)
+
+    start = time.perf_counter()
+    board = Leaderboard(scores, seed=7)
+    print(f"build: {args.learners:,} learners in {time.perf_counter() - start:.1f} s")
+
+    awards = [(rng.choice(members), rng.choice((3, 5, 10, 25))) for _ in range(args.ops)]
+    lookups = [(rng.choice(members),) for _ in range(args.ops)]
+    print(f"  award (add):    {timed(board.add, awards):8.1f} µs")
+    print(f"  rank lookup:    {timed(board.rank, lookups):8.1f} µs")
+    print(f"  top 10:         {timed(board.top, [(10,)] * 200):8.1f} µs")
+    print(f"  around learner: {timed(board.around, lookups[:200]):8.1f} µs")
+
+    start = time.perf_counter()
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    [member for member, _ in ranked].index(lookups[0][0])
+    print(f"  re-sort + index (per query, old approach): {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
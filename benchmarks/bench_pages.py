@@ -0,0 +1,169 @@
+"""Headless per-page rerun benchmark over synthetic catalogs, driven by Streamlit's AppTest.
+
+Every entry in LEARNER_PAGES and CREATOR_PAGES is rendered against synthetic
+REELS / PLAYLISTS / MICRO_COURSES of each requested size. For each page the
+script records the median rerun wall time, the peak Python memory allocated
+during a rerun (tracemalloc) and the number of emitted elements.
+
+Usage:
+    python benchmarks/bench_pages.py [--sizes 1000 100000 1000000] [--json report.json]
+                                     [--baseline previous.json --tolerance 0.25]
+
+Each size runs in its own process so memory numbers do not bleed across sizes.
+The script exits non-zero if any page fails to render, or regresses against
+--baseline.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = Path(__file__).resolve().parent
+
+# The app module is imported (not run as __main__), patched with the synthetic
+# catalog once per process, and then main() runs on every AppTest rerun.
+SCRIPT = f"""
+import sys
+sys.path[:0] = [{str(ROOT)!r}, {str(BENCH_DIR)!r}]
+import bite_sized_learning_app as app
+import synthetic
+
+size = int({{size}})
+if getattr(app, "_bench_size", None) != size:
+    reels = synthetic.make_reels(size)
+    app.REELS = reels
+    app.PLAYLISTS = synthetic.make_playlists(reels)
+    app.MICRO_COURSES = synthetic.make_courses()
+    app._bench_size = size
+app.main()
+"""
+
+
+def count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def measure_size(size: int, reruns: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    sys.path[:0] = [str(ROOT), str(BENCH_DIR)]
+    import bite_sized_learning_app as app
+
+    at = AppTest.from_string(SCRIPT.format(size=size), default_timeout=600)
+    at.run()
+    results = {}
+    for role, pages in (("Learner", app.LEARNER_PAGES), ("Creator", app.CREATOR_PAGES)):
+        at.sidebar.radio[0].set_value(role).run()
+        for page in pages:
+            at.sidebar.selectbox[0].set_value(page).run()  # warm caches for this page
+            if at.exception:
+                results[f"{role}/{page}"] = {"error": [e.value for e in at.exception]}
+                continue
+            timings = []
+            for _ in range(reruns):
+                start = time.perf_counter()
+                at.run()
+                timings.append(time.perf_counter() - start)
+            tracemalloc.start()
+            at.run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[f"{role}/{page}"] = {
+                "wall_ms": round(statistics.median(timings) * 1e3, 2),
+                "peak_kib": round(peak / 1024, 1),
+                "elements": count_elements(at._tree),
+            }
+    return results
+
+
+def run_size(size: int, reruns: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            BITE_SIZED_STORE="memory",
+            BITE_SIZED_DB=os.path.join(tmp, "bench.db"),
+            BITE_SIZED_CATALOG=os.path.join(tmp, "none.arrow"),  # use the patched in-module catalog
+            BITE_SIZED_PREFETCH="0",  # no network fetches while timing
+        )
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker", str(size), "--reruns", str(reruns)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(report: dict, baseline: dict, tolerance: float):
+    regressions = []
+    for size, pages in report["sizes"].items():
+        for page, metrics in pages.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(page)
+            if not before or "error" in before:
+                continue
+            if "error" in metrics:
+                regressions.append(f"{size} {page}: now fails with {metrics['error']}")
+                continue
+            for metric in ("wall_ms", "peak_kib", "elements"):
+                if metrics[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(f"{size} {page} {metric}: {before[metric]} -> {metrics[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous report")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(measure_size(args.worker, args.reruns)))
+        return
+
+    report = {"reruns": args.reruns, "sizes": {}}
+    for size in args.sizes:
+        pages = report["sizes"][str(size)] = run_size(size, args.reruns)
+        print(f"\n{size:,} reels")
+        for page, metrics in pages.items():
+            if "error" in metrics:
+                print(f"  {page:<42} ERROR {metrics['error']}")
+            else:
+                print(
+                    f"  {page:<42} {metrics['wall_ms']:>9.1f} ms {metrics['peak_kib']:>10.0f} KiB "
+                    f"{metrics['elements']:>6} elements"
+                )
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    failed = [
+        f"{size} {page}" for size, pages in report["sizes"].items() for page, metrics in pages.items()
+        if "error" in metrics
+    ]
+    if failed:
+        print("\nPages that failed to render:\n  " + "\n  ".join(failed), file=sys.stderr)
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Prefetch throughput vs. concurrency against the local stub server, and the cache read cost renders pay.
+
+Runs offline: every request goes to prefetch.stub_server with --latency
+seconds of simulated network delay.
+
+Usage: python benchmarks/bench_prefetch.py [--urls 400] [--latency 0.05] [--concurrency 1 8 32]
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from prefetch import MetadataCache, Prefetcher, UrllibTransport, stub_server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    server = stub_server(latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    half = args.urls // 2
+    urls = [f"https://www.youtube.com/watch?v=vid{i:07d}" for i in range(half)]
+    urls += [f"https://cdn.example.com/reels/{i}.mp4" for i in range(args.urls - half)]
+
+    print(f"{args.urls} URLs ({half} YouTube, {args.urls - half} CDN), {args.latency * 1e3:.0f} ms per request")
+    roots = []
+    for concurrency in args.concurrency:
+        root = tempfile.mkdtemp()
+        roots.append(root)
+        cache = MetadataCache(root)
+        transport = UrllibTransport(base_url, max_workers=concurrency)
+        start = time.perf_counter()
+        asyncio.run(Prefetcher(cache, transport, concurrency).prefetch(urls))
+        elapsed = time.perf_counter() - start
+        transport.close()
+        print(f"  concurrency {concurrency:>3}: {elapsed:7.2f} s  ({args.urls / elapsed:7.1f} URLs/s)")
+
+    timings = []
+    cold = MetadataCache(root)  # nothing memoised: every first read hits the disk
+    for url in urls:
+        start = time.perf_counter()
+        cold.get(url)
+        timings.append(time.perf_counter() - start)
+    print(f"  render-path cache read, first: {statistics.median(timings) * 1e6:6.1f} µs")
+    timings.clear()
+    for url in urls:
+        start = time.perf_counter()
+        cold.get(url)
+        timings.append(time.perf_counter() - start)
+    print(f"  render-path cache read, again: {statistics.median(timings) * 1e6:6.1f} µs")
+    for root in roots:
+        shutil.rmtree(root)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
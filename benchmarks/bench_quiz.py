@@ -0,0 +1,71 @@
+"""Review scheduler at millions of cards: heap-based "due today" and SM-2 reviews vs. scanning every card.
+
+Usage: python benchmarks/bench_quiz.py [--cards 1000000] [--due-fraction 0.02]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analytics import connect  # noqa: E402
+from quiz import DAY, SCHEMA, ReviewScheduler  # noqa: E402
+
+
+def timed(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1_000_000)
+    parser.add_argument("--due-fraction", type=float, default=0.02)
+    parser.add_argument("--ops", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    now = time.time()
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    due_by = [
+        now - rng.random() * DAY if rng.random() < args.due_fraction else now + rng.random() * 60 * DAY
+        for _ in range(args.cards)
+    ]
+    with connect(path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO review_cards VALUES ('heavy', ?, 2.5, 6, 2, 0, ?)",
+            ((f"reel/r{i}", due) for i, due in enumerate(due_by)),
+        )
+
+    scheduler = ReviewScheduler(path)
+    start = time.perf_counter()
+    scheduler.size("heavy")
+    elapsed = time.perf_counter() - start
+    print(f"one learner, {args.cards:,} cards ({args.due_fraction:.0%} due): deck loaded in {elapsed:.2f} s")
+
+    reviews = [("heavy", f"reel/r{rng.randrange(args.cards)}", rng.choice((1, 3, 4, 5)), now) for _ in range(args.ops)]
+    print(f"  SM-2 review + reschedule: {timed(scheduler.review, reviews):9.1f} µs")
+    print(f"  due today (top 20, heap): {timed(scheduler.due, [('heavy', now, 20)] * 200):9.1f} µs")
+    print(f"  next due (peek):          {timed(scheduler.next_due, [('heavy',)] * 200):9.1f} µs")
+
+    cards = scheduler._deck("heavy").cards
+    print(
+        "  due today (scan + sort):  "
+        f"{timed(lambda: sorted((c.due, c.card_id) for c in cards.values() if c.due <= now)[:20], [()] * 5):9.1f} µs"
+    )
+    scheduler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Rollup throughput, peak memory and dashboard query latency over a large event log.
+
+Usage: python benchmarks/bench_rollups.py [--events 10000000] [--db /tmp/bench_events.db]
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analytics import RollupEngine, connect  # noqa: E402
+from synthetic import TOPICS  # noqa: E402
+
+
+def fill_log(path, events, reels, batch=200_000):
+    rng = random.Random(5)
+    start_ts = time.time() - 90 * 86400
+    conn = connect(path)
+    for offset in range(0, events, batch):
+        rows = []
+        for i in range(offset, min(offset + batch, events)):
+            reel = rng.randrange(reels)
+            kind = rng.choices(("view", "like", "watch"), weights=(6, 1, 3))[0]
+            value = rng.randint(5, 90) if kind == "watch" else 1
+            rows.append((start_ts + i * 90 * 86400 / events, kind, None, f"r{reel}", TOPICS[reel % len(TOPICS)], value))
+        with conn:
+            conn.executemany(
+                "INSERT INTO events (ts, kind, user_id, reel_id, topic, value) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+    conn.close()
+
+
+def best_ms(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--reels", type=int, default=100_000)
+    parser.add_argument("--db", default="/tmp/bench_events.db")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    engine = RollupEngine(args.db)
+    start = time.perf_counter()
+    fill_log(args.db, args.events, args.reels)
+    print(f"log fill:     {args.events:,} events in {time.perf_counter() - start:.1f} s")
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    processed = engine.catch_up()
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"rollup:       {processed:,} events in {elapsed:.1f} s ({processed / elapsed:,.0f} events/s)")
+    print(f"peak RSS:     {rss_after / 1024:.0f} MiB (+{(rss_after - rss_before) / 1024:.0f} MiB during rollup)")
+
+    print(f"top_reels:    {best_ms(lambda: engine.top_reels(10)):.2f} ms")
+    print(f"topic_totals: {best_ms(engine.topic_totals):.2f} ms")
+    print(f"daily_totals: {best_ms(lambda: engine.daily_totals(30)):.2f} ms")
+    print(f"overall:      {best_ms(engine.overall_totals):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""SearchIndex build time and query latency (exact and prefix) over synthetic reels.
+
+Usage: python benchmarks/bench_search.py [--docs 1000000]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from search import SearchIndex  # noqa: E402
+from synthetic import make_reels  # noqa: E402
+
+WORDS = "python algebra design prompt arrays graphs ethics biology quantum loops".split()
+QUERIES = ["python", "design arrays", "creator 42", "pro", "quantum gra", "synthetic reel 123456", "alg"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    reels = make_reels(args.docs)
+    index = SearchIndex()
+    start = time.perf_counter()
+    for i, reel in enumerate(reels):
+        # Mix a few vocabulary words into each title so common terms have long posting lists.
+        extra = f"{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]}"
+        index.add(f"reel:{reel['id']}", "reel", reel["title"], extra, reel["creator"], reel["topic"])
+    print(f"build: {args.docs:,} docs in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    index.add("reel:new", "reel", "Brand new python upload", "tags")
+    print(f"incremental add: {(time.perf_counter() - start) * 1e3:.3f} ms")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = index.search(query, limit=10)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{query!r:>26}: p50 {statistics.median(timings) * 1e3:6.2f} ms  "
+            f"max {max(timings) * 1e3:6.2f} ms  top={hits[0]['title'] if hits else None}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Similar-reels index: fold and rebuild time at millions of likes/saves, incremental refresh and lookup latency.
+
+Learners engage mostly within one topic, so neighbour lists have structure;
+the per-learner engagement counts are heavy-tailed.
+
+Usage: python benchmarks/bench_similar.py [--interactions 10000000] [--reels 100000] [--db /tmp/bench_similar.db]
+"""
+
+import argparse
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analytics import connect  # noqa: E402
+from similar import SimilarReels  # noqa: E402
+from synthetic import TOPICS  # noqa: E402
+
+
+def fill_log(path, interactions, reels, learners, batch=500_000):
+    """Like/save events for ``learners`` learners, about ``interactions`` in total."""
+    rng = np.random.default_rng(11)
+    sizes = np.minimum(rng.geometric(learners / interactions, learners), 2_000)
+    users = np.repeat(np.arange(learners), sizes)[:interactions]
+    # Each learner has a home topic; 80% of their reels come from it, skewed to popular ones.
+    home = rng.integers(len(TOPICS), size=learners)[users]
+    per_topic = reels // len(TOPICS)
+    rank = np.minimum(rng.zipf(1.3, len(users)) - 1, per_topic - 1)
+    topic = np.where(rng.random(len(users)) < 0.8, home, rng.integers(len(TOPICS), size=len(users)))
+    reel = rank * len(TOPICS) + topic
+    kind = np.where(rng.random(len(users)) < 0.7, "like", "save")
+    start_ts = time.time() - 90 * 86400
+    ts = start_ts + np.sort(rng.random(len(users))) * 90 * 86400
+    conn = connect(path)
+    for offset in range(0, len(users), batch):
+        rows = zip(
+            ts[offset : offset + batch].tolist(),
+            kind[offset : offset + batch].tolist(),
+            (f"u{u}" for u in users[offset : offset + batch].tolist()),
+            (f"r{r + 1}" for r in reel[offset : offset + batch].tolist()),
+        )
+        with conn:
+            conn.executemany("INSERT INTO events (ts, kind, user_id, reel_id, value) VALUES (?, ?, ?, ?, 1)", rows)
+    conn.close()
+    return len(users)
+
+
+def timed_us(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interactions", type=int, default=10_000_000)
+    parser.add_argument("--reels", type=int, default=100_000)
+    parser.add_argument("--learners", type=int, default=500_000)
+    parser.add_argument("--db", default="/tmp/bench_similar.db")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    index = SimilarReels(args.db)
+    start = time.perf_counter()
+    total = fill_log(args.db, args.interactions, args.reels, args.learners)
+    print(f"log fill:        {total:,} likes/saves in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    index.catch_up(refresh=False)
+    print(f"fold:            {time.perf_counter() - start:.1f} s")
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    index.rebuild()
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"rebuild:         {elapsed:.1f} s for {len(index):,} reels with neighbours")
+    print(f"peak RSS:        {rss_after / 1024:.0f} MiB (+{(rss_after - rss_before) / 1024:.0f} MiB during rebuild)")
+
+    rng = random.Random(3)
+    with connect(args.db) as conn:  # weighted by engagement, like the reels learners open
+        ids = [row[0] for row in conn.execute("SELECT reel_id FROM similar_engagement ORDER BY random() LIMIT 2000")]
+    print(f"neighbors():     {timed_us(index.neighbors, [(rid, 5) for rid in ids]):9.1f} µs")
+    print(f"blend(10 likes): {timed_us(index.blend, [(ids[i : i + 10], 5) for i in range(0, 2_000, 10)]):9.1f} µs")
+
+    with connect(args.db) as conn:
+        query = (
+            "SELECT b.reel_id, COUNT(*) FROM similar_engagement a JOIN similar_engagement b "
+            "ON a.user_id = b.user_id AND b.reel_id != a.reel_id AND b.weight > 0 "
+            "WHERE a.reel_id = ? AND a.weight > 0 GROUP BY b.reel_id ORDER BY 2 DESC LIMIT 5"
+        )
+        on_demand = timed_us(lambda rid: conn.execute(query, (rid,)).fetchall(), [(rid,) for rid in ids[:20]])
+        print(f"on-demand SQL:   {on_demand:9.1f} µs")
+
+    for likes in (1, 10, 100):
+        with connect(args.db) as conn:
+            conn.executemany(
+                "INSERT INTO events (ts, kind, user_id, reel_id, value) VALUES (?, 'like', ?, ?, 1)",
+                ((time.time(), f"u{rng.randrange(args.learners)}", rng.choice(ids)) for _ in range(likes)),
+            )
+        start = time.perf_counter()
+        changed = index.catch_up()
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"incremental:     {elapsed:7.1f} ms to refresh {changed} reels after {likes} likes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Cold-start benchmark: app import time and first Home Feed render, each in a fresh process.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--json out.json] [--baseline base.json]
+
+With --baseline the script exits non-zero when a median regresses by more
+than --tolerance (default 20%), so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APP = ROOT / "bite_sized_learning_app.py"
+HEAVY_MODULES = ("pandas", "altair", "plotly.express", "numpy", "streamlit_player")
+
+IMPORT_PROBE = f"""
+import json, sys, time
+sys.path.insert(0, {str(ROOT)!r})
+start = time.perf_counter()
+import bite_sized_learning_app
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+RENDER_PROBE = f"""
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({str(APP)!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - start
+assert not at.exception, [e.value for e in at.exception]
+print(json.dumps({{"seconds": elapsed}}))
+"""
+
+
+def probe(code: str) -> dict:
+    env = dict(os.environ, BITE_SIZED_STORE="memory", BITE_SIZED_PREFETCH="0")
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous report")
+    parser.add_argument("--tolerance", type=float, default=0.20)
+    args = parser.parse_args()
+
+    imports = [probe(IMPORT_PROBE) for _ in range(args.runs)]
+    renders = [probe(RENDER_PROBE) for _ in range(args.runs)]
+    report = {
+        "import_seconds": statistics.median(r["seconds"] for r in imports),
+        "first_render_home_feed_seconds": statistics.median(r["seconds"] for r in renders),
+        "heavy_modules_at_import": imports[-1]["loaded"],
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = [
+            f"{metric}: {baseline[metric]:.3f}s -> {report[metric]:.3f}s"
+            for metric in ("import_seconds", "first_render_home_feed_seconds")
+            if report[metric] > baseline[metric] * (1 + args.tolerance)
+        ]
+        if regressions:
+            print("Startup regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
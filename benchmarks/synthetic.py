@@ -0,0 +1,62 @@
+"""Synthetic catalog generators shared by the benchmarks."""
+
+import random
+
+TOPICS = ["Mathematics", "DSA", "Design", "Programming", "AI", "Biology", "Ethics", "Physics"]
+DIFFICULTIES = ["Beginner", "Intermediate", "Advanced"]
+
+
+def make_reels(n: int, creators: int = 1000, seed: int = 7):
+    rng = random.Random(seed)
+    reels = []
+    for i in range(n):
+        creator = rng.randrange(creators)
+        seconds = rng.randint(30, 90)
+        reels.append(
+            {
+                "id": f"r{i + 1}",
+                "title": f"Synthetic Reel {i + 1}",
+                "creator": f"Creator {creator}",
+                "creator_id": f"creator_{creator}",
+                "topic": rng.choice(TOPICS),
+                "difficulty": rng.choice(DIFFICULTIES),
+                "duration": f"{seconds // 60}:{seconds % 60:02d}" if seconds >= 60 else str(seconds),
+                "video_url": f"https://www.youtube.com/watch?v=syn{i:08d}",
+                "likes": rng.randint(0, 5000),
+                "saves": rng.randint(0, 2000),
+            }
+        )
+    return reels
+
+
+def make_playlists(reels, n: int = 50, per_playlist: int = 20, seed: int = 7):
+    rng = random.Random(seed)
+    ids = [reel["id"] for reel in reels]
+    return [
+        {
+            "id": f"p{i + 1}",
+            "name": f"Synthetic Playlist {i + 1}",
+            "description": "Generated for benchmarking.",
+            "reels": rng.sample(ids, min(per_playlist, len(ids))),
+            "tags": rng.sample(TOPICS, 2),
+        }
+        for i in range(n)
+    ]
+
+
+def make_courses(n: int = 20, modules: int = 6, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"c{i + 1}",
+            "title": f"Synthetic Course {i + 1}",
+            "level": rng.choice(DIFFICULTIES),
+            "duration": f"{modules * 5} min",
+            "description": "Generated for benchmarking.",
+            "modules": [
+                {"id": f"c{i + 1}m{j + 1}", "title": f"Module {j + 1}", "duration": "5 min"}
+                for j in range(modules)
+            ],
+        }
+        for i in range(n)
+    ]
@@ -1,14 +1,40 @@
+import atexit
+import datetime
+import io
+import os
+import time
+import uuid
+from html import escape
+from urllib.parse import quote
+
 import streamlit as st
-import pandas as pd
-import altair as alt
-import plotly.express as px
-from urllib.parse import urlparse, parse_qs
 import streamlit.components.v1 as components
 
-try:
-    from streamlit_player import st_player
-except ModuleNotFoundError:
-    st_player = None
+from analytics import EventLog, RollupEngine
+from catalog import ReelCatalog
+from catalog_file import CatalogFile, CatalogSnapshot
+from charts import ChartCache
+from comments import CommentStore, module_thread, reel_thread
+from counters import EngagementCounters
+from courses import CourseIndex, ProgressTracker, playlist_id
+from engagement import EngagementSet, IdSpace
+from feed_component import (
+    FEED_CSS, FEED_FIELDS, FEED_HTML, FEED_JS, FOLLOWING, LIKED, SAVED, feed_row, parse_feed_actions
+)
+from media import format_duration, parse_duration, youtube_thumbnail_url, youtube_video_id
+from prefetch import MetadataCache, Prefetcher, PrefetchService, UrllibTransport
+from persistence import SET_KINDS, StateStore, open_state_store
+from player_component import PLAYER_CSS, PLAYER_HTML, PLAYER_JS, parse_playback
+from profiling import PROFILER, start_exporter
+from quiz import DAY, PASSING_QUALITY, QuestionBank, ReviewScheduler
+from search import SearchIndex
+from uploads import BulkImport, UploadStore, error_report, validate_upload
+from watch import WatchSessionTracker
+from xp import SEED_KIND, XP_POINTS, XPLedger
+
+# pandas, altair, plotly, numpy (via recommend) and streamlit_player are
+# imported inside the pages that use them, so a cold process only pays for
+# the page it is actually rendering.
 
 
 st.set_page_config(
@@ -72,24 +98,24 @@ REELS = [
 
 PLAYLISTS = [
     {
+        "id": "p1",
         "name": "AI Fundamentals",
         "description": "Bite-sized explainers on GenAI, ML, and prompt craft.",
         "reels": ["r2", "r3", "r4"],
-        "progress": 0.65,
         "tags": ["AI", "Prompting"],
     },
     {
+        "id": "p2",
         "name": "Math Refresh",
         "description": "Daily algebra and calculus boosts.",
         "reels": ["r1", "r4"],
-        "progress": 0.32,
         "tags": ["Math", "STEM"],
     },
     {
+        "id": "p3",
         "name": "UX in Minutes",
         "description": "Micro-lessons on user empathy and prototyping.",
         "reels": ["r3"],
-        "progress": 0.9,
         "tags": ["Design", "Product"],
     },
 ]
@@ -102,11 +128,10 @@ MICRO_COURSES = [
         "duration": "35 min",
         "description": "Understand prompts, evals, and responsible AI with snackable videos.",
         "modules": [
-            {"title": "Prompt Patterns", "duration": "8 min"},
-            {"title": "Evaluation Basics", "duration": "12 min"},
-            {"title": "Responsible AI Lens", "duration": "15 min"},
+            {"id": "c1m1", "title": "Prompt Patterns", "duration": "8 min"},
+            {"id": "c1m2", "title": "Evaluation Basics", "duration": "12 min"},
+            {"id": "c1m3", "title": "Responsible AI Lens", "duration": "15 min"},
         ],
-        "completion": 0.45,
     },
     {
         "id": "c2",
@@ -115,18 +140,61 @@ MICRO_COURSES = [
         "duration": "28 min",
         "description": "Build playful games with Python in under an hour.",
         "modules": [
-            {"title": "Why Creative Code", "duration": "4 min"},
-            {"title": "Mini Game Loop", "duration": "9 min"},
-            {"title": "Visual polish", "duration": "15 min"},
+            {"id": "c2m1", "title": "Why Creative Code", "duration": "4 min"},
+            {"id": "c2m2", "title": "Mini Game Loop", "duration": "9 min"},
+            {"id": "c2m3", "title": "Visual polish", "duration": "15 min"},
         ],
-        "completion": 0.7,
+    },
+]
+
+# Questions filed under "reel" / "module" cover every reel / module without its own.
+QUIZ_QUESTIONS = [
+    {
+        "id": "reel-benefit",
+        "target": "reel",
+        "prompt": "What is the main benefit of bite-sized learning?",
+        "options": [
+            "It helps you memorise long lectures at once",
+            "It breaks concepts into short, focused chunks",
+            "It removes the need for practice",
+        ],
+        "answer": 1,
+        "explanation": "Remember: short, focused chunks win.",
+    },
+    {
+        "id": "module-approach",
+        "target": "module",
+        "prompt": "How should you approach each module?",
+        "options": [
+            "Rush through all of them at once",
+            "Finish one, reflect, then move to the next",
+            "Skip the ones you already know",
+        ],
+        "answer": 1,
+        "explanation": "Depth over speed.",
+    },
+    {
+        "id": "r2-index",
+        "target": "reel/r2",
+        "prompt": "How long does reading arr[i] take in an array?",
+        "options": ["O(1)", "O(log n)", "O(n)"],
+        "answer": 0,
+        "explanation": "Arrays are contiguous, so any index is one address computation away.",
+    },
+    {
+        "id": "r4-reverse",
+        "target": "reel/r4",
+        "prompt": "Which expression returns a reversed copy of the list xs?",
+        "options": ["xs.sort()", "xs[::-1]", "xs.pop()"],
+        "answer": 1,
+        "explanation": "A slice with step -1 walks the list backwards.",
     },
 ]
 
 LEARNER_PROFILE = {
+    "id": "alex_rivers",
     "name": "Alex Rivers",
     "avatar": "https://avatars.githubusercontent.com/u/9919?s=200&v=4",
-    "streak": 12,
     "xp": 4820,
     "badges": ["Prompt Pro", "Consistency Champ", "STEM Sprinter"],
     "saved_reels": ["r1", "r4"],
@@ -150,39 +218,527 @@ CREATOR_STATS = {
         {"title": "Ethical AI Cheat", "views": 5600, "likes": 480},
     ],
 }
+DB_PATH = os.environ.get("BITE_SIZED_DB", "bite_sized.db")
+CATALOG_PATH = os.environ.get("BITE_SIZED_CATALOG", "catalog.arrow")
+MEDIA_CACHE_DIR = os.environ.get("BITE_SIZED_MEDIA_CACHE", ".media_cache")
+PREFETCH_ENABLED = os.environ.get("BITE_SIZED_PREFETCH", "1") not in ("", "0")
+# "0" renders the Home Feed as one fragment-backed card per reel instead of one batched component.
+FEED_COMPONENT_ENABLED = os.environ.get("BITE_SIZED_FEED_COMPONENT", "1") not in ("", "0")
+PROFILER.enabled = os.environ.get("BITE_SIZED_PROFILE", "") not in ("", "0")
+FEED_PAGE_SIZE = 5
+WATCH_HEARTBEAT_SECONDS = 10
+COMMENT_PAGE_SIZE = 5
+UPLOAD_PAGE_SIZE = 20
+UPLOAD_TOPICS = ["AI", "Math", "Design", "Biology", "Other"]
+BROWSE_PAGE_SIZE = 20
+BROWSE_SORTS = {  # label -> (column, descending)
+    "Most popular": ("popularity", True),
+    "Least popular": ("popularity", False),
+    "Shortest": ("seconds", False),
+    "Longest": ("seconds", True),
+}
+QUESTIONS_PATH = os.environ.get("BITE_SIZED_QUESTIONS", "questions.jsonl")
+REVIEW_BATCH = 20  # due reviews fetched per Daily Review rerun
+FEED_RANKING_CHUNK = 50  # top-k is selected in chunks so most pages reuse the ranking
+SIMILAR_REELS = 5  # "Up next" picks in the viewer, and neighbours blended into the feed per recent like
+RECENT_LIKES = 10  # latest likes whose neighbours the feed blends in
+EVENT_COUNTERS = {"like": "likes", "save": "saves", "view": "views"}  # event kind -> global reel counter
+# Module-quiz keys from before modules had ids, quiz_module_<course id>_<module title>, by module id.
+LEGACY_MODULE_QUIZ_KEYS = {
+    f"quiz_module_{course['id']}_{module['title']}": module["id"]
+    for course in MICRO_COURSES
+    for module in course["modules"]
+}
+
+
+def migrate_quiz_keys(store: StateStore, user_id: str, completed: set) -> set:
+    """Rename legacy module-quiz keys to ``quiz_module_<module id>`` and count those modules as finished.
+
+    The pass keeps its XP: the quiz stays completed under the new key, so it is not awarded again.
+    """
+    for old_key in completed & LEGACY_MODULE_QUIZ_KEYS.keys():
+        module_id = LEGACY_MODULE_QUIZ_KEYS[old_key]
+        new_key = f"quiz_module_{module_id}"
+        store.remove(user_id, "completed_quizzes", old_key)
+        store.add(user_id, "completed_quizzes", new_key)
+        completed = (completed - {old_key}) | {new_key}
+        load_progress_tracker().complete(user_id, "module", module_id)
+    return completed
 
 
 def init_state():
+    version = catalog_snapshot().version
+    if st.session_state.get("id_space_version") != version:
+        # After a catalog reload, re-encode this session's sets in the new catalog's id spaces.
+        for kind in SET_KINDS:
+            if kind in st.session_state:
+                st.session_state[kind] = engagement_set(kind, st.session_state[kind])
+        st.session_state.id_space_version = version
+
+    if "learner_state_loaded" not in st.session_state:
+        # One indexed query per session; reruns work on the session copy.
+        store = load_state_store()
+        user_id = current_user_id()
+        stored = store.load(user_id)
+        if stored is None:
+            store.create_profile(user_id)
+            for reel_id in LEARNER_PROFILE["saved_reels"]:
+                store.add(user_id, "saved_reels", reel_id)
+            stored = {"saved_reels": set(LEARNER_PROFILE["saved_reels"])}
+        if "completed_quizzes" in stored:
+            stored["completed_quizzes"] = migrate_quiz_keys(store, user_id, stored["completed_quizzes"])
+        for key, value in stored.items():
+            st.session_state[key] = engagement_set(key, value) if key in SET_KINDS else value
+        # Starting XP enters the ledger once; idempotent like every other award.
+        load_xp_ledger().award(
+            user_id, "profile_seed", SEED_KIND, points=LEARNER_PROFILE["xp"] + stored.get("xp_dynamic", 0)
+        )
+        st.session_state.learner_state_loaded = True
+
     if "liked_reels" not in st.session_state:
-        st.session_state.liked_reels = set()
+        st.session_state.liked_reels = engagement_set("liked_reels")
 
     if "saved_reels" not in st.session_state:
-        st.session_state.saved_reels = set(LEARNER_PROFILE["saved_reels"])
+        st.session_state.saved_reels = engagement_set("saved_reels")
 
     if "followed_creators" not in st.session_state:
-        st.session_state.followed_creators = set()
+        st.session_state.followed_creators = engagement_set("followed_creators")
 
     if "created_courses" not in st.session_state:
         st.session_state.created_courses = []
 
-    if "uploaded_reels" not in st.session_state:
-        st.session_state.uploaded_reels = []
+    if "upload_cursors" not in st.session_state:
+        st.session_state.upload_cursors = [None]  # seq cursors of the upload pages visited
 
-    if "reel_comments" not in st.session_state:
-        st.session_state.reel_comments = {}  # reel_id -> List[str]
-
-    if "course_comments" not in st.session_state:
-        st.session_state.course_comments = {}  # course_id/module_title -> List[str]
+    if "upload_job" not in st.session_state:
+        st.session_state.upload_job = None  # BulkImport started from this session
 
     if "xp_dynamic" not in st.session_state:
         st.session_state.xp_dynamic = 0
 
     if "completed_quizzes" not in st.session_state:
-        st.session_state.completed_quizzes = set()
+        st.session_state.completed_quizzes = engagement_set("completed_quizzes")
+
+    if "comment_cursors" not in st.session_state:
+        st.session_state.comment_cursors = {}  # widget key -> stack of page cursors, newest page first
+
+    if "viewed_reels" not in st.session_state:
+        st.session_state.viewed_reels = set()  # reels already counted as a view this session
+
+    if "watch_session" not in st.session_state:
+        st.session_state.watch_session = None  # playback session of the reel open in the viewer
+
+    if "feed_cursor" not in st.session_state:
+        st.session_state.feed_cursor = FEED_PAGE_SIZE  # number of ranked reels shown
+
+    if "feed_ranking" not in st.session_state:
+        st.session_state.feed_ranking = []  # reel ids in recommendation order
+        st.session_state.feed_ranking_key = None
+
+    if "feed_comments_reel" not in st.session_state:
+        st.session_state.feed_comments_reel = None  # reel whose comments show under the batched feed
+
+    if "recent_likes" not in st.session_state:
+        st.session_state.recent_likes = load_event_log().recent_likes(current_user_id(), RECENT_LIKES)  # oldest first
+
+
+@st.cache_resource
+def load_catalog_file():
+    """The catalog file, memory-mapped once per process and hot-reloaded on change; None if absent."""
+    if not os.path.exists(CATALOG_PATH):
+        return None
+    return CatalogFile(CATALOG_PATH).start()
+
+
+@st.cache_resource
+def load_builtin_catalog() -> CatalogSnapshot:
+    return CatalogSnapshot(ReelCatalog(REELS), PLAYLISTS, MICRO_COURSES, CREATOR_STATS)
+
+
+def catalog_snapshot() -> CatalogSnapshot:
+    catalog_file = load_catalog_file()
+    return catalog_file.snapshot if catalog_file else load_builtin_catalog()
+
+
+def load_catalog() -> ReelCatalog:
+    return catalog_snapshot().reels
+
+
+@st.cache_resource(max_entries=1)
+def load_recommender(version: int):
+    """One recommender per catalog version; a reload evicts the previous one."""
+    from recommend import FeedRecommender
+
+    return FeedRecommender(load_catalog())
+
+
+@st.cache_resource
+def load_similar_reels():
+    """Co-engagement neighbours, kept current from the event log by a background job."""
+    from similar import SimilarReels
+
+    index = SimilarReels(DB_PATH)
+    index.start()
+    return index
+
+
+@st.cache_resource
+def load_state_store() -> StateStore:
+    backend = os.environ.get("BITE_SIZED_STORE", "sqlite")
+    options = {"path": DB_PATH} if backend == "sqlite" else {}
+    store = open_state_store(backend, **options)
+    atexit.register(store.close)
+    return store
+
+
+@st.cache_resource
+def load_event_log() -> EventLog:
+    log = EventLog(DB_PATH)
+    atexit.register(log.close)
+    return log
+
+
+@st.cache_resource
+def load_engagement_counters() -> EngagementCounters:
+    counters = EngagementCounters(DB_PATH).start()
+    atexit.register(counters.close)
+    return counters
+
+
+@st.cache_resource
+def load_rollups() -> RollupEngine:
+    engine = RollupEngine(DB_PATH)
+    engine.start()
+    return engine
+
+
+@st.cache_resource
+def load_watch_tracker() -> WatchSessionTracker:
+    progress = load_progress_tracker()
+    tracker = WatchSessionTracker(
+        DB_PATH,
+        event_log=load_event_log(),
+        on_complete=lambda user_id, reel_id, ts: progress.complete(user_id, "reel", reel_id, ts),
+    )
+    atexit.register(tracker.close)
+    return tracker
+
+
+@PROFILER.instrument()
+def send_watch_heartbeat(reel: dict, position: float = 0.0, duration: float = 0.0, finished: bool = False):
+    """Report the player's ``position`` in ``reel``; ``finished=True`` reports the end of the reel."""
+    session = st.session_state.watch_session
+    if session is None or session["reel_id"] != reel["id"]:
+        session = {"id": uuid.uuid4().hex, "reel_id": reel["id"]}
+        st.session_state.watch_session = session
+    duration = duration or reel_media(reel).get("duration") or parse_duration(reel["duration"])
+    position = duration if finished else min(position, duration)
+    load_watch_tracker().heartbeat(
+        current_user_id(), session["id"], reel["id"], position, duration, topic=reel["topic"]
+    )
+
+
+def v2_component(name: str, html: str, css: str, js: str):
+    """Register a v2 component for this script run and return the callable that mounts it.
+
+    The registry belongs to the Streamlit runtime, which can be replaced while
+    this module stays imported (AppTest, benchmarks/bench_pages.py), so the
+    component is registered on every run; an identical definition just
+    overwrites itself.
+    """
+    return st.components.v2.component(name, html=html, css=css, js=js)
+
+
+@st.fragment
+def watch_player(reel: dict, height: int = 360):
+    """Play the reel and report its position while it plays; each report reruns only this fragment."""
+    video_id = youtube_video_id(reel["video_url"])
+    player = v2_component("reel_player", PLAYER_HTML, PLAYER_CSS, PLAYER_JS)(
+        key=f"player_{reel['id']}",
+        data={
+            "youtube_id": video_id or "",
+            "src": "" if video_id else reel["video_url"],
+            "height": height,
+            "interval": WATCH_HEARTBEAT_SECONDS,
+        },
+        on_playback_change=lambda: None,
+    )
+    playback = parse_playback(player.playback)
+    if playback is not None:
+        send_watch_heartbeat(reel, *playback)
+
+
+@st.cache_resource
+def load_chart_cache() -> ChartCache:
+    return ChartCache(maxsize=128)
+
+
+def cached_chart(name: str, data, build):
+    """Build (or reuse) DataFrames and figures for ``data``; rebuilt only when the data changes."""
+    with PROFILER.timer(f"chart:{name}"):
+        return load_chart_cache().get_or_build(name, data, build)
+
+
+def record_event(kind: str, reel: dict, value: float = 1):
+    load_event_log().append(
+        kind, reel["id"], topic=reel.get("topic"), user_id=current_user_id(), value=value
+    )
+    if kind in EVENT_COUNTERS:
+        load_engagement_counters().incr(reel["id"], EVENT_COUNTERS[kind], int(value))
+
+
+def reel_counts(reel: dict):
+    """Catalog like / save counts plus everything learners added since."""
+    counts = load_engagement_counters().get(reel["id"])
+    return reel["likes"] + counts.likes, reel["saves"] + counts.saves
+
+
+def engagement_line(reel: dict) -> str:
+    likes, saves = reel_counts(reel)
+    return f"👍 {likes} | 💾 {saves}"
+
+
+def reel_performance(limit: int = 10):
+    """Top reels by views from the rollups, or the catalog's creator stats before any events exist."""
+    rows = load_rollups().top_reels(limit)
+    if not rows:
+        return [
+            {**reel, "watch_time": round(reel["views"] * 0.6, 2)}
+            for reel in catalog_snapshot().creator_stats.get("recent_reels", [])
+        ]
+    return [
+        {
+            "title": reel["title"] if (reel := get_reel(row["reel_id"])) else row["reel_id"],
+            "views": row["views"],
+            "likes": row["likes"],
+            "watch_time": round(row["watch_seconds"] / 60, 2),
+        }
+        for row in rows
+    ]
+
+
+def current_user_id() -> str:
+    return st.query_params.get("user", LEARNER_PROFILE["id"])
+
+
+@st.cache_resource(max_entries=1)
+def load_id_spaces(version: int) -> dict:
+    """Dense id spaces behind the session engagement sets, one set of spaces per catalog version."""
+    catalog = load_catalog()
+    reels = IdSpace(f"reels/{version}", catalog)
+    return {
+        "liked_reels": reels,
+        "saved_reels": reels,
+        "followed_creators": IdSpace(f"creators/{version}", seed=catalog.creator_ids()),
+        "completed_quizzes": IdSpace(f"quizzes/{version}"),
+    }
+
+
+def engagement_set(kind: str, items=()) -> EngagementSet:
+    return EngagementSet(load_id_spaces(catalog_snapshot().version)[kind], items)
+
+
+def toggle_engagement(kind: str, item: str) -> bool:
+    """Flip membership in a persisted session set; returns True if the item was added."""
+    items = st.session_state[kind]
+    if item in items:
+        items.remove(item)
+        load_state_store().remove(current_user_id(), kind, item)
+        return False
+    items.add(item)
+    load_state_store().add(current_user_id(), kind, item)
+    return True
+
+
+def add_engagement(kind: str, item: str) -> bool:
+    """Add to a persisted session set; returns True if the item was new."""
+    if item in st.session_state[kind]:
+        return False
+    return toggle_engagement(kind, item)
+
+
+@st.cache_resource
+def load_media_cache() -> MetadataCache:
+    return MetadataCache(MEDIA_CACHE_DIR)
+
+
+@st.cache_resource
+def load_prefetch_service() -> PrefetchService:
+    # BITE_SIZED_FETCH_BASE sends every fetch to one server, e.g. a local stub.
+    transport = UrllibTransport(base_url=os.environ.get("BITE_SIZED_FETCH_BASE") or None)
+    service = PrefetchService(Prefetcher(load_media_cache(), transport, concurrency=8)).start()
+    atexit.register(service.close)
+    return service
+
+
+def prefetch_media(urls):
+    """Resolve video metadata and thumbnail URLs in the background; renders only read the cache."""
+    if PREFETCH_ENABLED:
+        load_prefetch_service().submit(urls)
+
+
+def reel_media(reel: dict) -> dict:
+    return load_media_cache().get(reel["video_url"]) or {}
+
+
+@st.cache_resource
+def load_question_bank() -> QuestionBank:
+    """Built-in questions plus questions.jsonl (or BITE_SIZED_QUESTIONS) when present, loaded once."""
+    if os.path.exists(QUESTIONS_PATH):
+        return QuestionBank.from_jsonl(QUESTIONS_PATH, extra=QUIZ_QUESTIONS)
+    return QuestionBank(QUIZ_QUESTIONS)
+
+
+@st.cache_resource
+def load_review_scheduler() -> ReviewScheduler:
+    scheduler = ReviewScheduler(DB_PATH)
+    atexit.register(scheduler.close)
+    return scheduler
+
+
+@st.cache_resource
+def load_progress_tracker() -> ProgressTracker:
+    tracker = ProgressTracker(DB_PATH)
+    atexit.register(tracker.close)
+    return tracker
+
+
+@st.cache_resource(max_entries=1)
+def load_course_index(version: int) -> CourseIndex:
+    """Course, module and playlist lookups by id, built once per catalog version."""
+    snapshot = catalog_snapshot()
+    return CourseIndex(snapshot.micro_courses, snapshot.playlists)
+
+
+def course_index() -> CourseIndex:
+    return load_course_index(catalog_snapshot().version)
+
+
+@st.cache_resource
+def load_xp_ledger() -> XPLedger:
+    ledger = XPLedger(DB_PATH)
+    atexit.register(ledger.close)
+    return ledger
+
+
+def award_xp(kind: str, key: str, topic: str = None):
+    """Award XP for ``kind`` once per learner and ``key``; new badges pop up as toasts."""
+    badges = load_xp_ledger().award(current_user_id(), key, kind, topic=topic)
+    if badges is None:
+        return
+    st.session_state.xp_dynamic += XP_POINTS[kind]
+    load_state_store().increment(current_user_id(), "xp_dynamic", XP_POINTS[kind])
+    for badge in badges:
+        st.toast(f"🏅 Badge unlocked: {badge}")
+
+
+@st.cache_resource
+def load_comment_store() -> CommentStore:
+    store = CommentStore(DB_PATH)
+    atexit.register(store.close)
+    return store
+
+
+@st.cache_resource
+def load_upload_store() -> UploadStore:
+    return UploadStore(DB_PATH)
+
+
+def post_comment(thread: str, text: str):
+    comment = load_comment_store().post(thread, text, author=current_user_id())
+    index_comment(load_search_index(catalog_snapshot().version), comment)
+
+
+def index_comment(index: SearchIndex, comment: dict):
+    index.add(
+        f"comment:{comment['thread']}@{comment['ts']}",
+        "comment",
+        comment["body"],
+        payload={"thread": comment["thread"]},
+    )
+
+
+def index_upload(index: SearchIndex, upload_id: str, upload: dict):
+    index.add(
+        f"upload:{upload_id}",
+        "upload",
+        upload["title"],
+        upload["topic"],
+        upload["difficulty"],
+        upload["tags"].replace(",", " "),
+        payload={"topic": upload["topic"]},
+    )
+
+
+@st.cache_resource(max_entries=1)
+def load_facet_index(version: int):
+    """Browse columns and facet bitmaps, built once per catalog version."""
+    from browse import FacetIndex
+
+    return FacetIndex(load_catalog())
+
+
+@st.cache_resource(max_entries=1)
+def load_search_index(version: int) -> SearchIndex:
+    """Built once per catalog version; uploads and comments are added incrementally as they are posted."""
+    index = SearchIndex()
+    for reel in load_catalog():
+        index.add(
+            f"reel:{reel['id']}",
+            "reel",
+            reel["title"],
+            reel["creator"],
+            reel["topic"],
+            reel["difficulty"],
+            payload={"reel_id": reel["id"], "creator": reel["creator"], "topic": reel["topic"]},
+        )
+    for course in catalog_snapshot().micro_courses:
+        for module in course["modules"]:
+            index.add(
+                f"module:{course['id']}/{module['id']}",
+                "module",
+                module["title"],
+                course["title"],
+                payload={"course": course["title"]},
+            )
+    for comment in load_comment_store().iter_all():
+        index_comment(index, comment)
+    for upload in load_upload_store().iter_all():
+        index_upload(index, upload["upload_id"], upload)
+    return index
+
+
+def show_older_comments(key: str, cursor: int):
+    st.session_state.comment_cursors.setdefault(key, [None]).append(cursor)
+
+
+def show_newer_comments(key: str):
+    st.session_state.comment_cursors[key].pop()
+
+
+@PROFILER.instrument()
+def render_comment_thread(thread: str, key: str):
+    """Render one newest-first page of a thread, with buttons to page through older comments."""
+    store = load_comment_store()
+    cursors = st.session_state.comment_cursors.get(key, [None])
+    comments, next_cursor = store.page(thread, before=cursors[-1], limit=COMMENT_PAGE_SIZE)
+    total = store.count(thread)
+    if total:
+        st.caption(f"{total} comment{'s' if total != 1 else ''}")
+    for c in comments:
+        st.write(f"• {c['body']}")
+    if len(cursors) > 1 or next_cursor is not None:
+        col1, col2 = st.columns(2)
+        if len(cursors) > 1:
+            col1.button("Newer", key=f"{key}_newer", on_click=show_newer_comments, args=(key,))
+        if next_cursor is not None:
+            col2.button(
+                "Older comments", key=f"{key}_older", on_click=show_older_comments, args=(key, next_cursor)
+            )
 
 
 def get_reel(reel_id: str):
-    return next((reel for reel in REELS if reel["id"] == reel_id), None)
+    return load_catalog().get(reel_id)
 
 
 def stat_card(label: str, value, help_text: str = ""):
@@ -193,107 +749,228 @@ def stat_card(label: str, value, help_text: str = ""):
             st.write(help_text)
 
 
-def render_embedded_video(url: str, height: int = 320):
-    """Render YouTube/shorts links as an embedded iframe; fall back to st.video for others."""
-    parsed = urlparse(url)
-    host = parsed.netloc.lower()
-    video_id = None
-
-    if "youtube.com" in host or "youtu.be" in host:
-        # Handle standard watch URLs
-        if parsed.path.startswith("/watch"):
-            qs = parse_qs(parsed.query)
-            video_id = qs.get("v", [None])[0]
-        # Handle youtu.be short links
-        if not video_id and host == "youtu.be":
-            video_id = parsed.path.lstrip("/")
-        # Handle shorts URLs
-        if not video_id and "/shorts/" in parsed.path:
-            video_id = parsed.path.split("/shorts/")[1].split("/")[0]
+def load_st_player():
+    """Return streamlit_player's st_player if it is installed, else None."""
+    try:
+        from streamlit_player import st_player
+    except ModuleNotFoundError:
+        return None
+    return st_player
+
+
+YOUTUBE_IFRAME = """
+<iframe
+    width="100%"
+    height="{height}"
+    src="{embed_url}"
+    title="YouTube video player"
+    frameborder="0"
+    allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share"
+    allowfullscreen
+></iframe>
+"""
+
+# Static thumbnail + play button; the real player is only created on click.
+YOUTUBE_FACADE = """
+<div
+    role="button"
+    title="Play video"
+    style="position:relative;width:100%;height:{height}px;cursor:pointer;border-radius:8px;
+           background:#000 url('{thumbnail_url}') center/cover no-repeat;"
+    onclick="this.outerHTML = this.querySelector('template').innerHTML;"
+>
+    <svg viewBox="0 0 68 48" width="68" height="48"
+         style="position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);">
+        <path d="M66.5 7.7a8.5 8.5 0 0 0-6-6C55.2.3 34 .3 34 .3s-21.2 0-26.5 1.4a8.5 8.5 0 0 0-6 6
+                 C.1 13 .1 24 .1 24s0 11 1.4 16.3a8.5 8.5 0 0 0 6 6C12.8 47.7 34 47.7 34 47.7s21.2 0
+                 26.5-1.4a8.5 8.5 0 0 0 6-6C67.9 35 67.9 24 67.9 24s0-11-1.4-16.3z" fill="#f00"/>
+        <path d="M45 24 27 14v20z" fill="#fff"/>
+    </svg>
+    <template>{iframe}</template>
+</div>
+"""
+
+
+@PROFILER.instrument()
+def render_embedded_video(url: str, height: int = 320, facade: bool = False, thumbnail_url: str = None):
+    """Render YouTube/shorts links as an embedded iframe; fall back to st.video for others.
+
+    With ``facade=True`` only a thumbnail (``thumbnail_url`` when resolved) is shown until the learner clicks play.
+    """
+    video_id = youtube_video_id(url)
 
     if video_id:
         embed_url = f"https://www.youtube.com/embed/{video_id}"
-        components.html(
-            f"""
-            <iframe
-                width="100%"
-                height="{height}"
-                src="{embed_url}"
-                title="YouTube video player"
-                frameborder="0"
-                allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share"
-                allowfullscreen
-            ></iframe>
-            """,
-            height=height + 10,
-        )
+        if facade:
+            iframe = YOUTUBE_IFRAME.format(height=height, embed_url=f"{embed_url}?autoplay=1")
+            # The thumbnail URL comes from oEmbed: percent-encode quotes and parentheses for the CSS
+            # url(), then escape it for the style attribute.
+            thumbnail_url = quote(thumbnail_url or youtube_thumbnail_url(video_id), safe=":/?#[]@!$&*+,;=%~")
+            html = YOUTUBE_FACADE.format(height=height, thumbnail_url=escape(thumbnail_url, quote=True), iframe=iframe)
+        else:
+            html = YOUTUBE_IFRAME.format(height=height, embed_url=embed_url)
+        components.html(html, height=height + 10)
+    else:
+        st_player = load_st_player()
+        if st_player is not None:
+            st_player(url)
+        else:
+            st.video(url)
+
+
+def remember_like(reel_id: str, liked: bool = True):
+    recent = st.session_state.recent_likes
+    if reel_id in recent:
+        recent.remove(reel_id)
+    if liked:
+        recent.append(reel_id)
+        del recent[:-RECENT_LIKES]
+
+
+def like_reel(reel: dict):
+    if toggle_engagement("liked_reels", reel["id"]):
+        award_xp("like", f"like/{reel['id']}", reel["topic"])
+        record_event("like", reel)
+        remember_like(reel["id"])
     else:
-        st.video(url)
+        record_event("like", reel, value=-1)
+        remember_like(reel["id"], liked=False)
+
+
+def save_reel(reel: dict):
+    if toggle_engagement("saved_reels", reel["id"]):
+        award_xp("save", f"save/{reel['id']}", reel["topic"])
+        record_event("save", reel)
+    else:
+        record_event("save", reel, value=-1)
+
+
+def follow_creator(reel: dict):
+    if reel.get("creator_id"):
+        toggle_engagement("followed_creators", reel["creator_id"])
+
+
+@st.fragment
+@PROFILER.instrument()
+def reel_card_actions(reel: dict):
+    """Counters and Like / Save / Follow buttons; a click reruns only this fragment.
+
+    Other cards by the same creator pick up a follow on the next full rerun.
+    """
+    liked = reel["id"] in st.session_state.liked_reels
+    saved = reel["id"] in st.session_state.saved_reels
+    followed = reel.get("creator_id") in st.session_state.followed_creators
+    st.write(engagement_line(reel))
+    st.button(
+        "❤️ Liked" if liked else "🤍 Like",
+        key=f"like_{reel['id']}",
+        type="primary" if liked else "secondary",
+        on_click=like_reel,
+        args=(reel,),
+    )
+    st.button("✅ Saved" if saved else "💾 Save", key=f"save_{reel['id']}", on_click=save_reel, args=(reel,))
+    st.button(
+        f"✅ Following {reel['creator']}" if followed else f"➕ Follow {reel['creator']}",
+        key=f"follow_{reel['id']}",
+        on_click=follow_creator,
+        args=(reel,),
+    )
+
+
+@st.fragment
+@PROFILER.instrument()
+def reel_card_comments(reel: dict):
+    """Comment box and thread; posting or paging reruns only this fragment."""
+    st.markdown("**Questions / Comments**")
+    new_comment = st.text_area(
+        "Ask something about this reel",
+        key=f"comment_input_{reel['id']}",
+        label_visibility="collapsed",
+    )
+    if st.button("Post comment", key=f"post_comment_{reel['id']}"):
+        if new_comment.strip():
+            post_comment(reel_thread(reel["id"]), new_comment.strip())
+            st.success("Comment added!")
+    render_comment_thread(reel_thread(reel["id"]), key=f"comments_{reel['id']}")
 
 
+@PROFILER.instrument()
 def render_reel_card(reel: dict, can_interact=True):
+    media = reel_media(reel)
     cols = st.columns([2, 1])
     with cols[0]:
         # Use a custom embedded player to keep playback inside the app,
-        # including Shorts / youtu.be links.
-        render_embedded_video(reel["video_url"], height=260)
+        # including Shorts / youtu.be links. Feed cards start as a facade.
+        render_embedded_video(reel["video_url"], height=260, facade=True, thumbnail_url=media.get("thumbnail_url"))
     with cols[1]:
         st.markdown(f"### {reel['title']}")
         st.write(f"{reel['creator']} • {reel['topic']} • {reel['difficulty']}")
-        st.write(f"Duration: {reel['duration']}")
-        st.write(f"👍 {reel['likes']} | 💾 {reel['saves']}")
+        st.write(f"Duration: {format_duration(media.get('duration') or parse_duration(reel['duration']))}")
+        # Interactions are fragments, so a click never reruns the feed or re-sends other cards.
         if can_interact:
-            liked = reel["id"] in st.session_state.liked_reels
-            saved = reel["id"] in st.session_state.saved_reels
-            followed = reel.get("creator_id") in st.session_state.followed_creators
-            like_button = st.button(
-                "❤️ Liked" if liked else "🤍 Like",
-                key=f"like_{reel['id']}",
-                type="primary" if liked else "secondary",
-            )
-            save_button = st.button(
-                "✅ Saved" if saved else "💾 Save",
-                key=f"save_{reel['id']}",
-            )
-            follow_button = st.button(
-                f"✅ Following {reel['creator']}" if followed else f"➕ Follow {reel['creator']}",
-                key=f"follow_{reel['creator_id']}",
-            )
-            if like_button:
-                if liked:
-                    st.session_state.liked_reels.remove(reel["id"])
-                else:
-                    st.session_state.liked_reels.add(reel["id"])
-                    st.session_state.xp_dynamic += 5
-            if save_button:
-                if saved:
-                    st.session_state.saved_reels.remove(reel["id"])
-                else:
-                    st.session_state.saved_reels.add(reel["id"])
-                    st.session_state.xp_dynamic += 3
-            if follow_button and reel.get("creator_id"):
-                if followed:
-                    st.session_state.followed_creators.remove(reel["creator_id"])
-                else:
-                    st.session_state.followed_creators.add(reel["creator_id"])
+            reel_card_actions(reel)
+        else:
+            st.write(engagement_line(reel))
 
         # Key takeaways (static for now)
         st.caption("Key takeaway: Short, focused concept you can re-watch in under a minute.")
 
-    # Comments section
-    st.markdown("**Questions / Comments**")
-    comment_key = f"{reel['id']}_comments"
-    new_comment = st.text_area(
-        "Ask something about this reel",
-        key=f"comment_input_{reel['id']}",
-        label_visibility="collapsed",
+    reel_card_comments(reel)
+
+
+def apply_feed_actions(payload):
+    """Replay one batch of clicks from the feed component, in click order."""
+    toggles = {
+        "like": ("liked_reels", lambda reel: reel["id"], like_reel),
+        "save": ("saved_reels", lambda reel: reel["id"], save_reel),
+        "follow": ("followed_creators", lambda reel: reel.get("creator_id"), follow_creator),
+    }
+    for reel_id, action, on in parse_feed_actions(payload):
+        reel = get_reel(reel_id)
+        if reel is None:
+            continue
+        if action == "comments":
+            st.session_state.feed_comments_reel = reel_id
+            continue
+        kind, item, toggle = toggles[action]
+        if (item(reel) in st.session_state[kind]) != on:
+            toggle(reel)
+
+
+@PROFILER.instrument()
+def render_reel_feed(reel_ids: list):
+    """A whole page of reels as one component: compact rows in, one batch of clicks back per pause.
+
+    Comments are not part of the component; "Comments" on a card opens that
+    reel's thread below the feed.
+    """
+    liked, saved = st.session_state.liked_reels, st.session_state.saved_reels
+    followed = st.session_state.followed_creators
+    rows = []
+    for reel_id in reel_ids:
+        reel = get_reel(reel_id)
+        media = reel_media(reel)
+        flags = (
+            (LIKED if reel_id in liked else 0)
+            | (SAVED if reel_id in saved else 0)
+            | (FOLLOWING if reel.get("creator_id") in followed else 0)
+        )
+        duration = format_duration(media.get("duration") or parse_duration(reel["duration"]))
+        rows.append(feed_row(reel, duration, media.get("thumbnail_url"), *reel_counts(reel), flags))
+    feed = v2_component("reel_feed", FEED_HTML, FEED_CSS, FEED_JS)(
+        key="reel_feed", data={"fields": FEED_FIELDS, "rows": rows}, on_actions_change=lambda: None
     )
-    if st.button("Post comment", key=f"post_comment_{reel['id']}"):
-        if new_comment.strip():
-            st.session_state.reel_comments.setdefault(reel["id"], []).append(new_comment.strip())
-            st.success("Comment added!")
-    for c in st.session_state.reel_comments.get(reel["id"], []):
-        st.write(f"• {c}")
+    # The cards already show these clicks; the ranking picks them up on the next rerun, as with fragment clicks.
+    apply_feed_actions(feed.actions)
+
+    reel_id = st.session_state.feed_comments_reel
+    if reel_id in reel_ids:
+        st.subheader(f"💬 {get_reel(reel_id)['title']}")
+        reel_card_comments(get_reel(reel_id))
+
+
+def load_more_feed():
+    st.session_state.feed_cursor += FEED_PAGE_SIZE
 
 
 def learner_home_feed():
@@ -302,79 +979,114 @@ def learner_home_feed():
 
     # Build recommendation ordering
     liked_topics = {
-        get_reel(rid)["topic"]
-        for rid in st.session_state.liked_reels
-        if get_reel(rid) is not None
+        reel["topic"]
+        for reel in map(get_reel, st.session_state.liked_reels)
+        if reel is not None
     }
     saved_topics = {
-        get_reel(rid)["topic"]
-        for rid in st.session_state.saved_reels
-        if get_reel(rid) is not None
+        reel["topic"]
+        for reel in map(get_reel, st.session_state.saved_reels)
+        if reel is not None
     }
     interesting_topics = liked_topics.union(saved_topics)
 
-    def sort_score(reel):
-        score = 0
-        if reel.get("creator_id") in st.session_state.followed_creators:
-            score += 3
-        if reel["topic"] in interesting_topics:
-            score += 2
-        if reel["id"] in st.session_state.saved_reels:
-            score += 1
-        return -score
-
-    sorted_reels = sorted(REELS, key=sort_score)
+    # Only re-rank when the signals behind the ranking change; paging reuses it
+    # until the cursor runs past the top-k already selected. Reels other
+    # learners engaged with alongside the recent likes are blended in.
+    ranking_key = (
+        frozenset(st.session_state.liked_reels),
+        frozenset(st.session_state.saved_reels),
+        frozenset(st.session_state.followed_creators),
+        frozenset(load_similar_reels().blend(st.session_state.recent_likes, SIMILAR_REELS)),
+    )
+    total = len(load_catalog())
+    version = catalog_snapshot().version  # a catalog reload invalidates the ranking too
+    cursor = st.session_state.feed_cursor
+    if st.session_state.feed_ranking_key != (version, ranking_key) or (
+        len(st.session_state.feed_ranking) < min(cursor, total)
+    ):
+        k = -(-cursor // FEED_RANKING_CHUNK) * FEED_RANKING_CHUNK
+        liked, saved, followed, similar = ranking_key
+        st.session_state.feed_ranking = load_recommender(version).top_k(liked, saved, followed, k, similar=similar)
+        st.session_state.feed_ranking_key = (version, ranking_key)
+    visible = st.session_state.feed_ranking[:cursor]
+    # Resolve this page and the next one while the learner reads.
+    upcoming = st.session_state.feed_ranking[: cursor + FEED_PAGE_SIZE]
+    prefetch_media(get_reel(reel_id)["video_url"] for reel_id in upcoming)
 
     if interesting_topics or st.session_state.followed_creators:
         st.subheader("Recommended for you")
-    for reel in sorted_reels:
-        render_reel_card(reel)
-        st.divider()
+    if FEED_COMPONENT_ENABLED:
+        render_reel_feed(visible)
+    else:
+        for reel_id in visible:
+            render_reel_card(get_reel(reel_id))
+            st.divider()
+
+    st.caption(f"Showing {len(visible)} of {total} reels")
+    if len(visible) < total:
+        st.button("Load more", key="feed_load_more", on_click=load_more_feed)
+
+
+def open_in_viewer(reel_id: str):
+    st.session_state.viewer_reel = reel_id
+
+
+def render_up_next(reel: dict):
+    """Reels that learners who liked or saved this one also liked or saved (one precomputed lookup)."""
+    st.subheader("Up next")
+    similar = [r for r in map(get_reel, load_similar_reels().neighbors(reel["id"], SIMILAR_REELS)) if r is not None]
+    if not similar:
+        st.caption("Similar reels appear here once learners like or save this one alongside others.")
+    for other in similar:
+        col1, col2 = st.columns([4, 1])
+        col1.write(f"**{other['title']}** • {other['creator']} • {other['topic']} • {other['duration']}")
+        col2.button(
+            "▶️ Watch", key=f"up_next_{reel['id']}_{other['id']}", on_click=open_in_viewer, args=(other["id"],)
+        )
 
 
 def learner_reel_viewer():
     st.title("👀 Reel Viewer")
-    default = REELS[0]["id"]
+    catalog = load_catalog()
+    default = catalog.at(0)["id"]
     selected_id = st.selectbox(
         "Choose a reel",
-        options=[r["id"] for r in REELS],
+        options=catalog.ids(),
         format_func=lambda rid: get_reel(rid)["title"],
         index=0,
+        key="viewer_reel",
     )
     reel = get_reel(selected_id) or get_reel(default)
     if reel:
-        render_embedded_video(reel["video_url"], height=360)
+        if reel["id"] not in st.session_state.viewed_reels:
+            st.session_state.viewed_reels.add(reel["id"])
+            record_event("view", reel)
+        watch_player(reel, height=360)
         st.markdown(f"### {reel['title']}")
         st.write(f"By **{reel['creator']}** • Topic: {reel['topic']} • {reel['difficulty']}")
         st.caption("Key takeaway: Focus on one core idea and an example you can reuse.")
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("❤️ Like", key=f"viewer_like_{reel['id']}"):
-                st.session_state.liked_reels.add(reel["id"])
-                st.session_state.xp_dynamic += 5
+                if add_engagement("liked_reels", reel["id"]):
+                    record_event("like", reel)
+                    remember_like(reel["id"])
+                award_xp("like", f"like/{reel['id']}", reel["topic"])
         with col2:
             if st.button("💾 Save", key=f"viewer_save_{reel['id']}"):
-                st.session_state.saved_reels.add(reel["id"])
-                st.session_state.xp_dynamic += 3
+                if add_engagement("saved_reels", reel["id"]):
+                    record_event("save", reel)
+                award_xp("save", f"save/{reel['id']}", reel["topic"])
+        with col3:
+            if st.button("✅ Finished watching", key=f"viewer_finished_{reel['id']}"):
+                send_watch_heartbeat(reel, finished=True)  # completes the reel through the tracker's on_complete
+                st.toast("Nice! Logged to your progress dashboard.")
+
+        render_up_next(reel)
 
-        # Simple quiz after reel
         st.subheader("Quick check")
-        quiz_key = f"quiz_reel_{reel['id']}"
-        question = "What is the main benefit of bite-sized learning?"
-        options = [
-            "It helps you memorise long lectures at once",
-            "It breaks concepts into short, focused chunks",
-            "It removes the need for practice",
-        ]
-        answer = st.radio(question, options, key=quiz_key)
-        if st.button("Submit answer", key=f"submit_{quiz_key}"):
-            if answer == options[1]:
-                st.success("Correct! +10 XP")
-                if quiz_key not in st.session_state.completed_quizzes:
-                    st.session_state.completed_quizzes.add(quiz_key)
-                    st.session_state.xp_dynamic += 10
-            else:
-                st.error("Not quite. Remember: short, focused chunks win.")
+        render_quiz(f"reel/{reel['id']}", xp_key=f"quiz_reel_{reel['id']}", topic=reel["topic"])
 
         # Comments for this reel (viewer context)
         st.subheader("Questions / Comments")
@@ -384,119 +1096,344 @@ def learner_reel_viewer():
         )
         if st.button("Post comment", key=f"viewer_post_comment_{reel['id']}"):
             if new_comment.strip():
-                st.session_state.reel_comments.setdefault(reel["id"], []).append(
-                    new_comment.strip()
-                )
+                post_comment(reel_thread(reel["id"]), new_comment.strip())
                 st.success("Comment added!")
-        for c in st.session_state.reel_comments.get(reel["id"], []):
-            st.write(f"• {c}")
+        render_comment_thread(reel_thread(reel["id"]), key=f"viewer_comments_{reel['id']}")
         st.success("Comments & transcripts coming soon 📜")
 
 
+SEARCH_KIND_LABELS = {"reel": "🎬 Reel", "module": "📚 Module", "upload": "⬆️ New upload", "comment": "💬 Comment"}
+
+
+def render_quiz(target: str, xp_key: str = None, topic: str = None) -> bool:
+    """Quiz form for ``target``: answers are graded together, then the quiz joins the learner's review deck.
+
+    A pass also completes ``xp_key`` (once) for quiz XP. Returns True on the rerun that submits a pass.
+    """
+    bank = load_question_bank()
+    questions = bank.for_target(target)
+    if not questions:
+        return False
+    with st.form(f"quiz_{target}"):
+        choices = {
+            question.id: st.radio(question.prompt, question.options, index=None, key=f"quiz_{target}_{question.id}")
+            for question in questions
+        }
+        submitted = st.form_submit_button("Submit answers")
+    if not submitted:
+        return False
+    results, quality = bank.grade(
+        {
+            question.id: question.options.index(choices[question.id]) if choices[question.id] is not None else None
+            for question in questions
+        }
+    )
+    card = load_review_scheduler().review(current_user_id(), target, quality)
+    for question in questions:
+        if not results[question.id]:
+            st.error(f"{question.prompt} {question.explanation or 'Not quite.'}")
+    next_review = f"next review in {card.interval:g} day{'s' if card.interval != 1 else ''}"
+    if quality >= PASSING_QUALITY:
+        st.success(f"{sum(results.values())}/{len(results)} correct, {next_review}.")
+        if xp_key and add_engagement("completed_quizzes", xp_key):
+            award_xp("quiz", xp_key, topic)
+        return True
+    st.warning(f"{sum(results.values())}/{len(results)} correct. Have another look; {next_review}.")
+    return False
+
+
+def review_target_label(target: str) -> str:
+    kind, _, rest = target.partition("/")
+    if kind == "reel":
+        reel = get_reel(rest)
+        return f"🎬 {reel['title']}" if reel else target
+    _, _, module_id = rest.partition("/")
+    index = course_index()
+    module = index.module(module_id)
+    if module is None:
+        return target
+    return f"📚 {index.course(index.course_of(module_id))['title']} · {module['title']}"
+
+
+def learner_daily_review():
+    st.title("🔁 Daily Review")
+    st.caption("Quizzes you have taken come back just before you would forget them (SM-2 spacing).")
+    scheduler = load_review_scheduler()
+    due = scheduler.due(current_user_id(), limit=REVIEW_BATCH)
+    if not due:
+        upcoming = scheduler.next_due(current_user_id())
+        if upcoming is None:
+            st.info("No reviews yet. Take a quiz in the Reel Viewer or a micro-course to start your deck.")
+        else:
+            days = max(upcoming.due - time.time(), 0) / DAY
+            st.success(f"All caught up! Next review ({review_target_label(upcoming.card_id)}) in {days:.1f} days.")
+        return
+    st.caption(f"{len(due)}{'+' if len(due) == REVIEW_BATCH else ''} due today, most overdue first")
+    card = due[0]
+    st.subheader(review_target_label(card.card_id))
+    render_quiz(card.card_id)
+    if len(due) > 1:
+        st.caption("Up next: " + ", ".join(review_target_label(card.card_id) for card in due[1:4]))
+
+
+def learner_search():
+    st.title("🔎 Search")
+    st.caption("Reels, creators, topics, course modules and comments. Partial words match too.")
+    query = st.text_input("Search", placeholder="e.g. python, design, prompt pat…", label_visibility="collapsed")
+    kinds = st.multiselect(
+        "Only show", options=list(SEARCH_KIND_LABELS), format_func=SEARCH_KIND_LABELS.get
+    )
+    if not query.strip():
+        return
+    hits = load_search_index(catalog_snapshot().version).search(query, limit=20, kinds=set(kinds) or None)
+    if not hits:
+        st.info("No matches yet. Try a shorter or different word.")
+    for hit in hits:
+        payload = hit["payload"]
+        if hit["kind"] == "reel":
+            detail = f"{payload['creator']} • {payload['topic']}"
+        elif hit["kind"] == "module":
+            detail = payload["course"]
+        elif hit["kind"] == "upload":
+            detail = payload["topic"]
+        else:
+            kind, _, target = payload["thread"].partition("/")
+            reel = get_reel(target) if kind == "reel" else None
+            detail = f"on {reel['title']}" if reel else f"on {target}"
+        st.markdown(f"{SEARCH_KIND_LABELS[hit['kind']]} · **{hit['title']}**  \n{detail}")
+
+
+def reset_browse_page():
+    st.session_state.browse_page = 1
+
+
+def learner_browse():
+    st.title("🧭 Browse")
+    st.caption("Narrow the whole catalog by topic, level, creator, length and popularity.")
+    index = load_facet_index(catalog_snapshot().version)
+    shortest, longest = index.bounds("seconds")
+    # Widget values from this rerun are already in session state, so the
+    # counts next to each option reflect the other filters as they are now.
+    selected = {facet: st.session_state.get(f"browse_{facet}", []) for facet in ("topic", "difficulty", "creator_id")}
+    seconds = st.session_state.get("browse_seconds", (shortest, longest))
+    min_popularity = st.session_state.get("browse_popularity", 0)
+    sort_column, descending = BROWSE_SORTS[st.session_state.get("browse_sort", "Most popular")]
+    page = st.session_state.get("browse_page", 1)
+    total, positions, counts = index.query(
+        selected,
+        {
+            "seconds": seconds if tuple(seconds) != (shortest, longest) else (None, None),
+            "popularity": (min_popularity or None, None),
+        },
+        sort=sort_column,
+        descending=descending,
+        offset=(page - 1) * BROWSE_PAGE_SIZE,
+        limit=BROWSE_PAGE_SIZE,
+    )
+
+    col1, col2, col3 = st.columns(3)
+    col1.multiselect(
+        "Topic",
+        index.values("topic"),
+        key="browse_topic",
+        format_func=lambda value: f"{value} ({counts['topic'][value]:,})",
+        on_change=reset_browse_page,
+    )
+    col2.multiselect(
+        "Difficulty",
+        index.values("difficulty"),
+        key="browse_difficulty",
+        format_func=lambda value: f"{value} ({counts['difficulty'][value]:,})",
+        on_change=reset_browse_page,
+    )
+    col3.multiselect(
+        "Creator",
+        index.values("creator_id"),
+        key="browse_creator_id",
+        format_func=lambda value: f"{index.creator_name(value)} ({counts['creator_id'][value]:,})",
+        on_change=reset_browse_page,
+    )
+    col1, col2, col3 = st.columns(3)
+    col1.slider(
+        "Length (seconds)",
+        min_value=shortest,
+        max_value=max(longest, shortest + 1),
+        value=(shortest, longest),
+        key="browse_seconds",
+        on_change=reset_browse_page,
+    )
+    col2.number_input(
+        "Min. popularity (likes + saves)", min_value=0, step=100, key="browse_popularity", on_change=reset_browse_page
+    )
+    col3.selectbox("Sort by", list(BROWSE_SORTS), key="browse_sort", on_change=reset_browse_page)
+
+    st.caption(f"{total:,} reels")
+    if not total:
+        st.info("No reels match every filter. Try removing one.")
+        return
+    catalog = load_catalog()
+    st.dataframe(
+        [
+            {
+                "title": reel["title"],
+                "creator": reel["creator"],
+                "topic": reel["topic"],
+                "difficulty": reel["difficulty"],
+                "length": format_duration(index.columns["seconds"][position]),
+                "popularity": int(index.columns["popularity"][position]),
+            }
+            for position in positions.tolist()
+            for reel in (catalog.at(position),)
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+    pages = -(-total // BROWSE_PAGE_SIZE)
+    if pages > 1:
+        st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key="browse_page")
+
+
 def learner_playlists():
     st.title("🗂️ Learning Playlists")
-    for playlist in PLAYLISTS:
+    index = course_index()
+    tracker = load_progress_tracker()
+    for playlist in index.playlists():
+        pid = playlist_id(playlist)
         with st.container(border=True):
             st.markdown(f"### {playlist['name']}")
             st.write(playlist["description"])
-            st.progress(playlist["progress"])
+            done, total = tracker.done(current_user_id(), "playlist", pid, index), index.total("playlist", pid)
+            st.progress(done / total if total else 0.0)
+            st.caption(f"{done} of {total} reels finished")
             st.write("Tags:", ", ".join(playlist["tags"]))
             st.caption(
                 "Includes: "
-                + ", ".join(get_reel(rid)["title"] for rid in playlist["reels"])
+                + ", ".join(reel["title"] for reel in map(get_reel, playlist["reels"]) if reel is not None)
             )
 
 
+def finish_module(course: dict, module: dict):
+    """Record a finished module; finishing the last one completes the course (+25 XP, once)."""
+    user_id = current_user_id()
+    index = course_index()
+    tracker = load_progress_tracker()
+    if not tracker.complete(user_id, "module", module["id"]):
+        return
+    if tracker.done(user_id, "course", course["id"], index) == index.total("course", course["id"]):
+        course_complete_key = f"course_completed_{course['id']}"
+        if add_engagement("completed_quizzes", course_complete_key):
+            award_xp("course", course_complete_key)
+        st.toast(f"🎉 {course['title']} completed! +{XP_POINTS['course']} XP")
+
+
 def learner_micro_course_details():
     st.title("📚 Micro-Course Details")
-    options = [course["title"] for course in MICRO_COURSES]
-    selected = st.selectbox("Select a micro-course", options=options)
-    course = next(course for course in MICRO_COURSES if course["title"] == selected)
+    index = course_index()
+    tracker = load_progress_tracker()
+    user_id = current_user_id()
+    options = [course["id"] for course in index.courses()]
+    selected = st.selectbox(
+        "Select a micro-course", options=options, format_func=lambda course_id: index.course(course_id)["title"]
+    )
+    course = index.course(selected)
+    completion = tracker.progress(user_id, "course", course["id"], index)
     col1, col2, col3 = st.columns(3)
     col1.metric("Level", course["level"])
     col2.metric("Total Duration", course["duration"])
-    col3.metric("Completion", f"{int(course['completion']*100)}%")
-    st.progress(course["completion"])
+    col3.metric("Completion", f"{int(completion * 100)}%")
+    st.progress(completion)
     st.write(course["description"])
     st.caption("Key takeaways: Build mastery with tiny modules and quick checks.")
     st.subheader("Modules")
     for module in course["modules"]:
-        with st.expander(module["title"], expanded=False):
+        finished = tracker.completed(user_id, "module", module["id"])
+        with st.expander(f"{'✅ ' if finished else ''}{module['title']}", expanded=False):
             st.write(f"Duration: {module['duration']}")
             st.info("Placeholder video player coming soon.")
 
             # Key takeaway per module
             st.caption("Key takeaway: one small concept you can immediately apply.")
 
-            # Quiz per module
-            quiz_id = f"{course['id']}_{module['title']}"
-            q = "How should you approach each module?"
-            opts = [
-                "Rush through all of them at once",
-                "Finish one, reflect, then move to the next",
-                "Skip the ones you already know",
-            ]
-            ans = st.radio(q, opts, key=f"quiz_{quiz_id}")
-            if st.button("Submit answer", key=f"submit_{quiz_id}"):
-                if ans == opts[1]:
-                    st.success("Exactly. +10 XP")
-                    quiz_key = f"quiz_module_{quiz_id}"
-                    if quiz_key not in st.session_state.completed_quizzes:
-                        st.session_state.completed_quizzes.add(quiz_key)
-                        st.session_state.xp_dynamic += 10
-                else:
-                    st.error("Try again: depth over speed.")
+            # Quiz per module; a pass finishes the module
+            if render_quiz(f"module/{course['id']}/{module['id']}", xp_key=f"quiz_module_{module['id']}"):
+                finish_module(course, module)
+            if not finished:
+                st.button(
+                    "✅ Mark module finished",
+                    key=f"finish_{module['id']}",
+                    on_click=finish_module,
+                    args=(course, module),
+                )
 
             # Comments per module
             st.markdown("**Module questions**")
-            comment_key = f"{course['id']}::{module['title']}"
             new_c = st.text_area(
                 "Ask something about this module",
-                key=f"comment_{comment_key}",
+                key=f"comment_{module['id']}",
                 label_visibility="collapsed",
             )
-            if st.button("Post question", key=f"post_{comment_key}"):
+            if st.button("Post question", key=f"post_{module['id']}"):
                 if new_c.strip():
-                    st.session_state.course_comments.setdefault(comment_key, []).append(
-                        new_c.strip()
-                    )
+                    post_comment(module_thread(course["id"], module["id"]), new_c.strip())
                     st.success("Question added!")
-            for c in st.session_state.course_comments.get(comment_key, []):
-                st.write(f"• {c}")
+            render_comment_thread(module_thread(course["id"], module["id"]), key=f"module_comments_{module['id']}")
 
-    # Mark course complete (for XP)
-    if st.button("Mark course as completed"):
-        st.success("Nice work! Course marked as completed. +25 XP")
-        course_complete_key = f"course_completed_{course['id']}"
-        if course_complete_key not in st.session_state.completed_quizzes:
-            st.session_state.completed_quizzes.add(course_complete_key)
-            st.session_state.xp_dynamic += 25
+    if completion >= 1.0:
+        st.success(f"Course completed! +{XP_POINTS['course']} XP")
 
 
-def learner_progress_dashboard():
-    st.title("📈 Progress Tracking Dashboard")
+def build_weekly_chart(this_week):
+    import altair as alt
+    import pandas as pd
+
     weekly = pd.DataFrame(
         {
-            "day": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-            "minutes_watch": [12, 18, 25, 30, 22, 15, 10],
-            "reels_completed": [2, 3, 4, 5, 4, 3, 1],
+            "day": [d["day"].strftime("%a") for d in this_week],
+            "minutes_watch": [round(d["seconds"] / 60, 1) for d in this_week],
+            "reels_completed": [d["completions"] for d in this_week],
         }
     )
-    col1, col2, col3 = st.columns(3)
-    stat_card("Weekly Watch Time", "2h 12m", "+18% vs last week")
-    stat_card("Reels Completed", "22", "Streak day 12 🔥")
-    stat_card("Micro-Courses", "2 active", "Finish GenAI by Sunday")
-    st.subheader("Weekly watch trend")
     line_chart = (
         alt.Chart(weekly)
         .mark_line(point=True)
         .encode(
-            x="day",
+            x=alt.X("day", sort=None),
             y="minutes_watch",
             tooltip=["day", "minutes_watch", "reels_completed"],
             color=alt.value("#7563DF"),
         )
     )
+    return weekly, line_chart
+
+
+def learner_progress_dashboard():
+    st.title("📈 Progress Tracking Dashboard")
+    # Two weeks of daily rollups in one indexed range read: this week plus the one before.
+    today = datetime.date.today()
+    days = load_watch_tracker().daily(current_user_id(), today - datetime.timedelta(days=13), today)
+    last_week, this_week = days[:7], days[7:]
+    weekly, line_chart = cached_chart("weekly_watch", this_week, build_weekly_chart)
+    week_seconds = sum(d["seconds"] for d in this_week)
+    last_week_seconds = sum(d["seconds"] for d in last_week)
+    minutes = int(week_seconds // 60)
+    trend = (
+        f"{(week_seconds - last_week_seconds) / last_week_seconds:+.0%} vs last week"
+        if last_week_seconds
+        else "First week tracked"
+    )
+    col1, col2, col3 = st.columns(3)
+    stat_card("Weekly Watch Time", f"{minutes // 60}h {minutes % 60}m", trend)
+    streak = load_watch_tracker().streak(current_user_id(), today)
+    stat_card("Reels Completed", str(weekly["reels_completed"].sum()), f"Streak day {streak} 🔥" if streak else "")
+    index, progress = course_index(), load_progress_tracker()
+    active = progress.in_progress(current_user_id(), index)
+    closest = max(active, key=lambda cid: progress.progress(current_user_id(), "course", cid, index), default=None)
+    stat_card(
+        "Micro-Courses",
+        f"{len(active)} active",
+        f"Next to finish: {index.course(closest)['title']}" if closest else "",
+    )
+    st.subheader("Weekly watch trend")
     st.altair_chart(line_chart, use_container_width=True)
     st.subheader("Goal Tracker")
     for goal in LEARNER_PROFILE["learning_goals"]:
@@ -506,22 +1443,22 @@ def learner_progress_dashboard():
 def learner_profile():
     st.title("👤 Learner Profile")
     st.markdown(f"### {LEARNER_PROFILE['name']}")
-    col1, col2, col3 = st.columns(3)
-    total_xp = LEARNER_PROFILE["xp"] + st.session_state.xp_dynamic
-    col1.metric("Learning Streak", f"{LEARNER_PROFILE['streak']} days")
-    col2.metric("XP", total_xp)
-    # Dynamic badges based on XP / quizzes
-    dynamic_badges = []
-    if st.session_state.xp_dynamic >= 30:
-        dynamic_badges.append("Quiz Rookie")
-    if st.session_state.xp_dynamic >= 80:
-        dynamic_badges.append("Micro-Course Finisher")
-    all_badges = LEARNER_PROFILE["badges"] + dynamic_badges
-    col3.metric("Badges", len(all_badges))
+    ledger = load_xp_ledger()
+    user_id = current_user_id()
+    col1, col2, col3, col4 = st.columns(4)
+    streak = load_watch_tracker().streak(user_id, datetime.date.today())
+    col1.metric("Learning Streak", f"{streak} day{'s' if streak != 1 else ''}")
+    col2.metric("XP", f"{ledger.total(user_id):,}")
+    rank = ledger.rank(user_id)
+    col3.metric("Global Rank", f"#{rank:,}" if rank else "—")
+    # Earned badges are evaluated by the ledger as awards come in.
+    all_badges = LEARNER_PROFILE["badges"] + ledger.badges(user_id)
+    col4.metric("Badges", len(all_badges))
     st.subheader("Badges")
     st.write(", ".join(all_badges))
     st.subheader("Saved Reels")
-    saved = [get_reel(rid) for rid in st.session_state.saved_reels]
+    # Saved ids can outlive their reel when the catalog file is replaced.
+    saved = [reel for reel in map(get_reel, st.session_state.saved_reels) if reel is not None]
     for reel in saved:
         st.write(f"- {reel['title']} ({reel['topic']})")
     st.subheader("Learning Goals")
@@ -533,33 +1470,159 @@ def learner_profile():
     st.write(f"Quizzes completed: {len(st.session_state.completed_quizzes)}")
 
 
-def creator_dashboard():
-    st.title("🛠️ Creator Dashboard")
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Followers", f"{CREATOR_STATS['followers']:,}")
-    col2.metric("Reels Published", CREATOR_STATS["reels_published"])
-    col3.metric("Micro-Courses", CREATOR_STATS["micro_courses"])
-    col4.metric("Watch Time", f"{CREATOR_STATS['watch_time']:,} min")
-    st.subheader("Recent Reels")
-    df = pd.DataFrame(CREATOR_STATS["recent_reels"])
-    st.dataframe(df, hide_index=True, use_container_width=True)
-    st.subheader("Topic Performance")
+def build_recent_reels_table(performance):
+    import pandas as pd
+
+    return pd.DataFrame(performance, columns=["title", "views", "likes"])
+
+
+def build_topic_chart(topic_rows):
+    import altair as alt
+    import pandas as pd
+
     topic_df = pd.DataFrame(
         {
+            "topic": [row["topic"] for row in topic_rows],
+            "views": [row["views"] for row in topic_rows],
+        }
+        if topic_rows
+        else {
             "topic": ["AI", "Biology", "STEM Skills", "Ethics"],
             "views": [12000, 8200, 7600, 5400],
         }
     )
-    bar = alt.Chart(topic_df).mark_bar(color="#49A078").encode(x="topic", y="views")
+    return alt.Chart(topic_df).mark_bar(color="#49A078").encode(x="topic", y="views")
+
+
+def creator_dashboard():
+    st.title("🛠️ Creator Dashboard")
+    rollups = load_rollups()
+    totals = rollups.overall_totals()
+    stats = catalog_snapshot().creator_stats
+    watch_minutes = round(totals["watch_seconds"] / 60) if totals["views"] else stats.get("watch_time", 0)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Followers", f"{stats.get('followers', 0):,}")
+    col2.metric("Reels Published", stats.get("reels_published", len(load_catalog())))
+    col3.metric("Micro-Courses", stats.get("micro_courses", len(catalog_snapshot().micro_courses)))
+    col4.metric("Watch Time", f"{watch_minutes:,} min")
+    st.subheader("Recent Reels")
+    df = cached_chart("recent_reels", reel_performance(), build_recent_reels_table)
+    st.dataframe(df, hide_index=True, use_container_width=True)
+    st.subheader("Topic Performance")
+    bar = cached_chart("topic_performance", rollups.topic_totals(), build_topic_chart)
     st.altair_chart(bar, use_container_width=True)
 
 
+def show_older_uploads(cursor: int):
+    st.session_state.upload_cursors.append(cursor)
+
+
+def show_newer_uploads():
+    st.session_state.upload_cursors.pop()
+
+
+def start_bulk_import(uploaded_file):
+    index = load_search_index(catalog_snapshot().version)
+
+    prefetch = load_prefetch_service() if PREFETCH_ENABLED else None
+
+    def index_batch(batch):
+        for upload in batch:
+            index_upload(index, upload["upload_id"], upload)
+        if prefetch is not None:
+            prefetch.submit(upload["video_url"] for upload in batch)
+
+    st.session_state.upload_job = BulkImport(
+        load_upload_store(),
+        current_user_id(),
+        io.BytesIO(uploaded_file.getvalue()),
+        uploaded_file.name,
+        UPLOAD_TOPICS,
+        on_commit=index_batch,
+        workers=min(4, os.cpu_count() or 1),
+    )
+    st.session_state.upload_cursors = [None]
+
+
+@st.fragment(run_every=1)
+def bulk_import_progress():
+    """Poll the running import without rerunning the rest of the page."""
+    job = st.session_state.upload_job
+    if job.done:
+        st.rerun()  # one full rerun to show the summary and refresh the list
+    st.progress(
+        job.progress,
+        text=f"{job.rows_read:,} rows read • {job.rows_committed:,} imported • {job.error_count:,} errors",
+    )
+    st.button("Cancel import", on_click=job.cancel)
+
+
+def render_bulk_import():
+    st.caption(
+        "Columns: title, topic, duration (30–90s), difficulty, tags, video_url. "
+        f"Topics: {', '.join(UPLOAD_TOPICS)}."
+    )
+    job = st.session_state.upload_job
+    running = job is not None and not job.done
+    uploaded_file = st.file_uploader("Reels file", type=["csv", "jsonl", "ndjson"])
+    st.button(
+        "Start import",
+        disabled=uploaded_file is None or running,
+        on_click=start_bulk_import,
+        args=(uploaded_file,),
+    )
+    if running:
+        bulk_import_progress()
+    elif job is not None:
+        seconds = job.finished - job.started
+        message = (
+            f"Import {job.status}: {job.rows_committed:,} reels imported, "
+            f"{job.error_count:,} rows rejected in {seconds:.1f}s."
+        )
+        (st.success if job.status == "done" and not job.error_count else st.warning)(message)
+        if job.errors:
+            st.dataframe(
+                [{"line": line, "error": error} for line, error in job.errors[:100]],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.download_button(
+                "Download error report", error_report(job.errors), file_name="import_errors.csv", mime="text/csv"
+            )
+
+
+def render_upload_list():
+    store = load_upload_store()
+    creator_id = current_user_id()
+    total = store.count(creator_id)
+    if not total:
+        return
+    st.subheader("Recently Submitted Reels")
+    cursors = st.session_state.upload_cursors
+    uploads, next_cursor = store.page(creator_id, before=cursors[-1], limit=UPLOAD_PAGE_SIZE)
+    st.caption(f"{total:,} submitted • page {len(cursors)} of {-(-total // UPLOAD_PAGE_SIZE)}")
+    st.dataframe(
+        [
+            {key: upload[key] for key in ("title", "topic", "duration", "difficulty", "tags", "video_url")}
+            for upload in uploads
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+    col1, col2 = st.columns(2)
+    if len(cursors) > 1:
+        col1.button("Newer", key="uploads_newer", on_click=show_newer_uploads)
+    if next_cursor is not None:
+        col2.button("Older", key="uploads_older", on_click=show_older_uploads, args=(next_cursor,))
+
+
 def creator_upload_reel():
     st.title("⬆️ Upload Reel")
     st.caption("30–90s vertical nugget. Keep it crisp, actionable, and aligned to a topic.")
-    with st.form("upload_reel"):
+    single, bulk = st.tabs(["Single reel", "Bulk import (CSV / JSONL)"])
+    with single, st.form("upload_reel"):
         title = st.text_input("Title")
-        topic = st.selectbox("Topic", ["AI", "Math", "Design", "Biology", "Other"])
+        topic = st.selectbox("Topic", UPLOAD_TOPICS)
         duration = st.slider("Duration (seconds)", min_value=30, max_value=90, value=60)
         difficulty = st.select_slider(
             "Difficulty", options=["Beginner", "Intermediate", "Advanced"], value="Beginner"
@@ -568,7 +1631,7 @@ def creator_upload_reel():
         video_url = st.text_input("Video URL (YouTube / CDN)")
         submitted = st.form_submit_button("Submit Reel")
         if submitted:
-            st.session_state.uploaded_reels.append(
+            upload, errors = validate_upload(
                 {
                     "title": title or "Untitled Reel",
                     "topic": topic,
@@ -576,12 +1639,20 @@ def creator_upload_reel():
                     "difficulty": difficulty,
                     "tags": tags,
                     "video_url": video_url,
-                }
+                },
+                UPLOAD_TOPICS,
             )
-            st.success("Reel submitted! We'll review & publish within 24h.")
-    if st.session_state.uploaded_reels:
-        st.subheader("Recently Submitted Reels")
-        st.table(pd.DataFrame(st.session_state.uploaded_reels))
+            if errors:
+                st.error("; ".join(errors).capitalize())
+            else:
+                load_upload_store().insert_many(current_user_id(), [upload])
+                index_upload(load_search_index(catalog_snapshot().version), upload["upload_id"], upload)
+                prefetch_media([upload["video_url"]])
+                st.session_state.upload_cursors = [None]
+                st.success("Reel submitted! We'll review & publish within 24h.")
+    with bulk:
+        render_bulk_import()
+    render_upload_list()
 
 
 def creator_create_micro_course():
@@ -592,7 +1663,7 @@ def creator_create_micro_course():
         summary = st.text_area("Quick summary")
         videos = st.multiselect(
             "Attach existing reels",
-            options=[reel["title"] for reel in REELS],
+            options=[reel["title"] for reel in load_catalog()],
         )
         new_video_title = st.text_input("Add new module title")
         new_video_desc = st.text_area("Module notes / takeaway")
@@ -613,18 +1684,18 @@ def creator_create_micro_course():
         st.json(st.session_state.created_courses)
 
 
-def creator_analytics():
-    st.title("📊 Creator Analytics")
+def build_analytics_figures(performance):
+    import pandas as pd
+    import plotly.express as px
+
     analytics_df = pd.DataFrame(
         {
-            "reel": [reel["title"] for reel in CREATOR_STATS["recent_reels"]],
-            "views": [reel["views"] for reel in CREATOR_STATS["recent_reels"]],
-            "likes": [reel["likes"] for reel in CREATOR_STATS["recent_reels"]],
-            "watch_time": [round(reel["views"] * 0.6, 2) for reel in CREATOR_STATS["recent_reels"]],
+            "reel": [reel["title"] for reel in performance],
+            "views": [reel["views"] for reel in performance],
+            "likes": [reel["likes"] for reel in performance],
+            "watch_time": [reel["watch_time"] for reel in performance],
         }
     )
-    st.dataframe(analytics_df, hide_index=True, use_container_width=True)
-    st.subheader("Views vs Likes")
     scatter = px.scatter(
         analytics_df,
         x="views",
@@ -634,18 +1705,65 @@ def creator_analytics():
         color="likes",
         color_continuous_scale="viridis",
     )
+    pie = px.pie(analytics_df, values="views", names="reel")
+    return analytics_df, scatter, pie
+
+
+def creator_analytics():
+    st.title("📊 Creator Analytics")
+    analytics_df, scatter, pie = cached_chart(
+        "creator_analytics", reel_performance(), build_analytics_figures
+    )
+    st.dataframe(analytics_df, hide_index=True, use_container_width=True)
+    st.subheader("Views vs Likes")
     st.plotly_chart(scatter, use_container_width=True)
     st.subheader("Views Breakdown")
-    pie = px.pie(analytics_df, values="views", names="reel")
     st.plotly_chart(pie, use_container_width=True)
 
 
+LEADERBOARD_SCOPES = {"This week": "weekly", "All time": "global", "By topic": "topic"}
+
+
+def learner_leaderboard():
+    st.title("🏆 Leaderboard")
+    ledger = load_xp_ledger()
+    user_id = current_user_id()
+    scope = LEADERBOARD_SCOPES[st.radio("Board", list(LEADERBOARD_SCOPES), horizontal=True)]
+    topic = None
+    if scope == "topic":
+        topics = ledger.topics()
+        if not topics:
+            st.info("Earn XP on a reel to start a topic board.")
+            return
+        topic = st.selectbox("Topic", topics)
+    st.caption(f"{ledger.size(scope, topic):,} learners")
+    st.dataframe(
+        [{"rank": rank, "learner": learner, "XP": xp} for rank, learner, xp in ledger.top(10, scope, topic)],
+        hide_index=True,
+        use_container_width=True,
+    )
+    rank = ledger.rank(user_id, scope, topic)
+    if rank is None:
+        st.write("You are not on this board yet.")
+    elif rank > 10:
+        st.subheader(f"You are #{rank:,}")
+        st.dataframe(
+            [{"rank": r, "learner": learner, "XP": xp} for r, learner, xp in ledger.around(user_id, 2, scope, topic)],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
 LEARNER_PAGES = {
     "Home Feed": learner_home_feed,
     "Reel Viewer": learner_reel_viewer,
+    "Search": learner_search,
+    "Browse": learner_browse,
     "Learning Playlists": learner_playlists,
     "Micro-Course Details": learner_micro_course_details,
+    "Daily Review": learner_daily_review,
     "Progress Tracking Dashboard": learner_progress_dashboard,
+    "Leaderboard": learner_leaderboard,
     "User Profile": learner_profile,
 }
 
@@ -657,17 +1775,50 @@ CREATOR_PAGES = {
 }
 
 
+def diagnostics_page():
+    st.title("🩺 Diagnostics")
+    if not PROFILER.enabled:
+        st.info("Profiling is off. Restart with BITE_SIZED_PROFILE=1 to collect render timings.")
+    rows = PROFILER.snapshot()
+    st.caption(f"Rolling p50 / p95 / p99 over the last {PROFILER.window / 60:.0f} minutes (±10%).")
+    if rows:
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    else:
+        st.write("No timings recorded yet.")
+    chart_stats = load_chart_cache().stats()
+    st.caption(f"Chart cache: {chart_stats}")
+    st.download_button(
+        "Download Prometheus metrics",
+        PROFILER.prometheus_text(),
+        file_name="bite_sized_metrics.prom",
+        mime="text/plain",
+    )
+
+
+@st.cache_resource
+def start_metrics_exporter():
+    port = os.environ.get("BITE_SIZED_METRICS_PORT")
+    start_exporter(
+        PROFILER, path=os.environ.get("BITE_SIZED_METRICS_FILE"), port=int(port) if port else None
+    )
+
+
 def sidebar_navigation():
     st.sidebar.title("Bite-Sized Learning")
     role = st.sidebar.radio("Choose your space", ("Learner", "Creator"))
     pages = LEARNER_PAGES if role == "Learner" else CREATOR_PAGES
+    if "diagnostics" in st.query_params:
+        # Hidden page: only listed when the URL carries ?diagnostics=1.
+        pages = {**pages, "Diagnostics": diagnostics_page}
     page_name = st.sidebar.selectbox("Navigate", list(pages.keys()))
     st.sidebar.divider()
     st.sidebar.caption("Your mini-learning universe • Explore • Create • Grow 🌱")
-    pages[page_name]()
+    with PROFILER.timer(f"page:{page_name}"):
+        pages[page_name]()
 
 
 def main():
+    start_metrics_exporter()
     init_state()
     sidebar_navigation()
 
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from catalog import ReelCatalog
+from media import parse_duration
+
+FACETS = ("topic", "difficulty", "creator_id")
+
+
+class FacetIndex:
+    """Columnar index for faceted browse over one catalog version.
+
+    Built once: ``duration`` text is parsed to integer seconds, popularity is
+    likes + saves, and each facet column becomes integer codes with overall
+    counts. Every facet value and range filter is a packed bitmap (one bit per
+    reel, cached), so a combined filter is a few ``np.bitwise_and`` calls and
+    the per-facet counts are ``np.bincount`` over the matching codes.
+    """
+
+    def __init__(self, catalog: ReelCatalog, bitmap_cache_size: int = 256):
+        n = len(catalog)
+        self._n = n
+        self.columns = {
+            "seconds": np.fromiter((parse_duration(d) for d in catalog.column("duration")), dtype=np.int64, count=n),
+            "popularity": np.asarray(catalog.column("likes"), dtype=np.int64)
+            + np.asarray(catalog.column("saves"), dtype=np.int64),
+        }
+        self._order = {name: np.argsort(column, kind="stable") for name, column in self.columns.items()}
+        self._descending = {name: np.argsort(-column, kind="stable") for name, column in self.columns.items()}
+        self._sorted = {name: self.columns[name][order] for name, order in self._order.items()}
+        self._codes, self._values, self._coding, self._counts = {}, {}, {}, {}
+        for facet in FACETS:
+            coding = {}
+            codes = np.fromiter(
+                (coding.setdefault(value, len(coding)) for value in catalog.column(facet)), dtype=np.int32, count=n
+            )
+            self._codes[facet] = codes
+            self._values[facet] = list(coding)
+            self._coding[facet] = coding
+            self._counts[facet] = np.bincount(codes, minlength=len(coding))
+        creator_codes, first = np.unique(self._codes["creator_id"], return_index=True)
+        names = catalog.column("creator")
+        self._creator_names = {self._values["creator_id"][code]: names[i] for code, i in zip(creator_codes, first)}
+        self._bitmaps = OrderedDict()  # (facet, code) or (range, lo, hi) -> packed bitmap
+        self._bitmap_cache_size = bitmap_cache_size
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._n
+
+    def values(self, facet: str):
+        """Values of ``facet``, most common first."""
+        counts = self._counts[facet]
+        return [self._values[facet][code] for code in np.argsort(-counts, kind="stable")]
+
+    def creator_name(self, creator_id: str) -> str:
+        return self._creator_names.get(creator_id, creator_id)
+
+    def bounds(self, name: str):
+        column = self._sorted[name]
+        return (int(column[0]), int(column[-1])) if len(column) else (0, 0)
+
+    def _cached(self, key, build):
+        with self._lock:
+            bitmap = self._bitmaps.get(key)
+            if bitmap is not None:
+                self._bitmaps.move_to_end(key)
+                return bitmap
+        bitmap = build()
+        with self._lock:
+            self._bitmaps[key] = bitmap
+            if len(self._bitmaps) > self._bitmap_cache_size:
+                self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def _facet_bitmap(self, facet: str, selected):
+        coding = self._coding[facet]
+        codes = sorted({coding[value] for value in selected if value in coding})
+        if not codes:
+            return np.zeros((self._n + 7) // 8, dtype=np.uint8)
+        bitmaps = [
+            self._cached((facet, code), lambda code=code: np.packbits(self._codes[facet] == code)) for code in codes
+        ]
+        return bitmaps[0] if len(bitmaps) == 1 else np.bitwise_or.reduce(bitmaps)
+
+    def _range_bitmap(self, name: str, lo, hi):
+        def build():
+            column = self._sorted[name]
+            start = np.searchsorted(column, lo, side="left") if lo is not None else 0
+            stop = np.searchsorted(column, hi, side="right") if hi is not None else len(column)
+            mask = np.zeros(self._n, dtype=bool)
+            mask[self._order[name][start:stop]] = True
+            return np.packbits(mask)
+
+        return self._cached((name, lo, hi), build)
+
+    def query(
+        self,
+        selected=None,
+        ranges=None,
+        sort: str = "popularity",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+    ):
+        """Filter, count and page the catalog.
+
+        ``selected`` maps facets to the values to keep (an empty or missing
+        facet is unfiltered); ``ranges`` maps "seconds"/"popularity" to
+        inclusive ``(lo, hi)`` bounds, either of which may be None. Returns
+        ``(total, positions, counts)``: the number of matches, the catalog
+        positions of one page in ``sort`` order, and for each facet a
+        ``{value: count}`` of matches under every filter except that facet's own.
+        """
+        filters = {facet: self._facet_bitmap(facet, values) for facet, values in (selected or {}).items() if values}
+        for name, (lo, hi) in (ranges or {}).items():
+            if lo is not None or hi is not None:
+                filters[name] = self._range_bitmap(name, lo, hi)
+
+        def mask(exclude=None):
+            bitmaps = [bitmap for name, bitmap in filters.items() if name != exclude]
+            if not bitmaps:
+                return None
+            combined = bitmaps[0] if len(bitmaps) == 1 else np.bitwise_and.reduce(bitmaps)
+            return np.unpackbits(combined, count=self._n).view(bool)
+
+        matches = mask()
+        counts = {}
+        for facet in FACETS:
+            facet_mask = mask(exclude=facet) if facet in filters else matches
+            codes = self._codes[facet] if facet_mask is None else self._codes[facet][facet_mask]
+            tally = np.bincount(codes, minlength=len(self._values[facet]))
+            counts[facet] = dict(zip(self._values[facet], tally.tolist()))
+
+        order = self._descending[sort] if descending else self._order[sort]
+        ranked = order if matches is None else order[matches[order]]
+        return len(ranked), ranked[offset : offset + limit], counts
@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+
+class ReelCatalog:
+    """Reel collection with O(1) id lookup and secondary indexes.
+
+    Reels keep their insertion order, so iterating the catalog matches the
+    order of the source list. Each reel also gets a dense integer position
+    that other structures can use instead of the string id.
+    """
+
+    def __init__(self, reels=()):
+        self._reels = []
+        self._by_id = {}
+        self._by_topic = defaultdict(list)
+        self._by_creator = defaultdict(list)
+        self._by_difficulty = defaultdict(list)
+        for reel in reels:
+            self.add(reel)
+
+    def add(self, reel: dict):
+        if reel["id"] in self._by_id:
+            raise ValueError(f"Duplicate reel id: {reel['id']}")
+        self._by_id[reel["id"]] = len(self._reels)
+        self._reels.append(reel)
+        self._by_topic[reel["topic"]].append(reel)
+        self._by_creator[reel.get("creator_id")].append(reel)
+        self._by_difficulty[reel["difficulty"]].append(reel)
+
+    def get(self, reel_id: str):
+        position = self._by_id.get(reel_id)
+        return None if position is None else self._reels[position]
+
+    def position(self, reel_id: str):
+        return self._by_id.get(reel_id)
+
+    def at(self, position: int) -> dict:
+        return self._reels[position]
+
+    def id_at(self, position: int) -> str:
+        return self._reels[position]["id"]
+
+    def ids(self):
+        return list(self._by_id)
+
+    def column(self, name: str):
+        """Values of one reel field in position order (None where a reel lacks it)."""
+        return [reel.get(name) for reel in self._reels]
+
+    def by_topic(self, topic: str):
+        return self._by_topic.get(topic, [])
+
+    def by_creator(self, creator_id: str):
+        return self._by_creator.get(creator_id, [])
+
+    def by_difficulty(self, difficulty: str):
+        return self._by_difficulty.get(difficulty, [])
+
+    def topics(self):
+        return list(self._by_topic)
+
+    def creator_ids(self):
+        return [creator_id for creator_id in self._by_creator if creator_id is not None]
+
+    def difficulties(self):
+        return list(self._by_difficulty)
+
+    def __len__(self):
+        return len(self._reels)
+
+    def __iter__(self):
+        return iter(self._reels)
+
+    def __contains__(self, reel_id):
+        return reel_id in self._by_id
@@ -0,0 +1,286 @@
+import bisect
+import json
+import os
+import threading
+from collections.abc import Sequence
+
+from catalog import ReelCatalog
+
+FACET_COLUMNS = ("topic", "creator_id", "difficulty")
+CATEGORICAL_COLUMNS = ("creator", "creator_id", "topic", "difficulty")
+BATCH_ROWS = 65_536
+
+
+def write_catalog(path: str, reels, playlists=(), micro_courses=(), creator_stats=None):
+    """Write the catalog as an uncompressed Arrow IPC file, which readers can memory-map.
+
+    Reels become columns (repeated strings dictionary-encoded); playlists,
+    courses and creator stats are small and ride along as JSON in the schema
+    metadata. The file is replaced atomically so watchers never see a partial write.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pylist(list(reels))
+    for name in CATEGORICAL_COLUMNS:
+        if name in table.column_names:
+            i = table.column_names.index(name)
+            table = table.set_column(i, name, table[name].dictionary_encode())
+    table = table.replace_schema_metadata(
+        {
+            "playlists": json.dumps(list(playlists)),
+            "micro_courses": json.dumps(list(micro_courses)),
+            "creator_stats": json.dumps(creator_stats or {}),
+        }
+    )
+    tmp = f"{path}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=BATCH_ROWS)
+    os.replace(tmp, path)
+
+
+def read_table(path: str):
+    """Memory-map an Arrow IPC file (zero-copy) or read a Parquet file."""
+    import pyarrow as pa
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        # Parquet pages are encoded, so they are decoded into process memory once.
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+class ReelView(Sequence):
+    """Lazy list of the reels at ``positions``; dicts are built on access."""
+
+    def __init__(self, catalog: "ArrowReelCatalog", positions):
+        self._catalog = catalog
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._catalog.at(int(p)) for p in self._positions[i]]
+        return self._catalog.at(int(self._positions[i]))
+
+
+class ArrowReelCatalog(ReelCatalog):
+    """Read-only ReelCatalog over an Arrow table.
+
+    Column buffers live in the memory-mapped file, so they sit in the OS page
+    cache rather than on the Python heap. The process keeps only the id map,
+    integer codes for categorical columns and facet position arrays; reel
+    dicts are built when asked for.
+    """
+
+    def __init__(self, table):
+        import numpy as np
+
+        self._table = table
+        self._names = table.column_names
+        ids = table.column("id").to_pylist()
+        self._ids = ids  # shares its strings with _by_id
+        self._by_id = {reel_id: position for position, reel_id in enumerate(ids)}
+        if len(self._by_id) != len(ids):
+            raise ValueError("Duplicate reel id in catalog file")
+        self._chunk_starts = list(np.cumsum([0] + [len(c) for c in table.column("id").chunks])[:-1])
+        self._categorical = {}  # name -> (codes, values); values[-1] is None for nulls
+        for name in self._names:
+            column = table.column(name)
+            if not (hasattr(column.type, "value_type") or name in FACET_COLUMNS):
+                continue
+            if not hasattr(column.type, "value_type"):
+                column = column.dictionary_encode()
+            column = column.unify_dictionaries()  # one dictionary shared by every chunk
+            codes = np.concatenate(
+                [chunk.indices.fill_null(-1).to_numpy(zero_copy_only=False) for chunk in column.chunks]
+                or [np.empty(0, dtype=np.int32)]
+            )
+            dictionary = column.chunk(0).dictionary.to_pylist() if column.num_chunks else []
+            self._categorical[name] = (codes, dictionary + [None])
+        self._plain = {
+            name: table.column(name).chunks for name in self._names if name not in self._categorical
+        }
+        self._facets = {}
+        for name in FACET_COLUMNS:
+            codes, values = self._categorical[name]
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values)))
+            self._facets[name] = {
+                value: order[bounds[i] : bounds[i + 1]]
+                for i, value in enumerate(values[:-1])
+                if bounds[i + 1] > bounds[i]
+            }
+
+    def add(self, reel: dict):
+        raise TypeError("File-backed catalogs are read-only; rewrite the catalog file instead")
+
+    def get(self, reel_id: str):
+        position = self._by_id.get(reel_id)
+        return None if position is None else self.at(position)
+
+    def at(self, position: int) -> dict:
+        chunk = bisect.bisect_right(self._chunk_starts, position) - 1
+        offset = position - self._chunk_starts[chunk]
+        reel = {}
+        for name in self._names:
+            chunks = self._plain.get(name)
+            if chunks is not None:
+                reel[name] = chunks[chunk][offset].as_py()
+            else:
+                codes, values = self._categorical[name]
+                reel[name] = values[codes[position]]
+        return reel
+
+    def id_at(self, position: int) -> str:
+        return self._ids[position]
+
+    def column(self, name: str):
+        if name not in self._names:
+            return [None] * len(self)
+        categorical = self._categorical.get(name)
+        if categorical is None:
+            return self._table.column(name).to_pylist()
+        codes, values = categorical
+        return [values[code] for code in codes.tolist()]
+
+    def by_topic(self, topic: str):
+        return ReelView(self, self._facets["topic"].get(topic, ()))
+
+    def by_creator(self, creator_id: str):
+        return ReelView(self, self._facets["creator_id"].get(creator_id, ()))
+
+    def by_difficulty(self, difficulty: str):
+        return ReelView(self, self._facets["difficulty"].get(difficulty, ()))
+
+    def topics(self):
+        return list(self._facets["topic"])
+
+    def creator_ids(self):
+        return list(self._facets["creator_id"])
+
+    def difficulties(self):
+        return list(self._facets["difficulty"])
+
+    def __len__(self):
+        return self._table.num_rows
+
+    def __iter__(self):
+        # Decode one slice of columns at a time so iteration never holds the whole catalog as dicts.
+        for start in range(0, len(self), BATCH_ROWS):
+            stop = min(start + BATCH_ROWS, len(self))
+            columns = []
+            for name in self._names:
+                categorical = self._categorical.get(name)
+                if categorical is None:
+                    columns.append(self._table.column(name).slice(start, stop - start).to_pylist())
+                else:
+                    codes, values = categorical
+                    columns.append([values[code] for code in codes[start:stop].tolist()])
+            for row in zip(*columns):
+                yield dict(zip(self._names, row))
+
+
+class CatalogSnapshot:
+    """One immutable version of the catalog: reels plus the small side tables."""
+
+    def __init__(self, reels: ReelCatalog, playlists, micro_courses, creator_stats, version=0):
+        self.reels = reels
+        self.playlists = playlists
+        self.micro_courses = micro_courses
+        self.creator_stats = creator_stats
+        self.version = version
+
+
+def load_snapshot(path: str, version: int = 0) -> CatalogSnapshot:
+    table = read_table(path)
+    metadata = {key.decode(): value for key, value in (table.schema.metadata or {}).items()}
+    return CatalogSnapshot(
+        ArrowReelCatalog(table),
+        json.loads(metadata.get("playlists", "[]")),
+        json.loads(metadata.get("micro_courses", "[]")),
+        json.loads(metadata.get("creator_stats", "{}")),
+        version,
+    )
+
+
+class CatalogFile:
+    """A catalog file plus a watcher thread that hot-reloads it when it changes.
+
+    ``snapshot`` is swapped atomically; readers holding the old snapshot keep
+    a valid mapping until they drop it. A file that fails to load is kept in
+    ``last_error`` and the previous snapshot stays live.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.last_error = None
+        self._signature = self._stat()
+        self.snapshot = load_snapshot(path)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def reload_if_changed(self) -> bool:
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            snapshot = load_snapshot(self.path, self.snapshot.version + 1)
+        except Exception as exc:  # keep serving the last good catalog
+            self.last_error = exc
+            return False
+        self._signature = signature
+        self.snapshot = snapshot
+        self.last_error = None
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload_if_changed()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a catalog file the app can memory-map.")
+    parser.add_argument("path", nargs="?", default="catalog.arrow")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="write N synthetic reels instead of the demo catalog")
+    args = parser.parse_args()
+    if args.synthetic:
+        import sys
+
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+        import synthetic
+
+        reels = synthetic.make_reels(args.synthetic)
+        write_catalog(args.path, reels, synthetic.make_playlists(reels), synthetic.make_courses())
+    else:
+        import bite_sized_learning_app as app
+
+        write_catalog(args.path, app.REELS, app.PLAYLISTS, app.MICRO_COURSES, app.CREATOR_STATS)
+    print(f"wrote {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import threading
+import time
+
+from analytics import connect
+from persistence import WriteBehindQueue
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS comments (
+        thread TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        ts REAL NOT NULL,
+        author TEXT,
+        body TEXT NOT NULL,
+        PRIMARY KEY (thread, seq)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS comment_counts (
+        thread TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    ) WITHOUT ROWID;
+"""
+
+# seq is allocated inside the insert so concurrent writers never collide.
+INSERT_SQL = """
+    INSERT INTO comments (thread, seq, ts, author, body)
+    SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ? FROM comments WHERE thread = ?
+"""
+COUNT_SQL = """
+    INSERT INTO comment_counts (thread, count) VALUES (?, ?)
+    ON CONFLICT (thread) DO UPDATE SET count = count + excluded.count
+"""
+
+
+def reel_thread(reel_id: str) -> str:
+    return f"reel/{reel_id}"
+
+
+def module_thread(course_id: str, module_id: str) -> str:
+    return f"module/{course_id}/{module_id}"
+
+
+class CommentStore:
+    """Comment threads for reels and course modules.
+
+    Threads are read newest-first, one page at a time, with a ``seq``
+    cursor. Posts go through the write-behind queue and stay visible from
+    an in-memory pending list until their batch commits.
+    Per-thread counts are cached in memory for ``count_ttl`` seconds.
+    """
+
+    def __init__(self, path: str = "bite_sized.db", count_ttl: float = 30.0):
+        self.path = path
+        self.count_ttl = count_ttl
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = {}  # thread -> [comment dicts], oldest first
+        self._counts = {}  # thread -> (count, fetched_at)
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(self._apply_batch, name="comment-writer")
+
+    def _apply_batch(self, posts):
+        if self._writer_conn is None:
+            self._writer_conn = connect(self.path)
+        with self._writer_conn as conn:
+            for comment in posts:
+                conn.execute(
+                    INSERT_SQL,
+                    (comment["thread"], comment["ts"], comment["author"], comment["body"], comment["thread"]),
+                )
+                conn.execute(COUNT_SQL, (comment["thread"], 1))
+        with self._lock:
+            for comment in posts:
+                pending = self._pending.get(comment["thread"], [])
+                if comment in pending:
+                    pending.remove(comment)
+                if not pending:
+                    self._pending.pop(comment["thread"], None)
+
+    def post(self, thread: str, body: str, author: str = None) -> dict:
+        comment = {"thread": thread, "ts": time.time(), "author": author, "body": body}
+        with self._lock:
+            self._pending.setdefault(thread, []).append(comment)
+            if thread in self._counts:
+                count, fetched_at = self._counts[thread]
+                self._counts[thread] = (count + 1, fetched_at)
+        self._writes.put(comment)
+        return comment
+
+    def bulk_insert(self, thread: str, comments):
+        """Insert many (author, body[, ts]) comments in one transaction; returns how many."""
+        now = time.time()
+        rows = [(author, body, ts[0] if ts else now) for author, body, *ts in comments]
+        with connect(self.path) as conn:
+            (last,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM comments WHERE thread = ?", (thread,)).fetchone()
+            conn.executemany(
+                "INSERT INTO comments (thread, seq, ts, author, body) VALUES (?, ?, ?, ?, ?)",
+                [(thread, last + i, ts, author, body) for i, (author, body, ts) in enumerate(rows, start=1)],
+            )
+            conn.execute(COUNT_SQL, (thread, len(rows)))
+        with self._lock:
+            self._counts.pop(thread, None)
+        return len(rows)
+
+    def page(self, thread: str, before: int = None, limit: int = 5):
+        """Return ``(comments, next_cursor)`` newest first; pass ``next_cursor`` as ``before`` for older ones.
+
+        ``next_cursor`` is None on the last page. Pending posts are prepended to the first page.
+        """
+        with connect(self.path) as conn:
+            rows = conn.execute(
+                "SELECT seq, ts, author, body FROM comments WHERE thread = ? AND seq < ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (thread, before if before is not None else 2**63 - 1, limit),
+            ).fetchall()
+        comments = [{"seq": seq, "ts": ts, "author": author, "body": body} for seq, ts, author, body in rows]
+        if before is None:
+            # A batch may commit between the query and this read; skip posts already fetched.
+            fetched = {(c["ts"], c["author"], c["body"]) for c in comments}
+            with self._lock:
+                pending = [
+                    dict(c, seq=None)
+                    for c in reversed(self._pending.get(thread, []))
+                    if (c["ts"], c["author"], c["body"]) not in fetched
+                ]
+            comments = pending + comments
+        next_cursor = rows[-1][0] if len(rows) == limit and rows[-1][0] > 1 else None
+        return comments, next_cursor
+
+    def iter_all(self, batch_size: int = 10_000):
+        """Yield every committed comment as a dict, streaming in batches."""
+        with connect(self.path) as conn:
+            cursor = conn.execute("SELECT thread, seq, ts, author, body FROM comments")
+            while rows := cursor.fetchmany(batch_size):
+                for thread, seq, ts, author, body in rows:
+                    yield {"thread": thread, "seq": seq, "ts": ts, "author": author, "body": body}
+
+    def count(self, thread: str) -> int:
+        with self._lock:
+            cached = self._counts.get(thread)
+            if cached and time.monotonic() - cached[1] < self.count_ttl:
+                return cached[0]
+        with connect(self.path) as conn:
+            row = conn.execute("SELECT count FROM comment_counts WHERE thread = ?", (thread,)).fetchone()
+        with self._lock:
+            count = (row[0] if row else 0) + len(self._pending.get(thread, []))
+            self._counts[thread] = (count, time.monotonic())
+        return count
+
+    def flush(self, timeout: float = None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()
@@ -0,0 +1,158 @@
+import itertools
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from analytics import connect
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS reel_counters (
+        reel_id TEXT PRIMARY KEY,
+        likes INTEGER NOT NULL DEFAULT 0,
+        saves INTEGER NOT NULL DEFAULT 0,
+        views INTEGER NOT NULL DEFAULT 0,
+        updated REAL NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS reel_counters_updated ON reel_counters (updated);
+"""
+
+REEL_COUNTERS = ("likes", "saves", "views")
+Counts = namedtuple("Counts", REEL_COUNTERS)
+ZERO = Counts(0, 0, 0)
+
+
+class _Shard:
+    __slots__ = ("lock", "deltas")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deltas = {}  # reel id -> [likes, saves, views]
+
+
+class EngagementCounters:
+    """Global per-reel like / save / view counters shared by every session.
+
+    ``incr`` adds to one of ``shards`` in-memory shards; each thread keeps to
+    its own shard, so concurrent sessions rarely wait on the same lock, even
+    on one hot reel. A flusher thread swaps the shards out every
+    ``flush_interval`` seconds and upserts the summed deltas in one
+    transaction, then folds them into a snapshot of the stored totals and
+    re-reads rows other processes changed. ``get`` reads the snapshot plus
+    this process's unflushed deltas without taking a lock: it may briefly
+    lag, but never counts an increment twice.
+    """
+
+    def __init__(self, path: str = "bite_sized.db", shards: int = 16, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._shards = [_Shard() for _ in range(shards)]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+            rows = conn.execute("SELECT reel_id, likes, saves, views FROM reel_counters")
+            self._snapshot = {reel_id: Counts(likes, saves, views) for reel_id, likes, saves, views in rows}
+            (self._refreshed,) = conn.execute("SELECT COALESCE(MAX(updated), 0) FROM reel_counters").fetchone()
+        self._inflight = {}  # reel id -> [likes, saves, views] being written
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = self._shards[next(self._next_shard) % len(self._shards)]
+        return shard
+
+    def incr(self, reel_id: str, counter: str, amount: int = 1):
+        """Add ``amount`` (negative to undo) to the reel's ``likes``, ``saves`` or ``views``."""
+        field = REEL_COUNTERS.index(counter)
+        shard = self._shard()
+        with shard.lock:
+            deltas = shard.deltas.get(reel_id)
+            if deltas is None:
+                deltas = shard.deltas[reel_id] = [0, 0, 0]
+            deltas[field] += amount
+
+    def get(self, reel_id: str) -> Counts:
+        # Snapshot first, then in-flight, then shards: the flusher moves a
+        # delta the other way round, so a racing read can miss it but not see it twice.
+        likes, saves, views = self._snapshot.get(reel_id, ZERO)
+        for deltas in (self._inflight, *(shard.deltas for shard in self._shards)):
+            pending = deltas.get(reel_id)
+            if pending is not None:
+                likes, saves, views = likes + pending[0], saves + pending[1], views + pending[2]
+        return Counts(likes, saves, views)
+
+    def flush(self) -> int:
+        """Write every pending delta now; returns how many reels were written."""
+        with self._flush_lock:
+            inflight = self._inflight
+            for shard in self._shards:
+                with shard.lock:
+                    deltas, shard.deltas = shard.deltas, {}
+                for reel_id, (likes, saves, views) in deltas.items():
+                    total = inflight.get(reel_id)
+                    if total is None:
+                        inflight[reel_id] = [likes, saves, views]
+                    else:
+                        total[0], total[1], total[2] = total[0] + likes, total[1] + saves, total[2] + views
+            if not inflight:
+                self._refresh()
+                return 0
+            now = time.time()
+            try:
+                with self._conn() as conn:
+                    conn.executemany(
+                        "INSERT INTO reel_counters (reel_id, likes, saves, views, updated) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (reel_id) DO UPDATE SET likes = likes + excluded.likes, "
+                        "saves = saves + excluded.saves, views = views + excluded.views, updated = excluded.updated",
+                        [(reel_id, *deltas, now) for reel_id, deltas in inflight.items()],
+                    )
+            except Exception:
+                logger.exception("Counter flush failed; %d reels stay pending", len(inflight))
+                return 0
+            written = len(inflight)
+            for reel_id in list(inflight):
+                likes, saves, views = inflight.pop(reel_id)
+                old = self._snapshot.get(reel_id, ZERO)
+                self._snapshot[reel_id] = Counts(old.likes + likes, old.saves + saves, old.views + views)
+            self._refresh()
+            return written
+
+    def _conn(self):
+        # flush() runs on the flusher thread and, from close(), on the caller's.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def _refresh(self):
+        """Pick up totals other processes flushed since the last refresh."""
+        rows = self._conn().execute(
+            "SELECT reel_id, likes, saves, views, updated FROM reel_counters WHERE updated > ?",
+            (self._refreshed - 2 * self.flush_interval,),  # tolerate clock skew between writers
+        ).fetchall()
+        for reel_id, likes, saves, views, updated in rows:
+            self._snapshot[reel_id] = Counts(likes, saves, views)
+            self._refreshed = max(self._refreshed, updated)
+
+    def start(self):
+        """Flush in a daemon thread every ``flush_interval`` seconds."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="counter-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+        self.flush()
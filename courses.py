@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from analytics import connect
+from persistence import WriteBehindQueue
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS completions (
+        user_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        item TEXT NOT NULL,
+        ts REAL NOT NULL,
+        PRIMARY KEY (user_id, kind, item)
+    ) WITHOUT ROWID
+"""
+
+COMPLETION_KINDS = ("module", "reel")
+
+
+def playlist_id(playlist: dict) -> str:
+    """Playlists from older catalog files have no id; their name stands in."""
+    return playlist.get("id") or playlist["name"]
+
+
+class CourseIndex:
+    """Id-based lookups over one catalog version's micro-courses and playlists.
+
+    Besides course / module / playlist by id, it maps each module to its
+    course and each reel to the playlists that include it, and knows how many
+    distinct modules or reels make up every course and playlist.
+    """
+
+    def __init__(self, micro_courses=(), playlists=()):
+        self._courses = {}
+        self._module_course = {}
+        self._modules = {}
+        self._totals = {}  # ("course" | "playlist", id) -> modules / distinct reels
+        for course in micro_courses:
+            if course["id"] in self._courses:
+                raise ValueError(f"Duplicate course id: {course['id']}")
+            self._courses[course["id"]] = course
+            for module in course["modules"]:
+                if module["id"] in self._modules:
+                    raise ValueError(f"Duplicate module id: {module['id']}")
+                self._modules[module["id"]] = module
+                self._module_course[module["id"]] = course["id"]
+            self._totals["course", course["id"]] = len(course["modules"])
+        self._playlists = {}
+        playlists_by_reel = defaultdict(list)
+        for playlist in playlists:
+            pid = playlist_id(playlist)
+            if pid in self._playlists:
+                raise ValueError(f"Duplicate playlist id: {pid}")
+            self._playlists[pid] = playlist
+            reels = set(playlist["reels"])
+            for reel_id in reels:
+                playlists_by_reel[reel_id].append(pid)
+            self._totals["playlist", pid] = len(reels)
+        self._playlists_by_reel = {reel_id: tuple(pids) for reel_id, pids in playlists_by_reel.items()}
+
+    def courses(self):
+        return list(self._courses.values())
+
+    def course(self, course_id: str):
+        return self._courses.get(course_id)
+
+    def module(self, module_id: str):
+        return self._modules.get(module_id)
+
+    def course_of(self, module_id: str):
+        """Id of the course that contains ``module_id``, or None."""
+        return self._module_course.get(module_id)
+
+    def playlists(self):
+        return list(self._playlists.values())
+
+    def playlist(self, pid: str):
+        return self._playlists.get(pid)
+
+    def playlists_with(self, reel_id: str):
+        return self._playlists_by_reel.get(reel_id, ())
+
+    def total(self, kind: str, target_id: str) -> int:
+        return self._totals.get((kind, target_id), 0)
+
+    def targets_of(self, kind: str, item: str):
+        """The (kind, id) counters that finishing ``item`` moves."""
+        if kind == "module":
+            course_id = self._module_course.get(item)
+            return (("course", course_id),) if course_id is not None else ()
+        return tuple(("playlist", pid) for pid in self._playlists_by_reel.get(item, ()))
+
+
+class _Learner:
+    """Finished modules and reels of one learner, plus counters for one CourseIndex."""
+
+    __slots__ = ("completed", "counters", "index")
+
+    def __init__(self):
+        self.completed = {kind: set() for kind in COMPLETION_KINDS}
+        self.counters = defaultdict(int)  # ("course" | "playlist", id) -> finished modules / reels
+        self.index = None
+
+
+class ProgressTracker:
+    """Per-learner completion of modules and reels with course and playlist progress counters.
+
+    ``complete`` is idempotent per (learner, kind, item). A new completion
+    bumps the counters of the course that holds the module, or of every
+    playlist that includes the reel, so ``progress`` is a dict read instead
+    of a walk over modules. Counters belong to one CourseIndex and are
+    rebuilt from the learner's completions when a new catalog version is
+    passed in. Rows are written by the write-behind queue. Learners are
+    cached for the ``max_learners`` most recently seen; others are reloaded
+    from SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str = "bite_sized.db",
+        max_batch: int = 500,
+        flush_interval: float = 0.5,
+        max_learners: int = 10_000,
+    ):
+        self.path = path
+        self.max_learners = max_learners
+        self._lock = threading.RLock()
+        self._learners = OrderedDict()  # user_id -> _Learner, least recently used first
+        self._evicted = False
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(self._apply_batch, max_batch, flush_interval, name="progress-writer")
+
+    def _apply_batch(self, rows):
+        if self._writer_conn is None:
+            self._writer_conn = connect(self.path)
+        with self._writer_conn as conn:
+            conn.executemany("INSERT OR IGNORE INTO completions (user_id, kind, item, ts) VALUES (?, ?, ?, ?)", rows)
+
+    def _learner(self, user_id: str, index: CourseIndex = None) -> _Learner:
+        learner = self._learners.get(user_id)
+        if learner is not None:
+            self._learners.move_to_end(user_id)
+        else:
+            if self._evicted:
+                # An evicted learner's last completions may still be queued; reload them too.
+                self._writes.flush()
+            learner = _Learner()
+            with connect(self.path) as conn:
+                for kind, item in conn.execute("SELECT kind, item FROM completions WHERE user_id = ?", (user_id,)):
+                    if kind in learner.completed:
+                        learner.completed[kind].add(item)
+            self._learners[user_id] = learner
+            while len(self._learners) > self.max_learners:
+                self._learners.popitem(last=False)
+                self._evicted = True
+        if index is not None and learner.index is not index:
+            learner.counters.clear()
+            for kind, items in learner.completed.items():
+                for item in items:
+                    for target in index.targets_of(kind, item):
+                        learner.counters[target] += 1
+            learner.index = index
+        return learner
+
+    def complete(self, user_id: str, kind: str, item: str, ts: float = None) -> bool:
+        """Mark ``item`` (a module or reel id) finished; returns True the first time."""
+        if kind not in COMPLETION_KINDS:
+            raise ValueError(f"Unknown completion kind: {kind!r}")
+        with self._lock:
+            learner = self._learner(user_id)
+            if item in learner.completed[kind]:
+                return False
+            learner.completed[kind].add(item)
+            if learner.index is not None:
+                for target in learner.index.targets_of(kind, item):
+                    learner.counters[target] += 1
+            self._writes.put((user_id, kind, item, ts or time.time()))
+        return True
+
+    def completed(self, user_id: str, kind: str, item: str) -> bool:
+        with self._lock:
+            return item in self._learner(user_id).completed[kind]
+
+    def done(self, user_id: str, kind: str, target_id: str, index: CourseIndex) -> int:
+        """Finished modules of a course (``kind="course"``) or reels of a playlist (``kind="playlist"``)."""
+        with self._lock:
+            return self._learner(user_id, index).counters.get((kind, target_id), 0)
+
+    def progress(self, user_id: str, kind: str, target_id: str, index: CourseIndex) -> float:
+        """Fraction of a course or playlist the learner has finished, from 0.0 to 1.0."""
+        total = index.total(kind, target_id)
+        return self.done(user_id, kind, target_id, index) / total if total else 0.0
+
+    def in_progress(self, user_id: str, index: CourseIndex, kind: str = "course"):
+        """Ids of the courses (or playlists) the learner has started but not finished."""
+        with self._lock:
+            counters = self._learner(user_id, index).counters
+            return [
+                target_id
+                for (target_kind, target_id), done in counters.items()
+                if target_kind == kind and done < index.total(kind, target_id)
+            ]
+
+    def flush(self, timeout: float = None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()
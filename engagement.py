@@ -0,0 +1,212 @@
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableSet
+
+ARRAY_LIMIT = 4096  # a container holding more values than this switches to a bitmap
+BITMAP_BYTES = 1 << 13  # 65536 bits: one bit per low half of an id
+
+_SPACES = weakref.WeakValueDictionary()  # name -> live IdSpace, so pickled sets find their space again
+
+
+def id_space(name: str) -> "IdSpace":
+    return _SPACES[name]
+
+
+class IdSpace:
+    """Dense integer ids for string ids.
+
+    With a ``catalog``, a reel's id is its catalog position; ids the catalog
+    does not know (later uploads, reels added by a reload) are numbered after
+    it on first use. The space keeps the catalog it was built from, so codes
+    stay valid for as long as any set uses the space. Without a catalog every id is
+    numbered on first use, starting with ``seed``.
+    """
+
+    def __init__(self, name: str, catalog=None, seed=()):
+        self.name = name
+        self._catalog = catalog
+        self._base = len(catalog) if catalog is not None else 0
+        self._extra_ids = []
+        self._extra = {}
+        self._lock = threading.Lock()
+        for item in seed:
+            self.encode(item)
+        _SPACES[name] = self
+
+    def __reduce__(self):
+        return id_space, (self.name,)
+
+    def __len__(self):
+        return self._base + len(self._extra_ids)
+
+    def lookup(self, item: str):
+        """Code of ``item``, or None if it was never numbered."""
+        if self._catalog is not None:
+            position = self._catalog.position(item)
+            if position is not None:
+                return position
+        code = self._extra.get(item)
+        return None if code is None else self._base + code
+
+    def encode(self, item: str) -> int:
+        code = self.lookup(item)
+        if code is not None:
+            return code
+        with self._lock:
+            code = self._extra.get(item)
+            if code is None:
+                code = self._extra[item] = len(self._extra_ids)
+                self._extra_ids.append(item)
+        return self._base + code
+
+    def decode(self, code: int) -> str:
+        if code < self._base:
+            return self._catalog.id_at(code)
+        return self._extra_ids[code - self._base]
+
+
+class EngagementSet(MutableSet):
+    """Set of string ids stored as a compressed bitmap of their ``IdSpace`` codes.
+
+    Codes are split into a high and a low 16-bit half (as in Roaring bitmaps).
+    Each high half owns one container: a sorted ``array('H')`` of low halves
+    while it holds up to ``ARRAY_LIMIT`` values, an 8 KiB bitmap beyond that.
+    A learner's likes cost about two bytes each instead of a set slot plus a
+    string, and the set pickles as a few flat buffers. Iteration yields ids in
+    code order.
+    """
+
+    __slots__ = ("_space", "_containers", "_len")
+
+    def __init__(self, space: IdSpace, items=()):
+        self._space = space
+        self._containers = {}  # high half -> array('H') of low halves, or bytearray bitmap
+        encode = space.encode
+        codes = sorted({encode(item) for item in items})
+        start = 0
+        while start < len(codes):
+            high = codes[start] >> 16
+            stop = bisect_left(codes, (high + 1) << 16, start)
+            lows = array("H", [code & 0xFFFF for code in codes[start:stop]])
+            self._containers[high] = _to_bitmap(lows) if len(lows) > ARRAY_LIMIT else lows
+            start = stop
+        self._len = len(codes)
+
+    def _from_iterable(self, items):
+        return EngagementSet(self._space, items)
+
+    def __getstate__(self):
+        return self._space, self._containers, self._len
+
+    def __setstate__(self, state):
+        self._space, self._containers, self._len = state
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, item):
+        code = self._space.lookup(item)
+        return code is not None and self.has_code(code)
+
+    def __iter__(self):
+        decode = self._space.decode
+        return (decode(code) for code in self.codes())
+
+    def __repr__(self):
+        return f"EngagementSet({list(self)!r})"
+
+    def has_code(self, code: int) -> bool:
+        container = self._containers.get(code >> 16)
+        if container is None:
+            return False
+        low = code & 0xFFFF
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] & (1 << (low & 7)))
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def codes(self):
+        """Member codes in ascending order."""
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            base = high << 16
+            if isinstance(container, bytearray):
+                for i, byte in enumerate(container):
+                    while byte:
+                        bit = byte & -byte
+                        yield base | (i << 3) | (bit.bit_length() - 1)
+                        byte ^= bit
+            else:
+                for low in container:
+                    yield base | low
+
+    def add(self, item):
+        self.add_code(self._space.encode(item))
+
+    def discard(self, item):
+        code = self._space.lookup(item)
+        if code is not None:
+            self.discard_code(code)
+
+    def add_code(self, code: int):
+        high, low = code >> 16, code & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = array("H", (low,))
+        elif isinstance(container, bytearray):
+            mask = 1 << (low & 7)
+            if container[low >> 3] & mask:
+                return
+            container[low >> 3] |= mask
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                return
+            container.insert(i, low)
+            if len(container) > ARRAY_LIMIT:
+                self._containers[high] = _to_bitmap(container)
+        self._len += 1
+
+    def discard_code(self, code: int):
+        high, low = code >> 16, code & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            return
+        if isinstance(container, bytearray):
+            mask = 1 << (low & 7)
+            if not container[low >> 3] & mask:
+                return
+            container[low >> 3] &= ~mask
+            if int.from_bytes(container, "little").bit_count() <= ARRAY_LIMIT // 2:
+                self._containers[high] = _to_array(container)
+        else:
+            i = bisect_left(container, low)
+            if i == len(container) or container[i] != low:
+                return
+            del container[i]
+            if not container:
+                del self._containers[high]
+        self._len -= 1
+
+    def clear(self):
+        self._containers.clear()
+        self._len = 0
+
+
+def _to_bitmap(values) -> bytearray:
+    bitmap = bytearray(BITMAP_BYTES)
+    for low in values:
+        bitmap[low >> 3] |= 1 << (low & 7)
+    return bitmap
+
+
+def _to_array(bitmap: bytearray):
+    values = array("H")
+    for i, byte in enumerate(bitmap):
+        while byte:
+            bit = byte & -byte
+            values.append((i << 3) | (bit.bit_length() - 1))
+            byte ^= bit
+    return values
@@ -0,0 +1,249 @@
+from media import youtube_thumbnail_url, youtube_video_id
+
+# One row per reel, in this column order; the component looks columns up by name.
+FEED_FIELDS = (
+    "id", "title", "creator", "creator_id", "topic", "difficulty", "duration",
+    "youtube_id", "src", "thumbnail", "likes", "saves", "flags",
+)
+LIKED, SAVED, FOLLOWING = 1, 2, 4  # bits of the "flags" column
+FEED_ACTIONS = ("like", "save", "follow", "comments")
+
+
+def feed_row(reel: dict, duration: str, thumbnail_url: str, likes: int, saves: int, flags: int) -> list:
+    """One reel as a compact row; YouTube reels send only the video id, and a thumbnail only when it differs."""
+    video_id = youtube_video_id(reel["video_url"])
+    if video_id and thumbnail_url == youtube_thumbnail_url(video_id):
+        thumbnail_url = None
+    return [
+        reel["id"], reel["title"], reel["creator"], reel.get("creator_id") or "", reel["topic"],
+        reel["difficulty"], duration, video_id or "", "" if video_id else reel["video_url"],
+        thumbnail_url or "", likes, saves, flags,
+    ]
+
+
+def parse_feed_actions(payload) -> list:
+    """(reel id, action, value) triples from one batch the component reported; malformed entries are dropped.
+
+    Like, save and follow carry the state the learner left the button in, so
+    replaying a batch twice, or a click the server already applied, is harmless.
+    """
+    actions = []
+    for entry in payload if isinstance(payload, list) else ():
+        if (
+            isinstance(entry, list)
+            and len(entry) == 3
+            and isinstance(entry[0], str)
+            and entry[1] in FEED_ACTIONS
+            and isinstance(entry[2], bool)
+        ):
+            actions.append(tuple(entry))
+    return actions
+
+
+FEED_HTML = '<div class="feed"></div>'
+
+FEED_CSS = """
+.feed { display: flex; flex-direction: column; gap: 1.25rem; font-family: var(--st-font, sans-serif); }
+.card { display: grid; grid-template-columns: 2fr 1fr; gap: 1rem; padding-bottom: 1.25rem;
+        border-bottom: 1px solid var(--st-border-color, #ddd); }
+.player { position: relative; height: 260px; border-radius: 8px; overflow: hidden; cursor: pointer;
+          background: #000 center/cover no-repeat; }
+.player iframe, .player video { width: 100%; height: 100%; border: 0; }
+.player svg { position: absolute; top: 50%; left: 50%; transform: translate(-50%, -50%); }
+.title { font-size: 1.4rem; font-weight: 600; margin: 0 0 .25rem; }
+.meta, .takeaway { color: var(--st-text-color, inherit); opacity: .8; margin: .25rem 0; }
+.takeaway { font-size: .85rem; }
+.actions { display: flex; flex-direction: column; align-items: flex-start; gap: .4rem; margin-top: .5rem; }
+.actions button { font: inherit; padding: .25rem .75rem; border-radius: .5rem; cursor: pointer;
+                  border: 1px solid var(--st-border-color, #ccc); background: transparent; color: inherit; }
+.actions button.on { background: var(--st-primary-color, #ff4b4b); border-color: transparent; color: #fff; }
+"""
+
+# Cards are kept across reruns and matched by reel id, so a player that is
+# already open survives a Like elsewhere on the page. Thumbnails load, and
+# players are torn down, as cards come near or leave the viewport. Clicks
+# update the card at once and go back to the app in one batch per pause.
+FEED_JS = """
+const PLAY_ICON = '<svg viewBox="0 0 68 48" width="68" height="48"><path d="M66.5 7.7a8.5 8.5 0 0 0-6-6C55.2.3 34 '
+    + '.3 34 .3s-21.2 0-26.5 1.4a8.5 8.5 0 0 0-6 6C.1 13 .1 24 .1 24s0 11 1.4 16.3a8.5 8.5 0 0 0 6 6C12.8 47.7 34 '
+    + '47.7 34 47.7s21.2 0 26.5-1.4a8.5 8.5 0 0 0 6-6C67.9 35 67.9 24 67.9 24s0-11-1.4-16.3z" fill="#f00"/>'
+    + '<path d="M45 24 27 14v20z" fill="#fff"/></svg>';
+const LIKED = 1, SAVED = 2, FOLLOWING = 4;
+const BATCH_DELAY_MS = 400;
+
+// A CSS url() for element.style, with quotes, backslashes and line breaks in the URL escaped.
+function cssUrl(url) {
+    return `url("${url.replace(/["\\\\\\n\\r]/g, (c) => `\\\\${c.charCodeAt(0).toString(16)} `)}")`;
+}
+
+function element(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+}
+
+function showFacade(card) {
+    const player = card.player;
+    player.innerHTML = PLAY_ICON;
+    player.dataset.open = "";
+    if (card.near) player.style.backgroundImage = cssUrl(card.thumbnail);
+}
+
+function openPlayer(card) {
+    const player = card.player;
+    if (player.dataset.open) return;
+    player.dataset.open = "1";
+    player.replaceChildren();
+    if (card.youtubeId) {
+        const frame = element("iframe");
+        frame.src = `https://www.youtube.com/embed/${encodeURIComponent(card.youtubeId)}?autoplay=1`;
+        frame.allow = "accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture";
+        frame.allowFullscreen = true;
+        player.appendChild(frame);
+    } else {
+        const video = element("video");
+        video.src = card.src;
+        video.controls = true;
+        video.autoplay = true;
+        player.appendChild(video);
+    }
+}
+
+function buildCard(row, col) {
+    const card = element("div", "card");
+    card.reelId = row[col.id];
+    card.creatorId = row[col.creator_id];
+    card.youtubeId = row[col.youtube_id];
+    card.src = row[col.src];
+    card.thumbnail = row[col.thumbnail]
+        || (card.youtubeId ? `https://i.ytimg.com/vi/${encodeURIComponent(card.youtubeId)}/hqdefault.jpg` : "");
+    card.signature = JSON.stringify(row.slice(0, col.likes));
+    card.player = element("div", "player");
+    card.player.title = "Play video";
+    card.player.setAttribute("role", "button");
+    card.player.dataset.action = "play";
+    showFacade(card);
+
+    const info = element("div");
+    info.append(
+        element("p", "title", row[col.title]),
+        element("p", "meta", `${row[col.creator]} • ${row[col.topic]} • ${row[col.difficulty]}`),
+        element("p", "meta", `Duration: ${row[col.duration]}`),
+    );
+    card.counts = element("p", "meta");
+    const actions = element("div", "actions");
+    card.buttons = {};
+    for (const action of ["like", "save", "follow", "comments"]) {
+        const button = element("button");
+        button.dataset.action = action;
+        card.buttons[action] = button;
+        actions.appendChild(button);
+    }
+    card.creator = row[col.creator];
+    info.append(card.counts, actions, element("p", "takeaway",
+        "Key takeaway: Short, focused concept you can re-watch in under a minute."));
+    card.append(card.player, info);
+    return card;
+}
+
+function paint(card) {
+    const { like, save, follow, comments } = card.buttons;
+    card.counts.textContent = `👍 ${card.likes} | 💾 ${card.saves}`;
+    like.textContent = card.flags & LIKED ? "❤️ Liked" : "🤍 Like";
+    save.textContent = card.flags & SAVED ? "✅ Saved" : "💾 Save";
+    follow.textContent = card.flags & FOLLOWING ? `✅ Following ${card.creator}` : `➕ Follow ${card.creator}`;
+    follow.hidden = !card.creatorId;
+    comments.textContent = "💬 Comments";
+    like.classList.toggle("on", Boolean(card.flags & LIKED));
+}
+
+export default function ({ data, parentElement, setTriggerValue }) {
+    const root = parentElement.querySelector(".feed");
+    const feed = root.feed || (root.feed = { cards: new Map(), pending: [], timer: null });
+    const col = Object.fromEntries(data.fields.map((field, index) => [field, index]));
+
+    const seen = new Set();
+    let previous = null;
+    for (const row of data.rows) {
+        const id = row[col.id];
+        seen.add(id);
+        let card = feed.cards.get(id);
+        if (card && card.signature !== JSON.stringify(row.slice(0, col.likes))) {
+            card.remove();
+            card = null;
+        }
+        if (!card) {
+            card = buildCard(row, col);
+            feed.cards.set(id, card);
+        }
+        card.likes = row[col.likes];
+        card.saves = row[col.saves];
+        card.flags = row[col.flags];
+        paint(card);
+        const anchor = previous ? previous.nextSibling : root.firstChild;
+        if (card !== anchor) root.insertBefore(card, anchor);
+        previous = card;
+    }
+    for (const [id, card] of feed.cards) {
+        if (!seen.has(id)) {
+            card.remove();
+            feed.cards.delete(id);
+        }
+    }
+
+    const flush = () => {
+        clearTimeout(feed.timer);
+        feed.timer = null;
+        if (feed.pending.length) setTriggerValue("actions", feed.pending.splice(0));
+    };
+
+    const observer = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            const card = entry.target;
+            card.near = entry.isIntersecting;
+            if (card.near && !card.player.dataset.open) {
+                card.player.style.backgroundImage = cssUrl(card.thumbnail);
+            } else if (!card.near && card.player.dataset.open) {
+                showFacade(card);  // stop playback and free the player once it scrolls well out of view
+            }
+        }
+    }, { rootMargin: "600px 0px" });
+    for (const card of feed.cards.values()) observer.observe(card);
+
+    root.onclick = (event) => {
+        const target = event.target.closest("[data-action]");
+        const card = target && target.closest(".card");
+        if (!card) return;
+        const action = target.dataset.action;
+        if (action === "play") {
+            openPlayer(card);
+            return;
+        }
+        if (action === "comments") {
+            feed.pending.push([card.reelId, action, true]);
+            flush();
+            return;
+        }
+        const bit = { like: LIKED, save: SAVED, follow: FOLLOWING }[action];
+        const on = !(card.flags & bit);
+        const cards = action === "follow"
+            ? [...feed.cards.values()].filter((other) => other.creatorId === card.creatorId)
+            : [card];
+        for (const other of cards) {
+            other.flags ^= bit;
+            if (action === "like") other.likes += on ? 1 : -1;
+            if (action === "save") other.saves += on ? 1 : -1;
+            paint(other);
+        }
+        feed.pending.push([card.reelId, action, on]);
+        clearTimeout(feed.timer);
+        feed.timer = setTimeout(flush, BATCH_DELAY_MS);
+    };
+
+    return () => {
+        observer.disconnect();
+        flush();
+    };
+}
+"""
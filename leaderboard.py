@@ -0,0 +1,188 @@
+import math
+import random
+
+
+class _End:
+    """Key of the tail sentinel: sorts after every real key."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels  # positions skipped by each link
+
+
+class IndexableSkiplist:
+    """Sorted collection of unique keys with O(log n) insert, remove, rank and index.
+
+    Every forward link stores how many positions it skips, so positions can
+    be counted while searching (Pugh's skiplist with link widths).
+    """
+
+    def __init__(self, max_levels: int = 32, seed: int = None):
+        self._max_levels = max_levels
+        self._random = random.Random(seed)
+        self._end = _Node(_End(), max_levels)
+        self._head = _Node(None, max_levels)
+        self._head.next = [self._end] * max_levels
+        self._size = 0
+
+    @classmethod
+    def from_sorted(cls, keys, max_levels: int = 32, seed: int = None):
+        """Build in O(n) from keys already in ascending order."""
+        skiplist = cls(max_levels, seed)
+        last = [skiplist._head] * max_levels
+        last_pos = [-1] * max_levels
+        pos = -1
+        for pos, key in enumerate(keys):
+            node = _Node(key, skiplist._levels())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = pos - last_pos[level]
+                last[level], last_pos[level] = node, pos
+        for level in range(max_levels):
+            last[level].next[level] = skiplist._end
+            last[level].width[level] = pos + 1 - last_pos[level]
+        skiplist._size = pos + 1
+        return skiplist
+
+    def _levels(self) -> int:
+        return min(self._max_levels, 1 - int(math.log2(1.0 - self._random.random())))
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, key):
+        chain = [None] * self._max_levels
+        steps = [0] * self._max_levels
+        node = self._head
+        for level in reversed(range(self._max_levels)):
+            while node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        new = _Node(key, self._levels())
+        offset = 0
+        for level in range(len(new.next)):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - offset
+            prev.width[level] = offset + 1
+            offset += steps[level]
+        for level in range(len(new.next), self._max_levels):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain = [None] * self._max_levels
+        node = self._head
+        for level in reversed(range(self._max_levels)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if target is self._end or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self._max_levels):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key):
+        """0-based position of ``key``, or None if absent."""
+        node, pos = self._head, -1
+        for level in reversed(range(self._max_levels)):
+            while node.next[level].key < key:
+                pos += node.width[level]
+                node = node.next[level]
+        target = node.next[0]
+        return pos + 1 if target is not self._end and target.key == key else None
+
+    def _node_at(self, index: int) -> _Node:
+        node, remaining = self._head, index + 1
+        for level in reversed(range(self._max_levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return self._node_at(index).key
+
+    def islice(self, start: int = 0, stop: int = None):
+        """Yield keys from position ``start`` up to ``stop``: O(log n + stop - start)."""
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return
+        node = self._node_at(start)
+        for _ in range(stop - start):
+            yield node.key
+            node = node.next[0]
+
+    def __iter__(self):
+        return self.islice()
+
+
+class Leaderboard:
+    """Member scores ranked highest first, ties broken by member id."""
+
+    def __init__(self, scores=None, seed: int = None):
+        self._scores = dict(scores or {})
+        self._order = IndexableSkiplist.from_sorted(
+            sorted((-score, member) for member, score in self._scores.items()), seed=seed
+        )
+
+    def __len__(self):
+        return len(self._scores)
+
+    def add(self, member: str, points: int) -> int:
+        """Add ``points`` to ``member``'s score and return the new score."""
+        old = self._scores.get(member)
+        if old is not None:
+            self._order.remove((-old, member))
+        score = (old or 0) + points
+        self._scores[member] = score
+        self._order.insert((-score, member))
+        return score
+
+    def score(self, member: str) -> int:
+        return self._scores.get(member, 0)
+
+    def rank(self, member: str):
+        """1-based rank, or None for members without a score."""
+        score = self._scores.get(member)
+        if score is None:
+            return None
+        return self._order.rank((-score, member)) + 1
+
+    def top(self, n: int = 10, offset: int = 0):
+        """``[(rank, member, score)]`` for ranks ``offset + 1`` to ``offset + n``."""
+        return [
+            (offset + i + 1, member, -negated)
+            for i, (negated, member) in enumerate(self._order.islice(offset, offset + n))
+        ]
+
+    def around(self, member: str, radius: int = 2):
+        """The member's row with up to ``radius`` neighbours on each side."""
+        rank = self.rank(member)
+        if rank is None:
+            return []
+        start = max(rank - 1 - radius, 0)
+        return self.top(rank - start + radius, offset=start)
@@ -0,0 +1,57 @@
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+
+
+@lru_cache(maxsize=100_000)
+def youtube_video_id(url: str):
+    """Extract the video id from YouTube watch, youtu.be and Shorts URLs (None otherwise).
+
+    Cached per URL, so each reel's link is parsed once per process.
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    video_id = None
+
+    if "youtube.com" in host or "youtu.be" in host:
+        # Handle standard watch URLs
+        if parsed.path.startswith("/watch"):
+            qs = parse_qs(parsed.query)
+            video_id = qs.get("v", [None])[0]
+        # Handle youtu.be short links
+        if not video_id and host == "youtu.be":
+            video_id = parsed.path.lstrip("/")
+        # Handle shorts URLs
+        if not video_id and "/shorts/" in parsed.path:
+            video_id = parsed.path.split("/shorts/")[1].split("/")[0]
+
+    return video_id or None
+
+
+def youtube_thumbnail_url(video_id: str) -> str:
+    return f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+
+
+def parse_duration(text) -> int:
+    """Seconds in a reel duration such as "0:45", "1:15" or "60" (0 if unparseable)."""
+    try:
+        parts = [int(part) for part in str(text).split(":")]
+    except ValueError:
+        return 0
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+
+def format_duration(seconds: int) -> str:
+    """``m:ss`` display form of a duration in seconds."""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def is_playable_url(url: str) -> bool:
+    """True for links ``render_embedded_video`` can play: YouTube (embedded) or any http(s) URL (st.video)."""
+    if youtube_video_id(url):
+        return True
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
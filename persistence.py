@@ -0,0 +1,251 @@
+import abc
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Session-state keys persisted per learner, grouped by how they are stored.
+SET_KINDS = ("liked_reels", "saved_reels", "followed_creators", "completed_quizzes")
+COUNTER_KINDS = ("xp_dynamic",)
+PROFILE_MARKER = "_profile"
+
+
+class WriteBehindQueue:
+    """Collect write operations and hand them to ``apply_batch`` on a worker thread.
+
+    Callers never block on storage: ``put`` only enqueues. The worker drains
+    up to ``max_batch`` operations (or whatever arrived within
+    ``flush_interval`` seconds) and applies them together.
+    """
+
+    def __init__(self, apply_batch, max_batch: int = 500, flush_interval: float = 0.25, name="write-behind"):
+        self._apply_batch = apply_batch
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, op):
+        if self._closed:
+            raise RuntimeError("WriteBehindQueue is closed")
+        self._queue.put(op)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until everything queued so far has been applied."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        if not self._closed:
+            self.flush(timeout)
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, barriers, stop = [], [], False
+            deadline = time.monotonic() + self._flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    barriers.append(item)
+                else:
+                    batch.append(item)
+                if stop or barriers or len(batch) >= self._max_batch:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._apply_batch(batch)
+                except Exception:
+                    logger.exception("Dropped a batch of %d writes", len(batch))
+            for barrier in barriers:
+                barrier.set()
+            if stop:
+                return
+
+
+class StateStore(abc.ABC):
+    """Durable per-learner engagement state.
+
+    ``load`` returns a dict keyed by the session-state names in SET_KINDS
+    and COUNTER_KINDS (missing kinds are simply absent), or None
+    for a learner that has never been seen. Mutations are fire-and-forget.
+    """
+
+    @abc.abstractmethod
+    def load(self, user_id: str):
+        ...
+
+    @abc.abstractmethod
+    def create_profile(self, user_id: str):
+        ...
+
+    @abc.abstractmethod
+    def add(self, user_id: str, kind: str, item: str):
+        ...
+
+    @abc.abstractmethod
+    def remove(self, user_id: str, kind: str, item: str):
+        ...
+
+    @abc.abstractmethod
+    def increment(self, user_id: str, kind: str, amount: int):
+        ...
+
+    def flush(self, timeout: float = None):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryStateStore(StateStore):
+    """Process-local store; state survives reruns and refreshes but not restarts."""
+
+    def __init__(self):
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def load(self, user_id):
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None:
+                return None
+            return {kind: set(value) if kind in SET_KINDS else value for kind, value in state.items()}
+
+    def _user(self, user_id):
+        return self._users.setdefault(user_id, {})
+
+    def create_profile(self, user_id):
+        with self._lock:
+            self._user(user_id)
+
+    def add(self, user_id, kind, item):
+        with self._lock:
+            self._user(user_id).setdefault(kind, set()).add(item)
+
+    def remove(self, user_id, kind, item):
+        with self._lock:
+            self._user(user_id).get(kind, set()).discard(item)
+
+    def increment(self, user_id, kind, amount):
+        with self._lock:
+            user = self._user(user_id)
+            user[kind] = user.get(kind, 0) + amount
+
+
+class SQLiteStateStore(StateStore):
+    """SQLite (WAL) store with write-behind batching.
+
+    All of a learner's rows share the ``user_id`` prefix of the primary key,
+    so ``load`` is a single index range scan.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS user_state (
+            user_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            item TEXT NOT NULL,
+            value,
+            PRIMARY KEY (user_id, kind, item)
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, path: str = "bite_sized.db", max_batch: int = 500, flush_interval: float = 0.25):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self.SCHEMA)
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(
+            self._apply_batch, max_batch, flush_interval, name="sqlite-state-writer"
+        )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _apply_batch(self, ops):
+        # Runs on the writer thread only, which owns this connection.
+        if self._writer_conn is None:
+            self._writer_conn = self._connect()
+        with self._writer_conn as conn:
+            for sql, params in ops:
+                conn.execute(sql, params)
+
+    def load(self, user_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT kind, item, value FROM user_state WHERE user_id = ? ORDER BY kind, item",
+                (user_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        state = {}
+        for kind, item, value in rows:
+            if kind in SET_KINDS:
+                state.setdefault(kind, set()).add(item)
+            elif kind in COUNTER_KINDS:
+                state[kind] = int(value)
+        return state
+
+    def create_profile(self, user_id):
+        self._writes.put(
+            (
+                "INSERT OR IGNORE INTO user_state (user_id, kind, item) VALUES (?, ?, '')",
+                (user_id, PROFILE_MARKER),
+            )
+        )
+
+    def add(self, user_id, kind, item):
+        self._writes.put(
+            ("INSERT OR IGNORE INTO user_state (user_id, kind, item) VALUES (?, ?, ?)", (user_id, kind, item))
+        )
+
+    def remove(self, user_id, kind, item):
+        self._writes.put(
+            ("DELETE FROM user_state WHERE user_id = ? AND kind = ? AND item = ?", (user_id, kind, item))
+        )
+
+    def increment(self, user_id, kind, amount):
+        self._writes.put(
+            (
+                "INSERT INTO user_state (user_id, kind, item, value) VALUES (?, ?, '', ?) "
+                "ON CONFLICT (user_id, kind, item) DO UPDATE SET value = value + excluded.value",
+                (user_id, kind, amount),
+            )
+        )
+
+    def flush(self, timeout=None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()
+
+
+STORE_BACKENDS = {
+    "sqlite": SQLiteStateStore,
+    "memory": MemoryStateStore,
+}
+
+
+def open_state_store(backend: str = "sqlite", **options) -> StateStore:
+    try:
+        store_cls = STORE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown state store backend: {backend!r}") from None
+    return store_cls(**options)
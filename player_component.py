@@ -0,0 +1,119 @@
+import math
+
+
+def parse_playback(payload):
+    """``(position, duration)`` in seconds from one report of the player, or None if it is malformed.
+
+    ``duration`` is 0 when the player does not know it yet.
+    """
+    if not (isinstance(payload, list) and len(payload) == 2):
+        return None
+    position, duration = payload
+    for value in (position, duration):
+        if not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            return None
+    return float(position), float(duration)
+
+
+PLAYER_HTML = '<div class="player"></div>'
+
+PLAYER_CSS = """
+.player { width: 100%; border-radius: 8px; overflow: hidden; background: #000; }
+.player iframe, .player video { width: 100%; height: 100%; border: 0; }
+"""
+
+# The player stays mounted across reruns and reports [position, duration]
+# when playback starts, pauses or ends, and every data.interval seconds
+# while it plays, so time with the reel paused or never started is not
+# reported at all. YouTube reels use the IFrame Player API for the position.
+PLAYER_JS = """
+const PLAYING = 1, PAUSED = 2, ENDED = 0;
+
+function youtubeApi() {
+    if (!window.biteSizedYouTubeApi) {
+        window.biteSizedYouTubeApi = new Promise((resolve) => {
+            if (window.YT && window.YT.Player) return resolve(window.YT);
+            const previous = window.onYouTubeIframeAPIReady;
+            window.onYouTubeIframeAPIReady = () => {
+                if (previous) previous();
+                resolve(window.YT);
+            };
+            const script = document.createElement("script");
+            script.src = "https://www.youtube.com/iframe_api";
+            document.head.appendChild(script);
+        });
+    }
+    return window.biteSizedYouTubeApi;
+}
+
+function youtubePlayback(root, videoId) {
+    const playback = { player: null, onChange: null };
+    // The player's methods only exist once its iframe is ready.
+    const call = (method, fallback) => {
+        const player = playback.player;
+        return player && player[method] ? player[method]() : fallback;
+    };
+    playback.position = () => call("getCurrentTime", 0);
+    playback.duration = () => call("getDuration", 0);
+    playback.playing = () => call("getPlayerState", -1) === PLAYING;
+    const target = document.createElement("div");
+    root.appendChild(target);
+    youtubeApi().then((YT) => {
+        playback.player = new YT.Player(target, {
+            videoId,
+            width: "100%",
+            height: "100%",
+            events: {
+                onStateChange: (event) => {
+                    if ([PLAYING, PAUSED, ENDED].includes(event.data) && playback.onChange) playback.onChange();
+                },
+            },
+        });
+    });
+    return playback;
+}
+
+function videoPlayback(root, src) {
+    const video = document.createElement("video");
+    video.src = src;
+    video.controls = true;
+    root.appendChild(video);
+    const playback = { onChange: null };
+    playback.position = () => video.currentTime;
+    playback.duration = () => (Number.isFinite(video.duration) ? video.duration : 0);
+    playback.playing = () => !video.paused && !video.ended;
+    for (const type of ["play", "pause"]) {
+        video.addEventListener(type, () => playback.onChange && playback.onChange());
+    }
+    return playback;
+}
+
+export default function ({ data, parentElement, setTriggerValue }) {
+    const root = parentElement.querySelector(".player");
+    root.style.height = `${data.height}px`;
+    const source = data.youtube_id || data.src;
+    if (root.source !== source) {
+        root.source = source;
+        root.lastReport = null;
+        root.replaceChildren();
+        root.playback = data.youtube_id ? youtubePlayback(root, data.youtube_id) : videoPlayback(root, data.src);
+    }
+    const playback = root.playback;
+
+    const report = () => {
+        const position = playback.position();
+        if (position === root.lastReport) return;
+        root.lastReport = position;
+        setTriggerValue("playback", [position, playback.duration()]);
+    };
+    playback.onChange = report;
+    const timer = setInterval(() => {
+        if (playback.playing()) report();
+    }, data.interval * 1000);
+
+    return () => {
+        clearInterval(timer);
+        playback.onChange = null;
+    };
+}
+"""
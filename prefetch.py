@@ -0,0 +1,354 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode, urlparse
+
+from media import youtube_thumbnail_url, youtube_video_id
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_OEMBED = "https://www.youtube.com/oembed"
+MAX_RESPONSE_BYTES = 1 << 20  # oEmbed answers are a few hundred bytes
+
+Response = namedtuple("Response", "status headers body")
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+class MetadataCache:
+    """On-disk cache of resolved video metadata, read by page renders without network access.
+
+    Each URL's metadata is one JSON file at ``refs/ab/<sha256(url)>`` under
+    ``root``, replaced atomically on refresh. It is addressed by the URL it
+    describes, not by its own content: renders look entries up by URL, and
+    the entries are small and rarely identical, so there is nothing to
+    deduplicate. Thumbnails are cached as their URL only: the browser
+    fetches the image from the video host's CDN, and inlining the bytes
+    would put tens of KiB per card into every feed rerun.
+
+    Entries expire ``ttl`` seconds after they were fetched (``error_ttl`` for
+    failed lookups). ``evict`` deletes expired refs, then the oldest ones
+    beyond ``max_entries``. Hits are memoised in memory, least recently used
+    first out, up to the same ``max_entries``.
+    """
+
+    def __init__(self, root: str, ttl: float = 7 * 86400, error_ttl: float = 600, max_entries: int = 100_000):
+        self.root = root
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "refs"), exist_ok=True)
+
+    def _ref_path(self, url: str) -> str:
+        key = _digest(url.encode())
+        return os.path.join(self.root, "refs", key[:2], key)
+
+    def _expires(self, entry: dict) -> float:
+        return entry["fetched_at"] + (self.error_ttl if entry.get("error") else self.ttl)
+
+    def _remember(self, url: str, entry: dict):
+        with self._lock:
+            self._memo[url] = entry
+            self._memo.move_to_end(url)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    def _forget(self, url: str):
+        with self._lock:
+            self._memo.pop(url, None)
+
+    def get(self, url: str, now: float = None):
+        """Fresh metadata for ``url``, or None when it is missing or expired."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._memo.get(url)
+            if entry is not None:
+                self._memo.move_to_end(url)
+        if entry is None:
+            try:
+                with open(self._ref_path(url), "rb") as fh:
+                    entry = json.loads(fh.read())
+            except (OSError, ValueError):
+                return None
+            self._remember(url, entry)
+        if self._expires(entry) <= now:
+            self._forget(url)
+            return None
+        return entry
+
+    def put(self, url: str, entry: dict) -> dict:
+        entry = dict(entry, url=url, fetched_at=entry.get("fetched_at", time.time()))
+        _write_atomic(self._ref_path(url), json.dumps(entry, separators=(",", ":")).encode())
+        self._remember(url, entry)
+        return entry
+
+    def evict(self, now: float = None) -> int:
+        """Delete expired refs and the oldest beyond ``max_entries``; returns how many files were removed."""
+        now = time.time() if now is None else now
+        removed = 0
+        live = []  # (fetched_at, path, url)
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, "refs")):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    with open(path, "rb") as fh:
+                        entry = json.loads(fh.read())
+                except (OSError, ValueError):
+                    entry = None
+                if entry is not None and self._expires(entry) > now:
+                    live.append((entry["fetched_at"], path, entry.get("url")))
+                    continue
+                if entry is not None:
+                    self._forget(entry.get("url"))
+                os.remove(path)
+                removed += 1
+        live.sort()
+        for _, path, url in live[: max(0, len(live) - self.max_entries)]:
+            self._forget(url)
+            os.remove(path)
+            removed += 1
+        return removed
+
+
+class UrllibTransport:
+    """Blocking urllib requests run on a thread pool, awaited from asyncio.
+
+    With ``base_url`` every request goes to that server instead, as
+    ``<base_url>/<host><path>?<query>``: point it at a local stub server to
+    run without network access. Any object with the same ``request``
+    coroutine can replace this class.
+    """
+
+    def __init__(self, base_url: str = None, timeout: float = 10.0, max_workers: int = 32):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="prefetch-http")
+
+    def _target(self, url: str) -> str:
+        if self.base_url is None:
+            return url
+        parsed = urlparse(url)
+        query = f"?{parsed.query}" if parsed.query else ""
+        return f"{self.base_url}/{parsed.netloc}{quote(parsed.path)}{query}"
+
+    def _send(self, method: str, url: str, limit: int) -> Response:
+        request = urllib.request.Request(self._target(url), method=method, headers={"User-Agent": "bite-sized/1.0"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read(limit + 1) if method == "GET" else b""
+                return Response(response.status, dict(response.headers), body)
+        except urllib.error.HTTPError as exc:
+            return Response(exc.code, dict(exc.headers or {}), b"")
+
+    async def request(self, method: str, url: str, limit: int = MAX_RESPONSE_BYTES) -> Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._send, method, url, limit)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class Prefetcher:
+    """Resolve metadata for many video URLs concurrently.
+
+    YouTube links are resolved through oEmbed (title, author, thumbnail URL
+    and, where the provider sends it, duration). Other http(s) links get a HEAD request for content type and size. At most
+    ``concurrency`` URLs are in flight; a URL already being resolved is
+    awaited rather than fetched twice.
+    """
+
+    def __init__(self, cache: MetadataCache, transport=None, concurrency: int = 8, oembed_url: str = YOUTUBE_OEMBED):
+        self.cache = cache
+        self.transport = transport or UrllibTransport(max_workers=concurrency)
+        self.concurrency = concurrency
+        self.oembed_url = oembed_url
+        self._in_flight = {}
+        self._semaphore = None
+
+    async def prefetch(self, urls):
+        """Resolve every URL without fresh cache metadata; returns how many were fetched."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        pending = [url for url in dict.fromkeys(urls) if url and self.cache.get(url) is None]
+        await asyncio.gather(*(self.resolve(url) for url in pending))
+        return len(pending)
+
+    async def resolve(self, url: str) -> dict:
+        task = self._in_flight.get(url)
+        if task is None:
+            task = self._in_flight[url] = asyncio.ensure_future(self._resolve(url))
+            task.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        return await task
+
+    async def _resolve(self, url: str) -> dict:
+        async with self._semaphore:
+            try:
+                video_id = youtube_video_id(url)
+                if video_id:
+                    entry = await self._resolve_youtube(url, video_id)
+                else:
+                    entry = await self._resolve_file(url)
+            except Exception as exc:
+                logger.debug("Could not resolve %s", url, exc_info=True)
+                entry = {"error": f"{type(exc).__name__}: {exc}"}
+        return self.cache.put(url, entry)
+
+    async def _resolve_youtube(self, url: str, video_id: str):
+        response = await self.transport.request("GET", f"{self.oembed_url}?{urlencode({'url': url, 'format': 'json'})}")
+        if response.status != 200:
+            return {"kind": "youtube", "error": f"oEmbed HTTP {response.status}"}
+        data = json.loads(response.body)
+        return {
+            "kind": "youtube",
+            "title": data.get("title"),
+            "author": data.get("author_name"),
+            "duration": int(data["duration"]) if data.get("duration") else None,
+            "thumbnail_url": data.get("thumbnail_url") or youtube_thumbnail_url(video_id),
+        }
+
+    async def _resolve_file(self, url: str) -> dict:
+        if urlparse(url).scheme not in ("http", "https"):
+            return {"kind": "file", "error": "not an http(s) URL"}
+        response = await self.transport.request("HEAD", url)
+        if response.status >= 400:
+            return {"kind": "file", "error": f"HTTP {response.status}"}
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        size = headers.get("content-length")
+        return {
+            "kind": "file",
+            "content_type": headers.get("content-type"),
+            "size": int(size) if size and size.isdigit() else None,
+        }
+
+
+class PrefetchService:
+    """Runs a ``Prefetcher`` on its own event loop thread so Streamlit reruns never wait on it.
+
+    ``submit`` is fire-and-forget. Expired cache entries are swept at most
+    once per ``evict_interval`` seconds, after a batch finishes.
+    """
+
+    def __init__(self, prefetcher: Prefetcher, evict_interval: float = 3600):
+        self.prefetcher = prefetcher
+        self.evict_interval = evict_interval
+        self._last_evict = 0.0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="prefetch", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, urls):
+        """Queue URLs for resolution; returns a concurrent Future, or None if all are cached."""
+        cache = self.prefetcher.cache
+        urls = [url for url in urls if url and cache.get(url) is None]
+        if not urls:
+            return None
+        return asyncio.run_coroutine_threadsafe(self._run(urls), self._loop)
+
+    async def _run(self, urls):
+        fetched = await self.prefetcher.prefetch(urls)
+        if time.time() - self._last_evict >= self.evict_interval:
+            self._last_evict = time.time()
+            await asyncio.get_running_loop().run_in_executor(None, self.prefetcher.cache.evict)
+        return fetched
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        close = getattr(self.prefetcher.transport, "close", None)
+        if close is not None:
+            close()
+
+
+def stub_server(port: int = 0, latency: float = 0.0):
+    """Local stand-in for oEmbed and CDN hosts, for ``UrllibTransport(base_url=...)``.
+
+    Answers every oEmbed request with made-up metadata, every other GET with
+    404 and every HEAD with video headers, after ``latency`` seconds. Returns the (not yet serving) server; its URL is
+    ``f"http://127.0.0.1:{server.server_port}"``.
+    """
+    import http.server
+    from urllib.parse import parse_qs
+
+    class StubHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, content_type: str, body: bytes, send_body: bool = True, status: int = 200):
+            time.sleep(latency)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body) if send_body else 1_048_576))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            path, _, query = self.path.partition("?")
+            if path.endswith("/oembed"):
+                url = parse_qs(query).get("url", [""])[0]
+                video_id = youtube_video_id(url) or "unknown"
+                body = {
+                    "title": f"Stub video {video_id}",
+                    "author_name": "Stub Creator",
+                    "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                    "duration": 45,
+                }
+                self._reply("application/json", json.dumps(body).encode())
+            else:
+                self._reply("text/plain", b"not found", status=404)
+
+        def do_HEAD(self):
+            self._reply("video/mp4", b"", send_body=False)
+
+        def log_message(self, *args):
+            pass
+
+    return http.server.ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resolve video URLs into the media cache, or run the stub server.")
+    parser.add_argument("urls", nargs="*", help="video URLs to resolve")
+    parser.add_argument("--cache", default=".media_cache")
+    parser.add_argument("--base-url", help="send every request to this server (e.g. a running stub)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stub", type=int, metavar="PORT", help="serve the offline stub on PORT instead")
+    args = parser.parse_args()
+    if args.stub is not None:
+        server = stub_server(args.stub)
+        print(f"stub serving on http://127.0.0.1:{server.server_port}")
+        server.serve_forever()
+        return
+    cache = MetadataCache(args.cache)
+    prefetcher = Prefetcher(cache, UrllibTransport(args.base_url, max_workers=args.concurrency), args.concurrency)
+    asyncio.run(prefetcher.prefetch(args.urls))
+    for url in args.urls:
+        print(json.dumps(cache.get(url)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import bisect
+import functools
+import http.server
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket upper bounds grow by 10% from 10 µs to ~100 s: ~170 buckets,
+# so every quantile is within 10% of the true value.
+BUCKET_BOUNDS = tuple(1e-5 * 1.1**i for i in range(int(math.log(1e7) / math.log(1.1)) + 2))
+
+
+class RollingHistogram:
+    """Fixed-memory latency histogram over a sliding window.
+
+    The window is split into ``slots`` ring entries of equal length. Each
+    slot holds one bucket array, and a slot is reset when the ring wraps
+    back to it. Lifetime count and sum are kept separately for exporters.
+    """
+
+    def __init__(self, window: float = 300.0, slots: int = 5):
+        self.slot_seconds = window / slots
+        self._counts = [[0] * (len(BUCKET_BOUNDS) + 1) for _ in range(slots)]
+        self._epochs = [-1] * slots
+        self.total_count = 0
+        self.total_sum = 0.0
+
+    def _slot(self, now: float) -> list:
+        epoch = int(now // self.slot_seconds)
+        i = epoch % len(self._counts)
+        if self._epochs[i] != epoch:
+            self._counts[i] = [0] * (len(BUCKET_BOUNDS) + 1)
+            self._epochs[i] = epoch
+        return self._counts[i]
+
+    def record(self, seconds: float, now: float = None):
+        self._slot(now if now is not None else time.monotonic())[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.total_count += 1
+        self.total_sum += seconds
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99), now: float = None):
+        """Return ``(window_count, [quantile upper bounds])`` over the live window."""
+        now = now if now is not None else time.monotonic()
+        current = int(now // self.slot_seconds)
+        live = [
+            counts
+            for counts, epoch in zip(self._counts, self._epochs)
+            if current - epoch < len(self._counts)
+        ]
+        merged = [sum(column) for column in zip(*live)] if live else []
+        total = sum(merged)
+        if not total:
+            return 0, [0.0 for _ in qs]
+        results = []
+        for q in qs:
+            rank, seen = q * total, 0
+            for i, count in enumerate(merged):
+                seen += count
+                if seen >= rank:
+                    results.append(BUCKET_BOUNDS[min(i, len(BUCKET_BOUNDS) - 1)])
+                    break
+        return total, results
+
+
+class Profiler:
+    """Opt-in timers for page dispatch and render helpers.
+
+    Disabled profilers cost one attribute check per timed call.
+    """
+
+    def __init__(self, enabled: bool = False, window: float = 300.0):
+        self.enabled = enabled
+        self.window = window
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.record(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def instrument(self, name: str = None):
+        """Decorator form of ``timer``; defaults to the function name."""
+
+        def decorator(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.timer(label):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self):
+        """One row per timer: window count and p50/p95/p99 (ms), plus lifetime count and mean."""
+        with self._lock:
+            rows = []
+            for name, histogram in sorted(self._histograms.items()):
+                count, (p50, p95, p99) = histogram.quantiles()
+                rows.append(
+                    {
+                        "name": name,
+                        "window_count": count,
+                        "p50_ms": round(p50 * 1e3, 3),
+                        "p95_ms": round(p95 * 1e3, 3),
+                        "p99_ms": round(p99 * 1e3, 3),
+                        "total_count": histogram.total_count,
+                        "mean_ms": round(histogram.total_sum / histogram.total_count * 1e3, 3),
+                    }
+                )
+            return rows
+
+    def prometheus_text(self, metric: str = "bite_sized_render_seconds") -> str:
+        """Prometheus text exposition: one summary per timer, labelled by ``op``."""
+        lines = [
+            f"# HELP {metric} Render time of pages and helpers over a rolling window.",
+            f"# TYPE {metric} summary",
+        ]
+        with self._lock:
+            for name, histogram in sorted(self._histograms.items()):
+                label = re.sub(r'["\\\n]', "_", name)
+                _, values = histogram.quantiles((0.5, 0.95, 0.99))
+                for q, value in zip(("0.5", "0.95", "0.99"), values):
+                    lines.append(f'{metric}{{op="{label}",quantile="{q}"}} {value:.6f}')
+                lines.append(f'{metric}_sum{{op="{label}"}} {histogram.total_sum:.6f}')
+                lines.append(f'{metric}_count{{op="{label}"}} {histogram.total_count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically write the exposition text (node_exporter textfile-collector style)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            fh.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+
+def start_exporter(profiler: Profiler, path: str = None, port: int = None, interval: float = 15.0):
+    """Export metrics to ``path`` every ``interval`` seconds and/or serve them at ``:port/metrics``."""
+    if path:
+
+        def write_loop():
+            while True:
+                time.sleep(interval)
+                profiler.write_prometheus(path)
+
+        threading.Thread(target=write_loop, name="metrics-file-exporter", daemon=True).start()
+
+    if port:
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = profiler.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http-exporter", daemon=True).start()
+
+
+PROFILER = Profiler()
@@ -0,0 +1,235 @@
+import heapq
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from analytics import connect
+from persistence import WriteBehindQueue
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS review_cards (
+        user_id TEXT NOT NULL,
+        card_id TEXT NOT NULL,
+        ease REAL NOT NULL,
+        interval REAL NOT NULL,
+        reps INTEGER NOT NULL,
+        lapses INTEGER NOT NULL,
+        due REAL NOT NULL,
+        PRIMARY KEY (user_id, card_id)
+    ) WITHOUT ROWID;
+"""
+
+DAY = 86400.0
+MIN_EASE = 1.3
+PASSING_QUALITY = 3
+
+Question = namedtuple("Question", "id target prompt options answer explanation")
+Card = namedtuple("Card", "card_id ease interval reps lapses due")
+
+
+class QuestionBank:
+    """Quiz questions per target ("reel/<id>", "module/<course>/<module>").
+
+    Targets without their own questions fall back to the questions filed
+    under their kind ("reel" or "module"). Answers are indexed by question id
+    once, so grading a submission is one dict lookup per answer.
+    """
+
+    def __init__(self, questions=()):
+        self._by_target = {}
+        self._answers = {}
+        for row in questions:
+            question = Question(
+                row["id"],
+                row["target"],
+                row["prompt"],
+                tuple(row["options"]),
+                row["answer"],
+                row.get("explanation", ""),
+            )
+            if question.id in self._answers:
+                raise ValueError(f"Duplicate question id: {question.id}")
+            self._by_target.setdefault(question.target, []).append(question)
+            self._answers[question.id] = question.answer
+
+    @classmethod
+    def from_jsonl(cls, path: str, extra=()):
+        """Questions from a JSON-lines file (one question object per line) plus ``extra``."""
+        with open(path, encoding="utf-8") as fh:
+            return cls([*extra, *(json.loads(line) for line in fh if line.strip())])
+
+    def __len__(self):
+        return len(self._answers)
+
+    def for_target(self, target: str):
+        questions = self._by_target.get(target)
+        if questions is None:
+            questions = self._by_target.get(target.partition("/")[0], [])
+        return questions
+
+    def grade(self, answers: dict):
+        """Grade ``{question_id: chosen option index}`` in one pass.
+
+        Returns ``(results, quality)``: ``{question_id: correct}`` and an SM-2
+        recall quality from 0 (all wrong) to 5 (all right).
+        """
+        results = {qid: self._answers.get(qid) == choice for qid, choice in answers.items()}
+        score = sum(results.values()) / len(results) if results else 0.0
+        return results, quality_from_score(score)
+
+
+def quality_from_score(score: float) -> int:
+    """Map the fraction of correct answers to SM-2 quality (5 perfect, < 3 a lapse)."""
+    if score >= 1.0:
+        return 5
+    if score >= 0.8:
+        return 4
+    if score >= 0.6:
+        return 3
+    if score >= 0.4:
+        return 2
+    return 1 if score > 0 else 0
+
+
+def sm2(card: Card, quality: int, now: float) -> Card:
+    """Next state of ``card`` after a review of ``quality`` (0-5), per SuperMemo-2."""
+    if quality < PASSING_QUALITY:
+        reps, interval, lapses = 0, 1.0, card.lapses + 1
+    else:
+        reps, lapses = card.reps + 1, card.lapses
+        interval = 1.0 if reps == 1 else 6.0 if reps == 2 else round(card.interval * card.ease)
+    ease = max(MIN_EASE, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return Card(card.card_id, ease, interval, reps, lapses, now + interval * DAY)
+
+
+def new_card(card_id: str, now: float) -> Card:
+    return Card(card_id, 2.5, 0.0, 0, 0, now)
+
+
+class _Deck:
+    """One learner's cards plus a min-heap of ``(due, card_id)``, loaded on first touch.
+
+    Rescheduling pushes a fresh heap entry; entries whose due time no longer
+    matches the card are stale and dropped when they reach the top.
+    """
+
+    __slots__ = ("cards", "heap")
+
+    def __init__(self, cards):
+        self.cards = {card.card_id: card for card in cards}
+        self.compact()
+
+    def compact(self):
+        """Rebuild the heap without stale entries."""
+        self.heap = [(card.due, card.card_id) for card in self.cards.values()]
+        heapq.heapify(self.heap)
+
+    def prune(self):
+        heap, cards = self.heap, self.cards
+        while heap and cards[heap[0][1]].due != heap[0][0]:
+            heapq.heappop(heap)
+
+
+class ReviewScheduler:
+    """Spaced-repetition review queue per learner.
+
+    Each review updates the card with SM-2 and re-queues it, in O(log n).
+    "What is due" pops from the learner's heap until it reaches a card due
+    later, so the cost depends on how many cards are due, not on how many the
+    learner has. Card rows are written by the write-behind queue. Decks are
+    cached for the ``max_decks`` most recently seen learners; others are
+    reloaded from SQLite.
+    """
+
+    def __init__(
+        self, path: str = "bite_sized.db", max_batch: int = 500, flush_interval: float = 0.5, max_decks: int = 10_000
+    ):
+        self.path = path
+        self.max_decks = max_decks
+        self._lock = threading.RLock()
+        self._decks = OrderedDict()  # user_id -> _Deck, least recently used first
+        self._evicted = False
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(self._apply_batch, max_batch, flush_interval, name="review-writer")
+
+    def _apply_batch(self, cards):
+        if self._writer_conn is None:
+            self._writer_conn = connect(self.path)
+        with self._writer_conn as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO review_cards (user_id, card_id, ease, interval, reps, lapses, due) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                cards,
+            )
+
+    def _deck(self, user_id: str) -> _Deck:
+        deck = self._decks.get(user_id)
+        if deck is not None:
+            self._decks.move_to_end(user_id)
+            return deck
+        if self._evicted:
+            # An evicted learner's last reviews may still be queued; reload them too.
+            self._writes.flush()
+        with connect(self.path) as conn:
+            rows = conn.execute(
+                "SELECT card_id, ease, interval, reps, lapses, due FROM review_cards WHERE user_id = ?",
+                (user_id,),
+            ).fetchall()
+        deck = self._decks[user_id] = _Deck(Card(*row) for row in rows)
+        while len(self._decks) > self.max_decks:
+            self._decks.popitem(last=False)
+            self._evicted = True
+        return deck
+
+    def review(self, user_id: str, card_id: str, quality: int, now: float = None) -> Card:
+        """Record a review of ``quality`` (0-5) and reschedule the card; new cards start here."""
+        now = time.time() if now is None else now
+        with self._lock:
+            deck = self._deck(user_id)
+            card = sm2(deck.cards.get(card_id) or new_card(card_id, now), quality, now)
+            deck.cards[card_id] = card
+            heapq.heappush(deck.heap, (card.due, card_id))
+            if len(deck.heap) > 2 * len(deck.cards) + 64:
+                deck.compact()
+            self._writes.put((user_id, *card))
+        return card
+
+    def card(self, user_id: str, card_id: str):
+        with self._lock:
+            return self._deck(user_id).cards.get(card_id)
+
+    def due(self, user_id: str, now: float = None, limit: int = 20):
+        """Cards due by ``now``, most overdue first (at most ``limit``)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            deck = self._deck(user_id)
+            popped = []
+            deck.prune()
+            while deck.heap and deck.heap[0][0] <= now and len(popped) < limit:
+                entry = heapq.heappop(deck.heap)
+                if not popped or popped[-1] != entry:  # an identical reschedule can leave a twin entry
+                    popped.append(entry)
+                deck.prune()
+            for entry in popped:
+                heapq.heappush(deck.heap, entry)
+            return [deck.cards[card_id] for _, card_id in popped]
+
+    def next_due(self, user_id: str):
+        """The learner's earliest-due card, or None without cards."""
+        with self._lock:
+            deck = self._deck(user_id)
+            deck.prune()
+            return deck.cards[deck.heap[0][1]] if deck.heap else None
+
+    def size(self, user_id: str) -> int:
+        with self._lock:
+            return len(self._deck(user_id).cards)
+
+    def flush(self, timeout: float = None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()
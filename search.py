@@ -0,0 +1,156 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+
+TOKEN_RE = re.compile(r"\w+")
+PREFIX_CACHE_SIZE = 50_000
+
+
+def tokenize(text: str):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking and prefix (typeahead) queries.
+
+    Documents can be added or replaced at any time. Terms whose posting
+    list grows past ``champion_size`` also keep a bounded heap of their
+    highest-impact documents. Queries walk terms rarest first; for such
+    common terms they score only the heap plus documents already matched by
+    rarer terms, so query cost stays flat as the corpus grows.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, champion_size: int = 256, max_prefix_terms: int = 8):
+        self.k1 = k1
+        self.b = b
+        self.champion_size = champion_size
+        self.max_prefix_terms = max_prefix_terms
+        self._docs = []  # idx -> {"id", "kind", "title", "payload"}, or None once replaced
+        self._doc_len = []
+        self._terms_of = []  # idx -> terms, so a replaced document can be unindexed
+        self._ids = {}  # doc_id -> idx
+        self._postings = {}  # term -> {idx: tf}
+        self._champions = {}  # term -> min-heap of (impact, idx)
+        self._sorted_terms = []
+        self._prefix_cache = {}  # prefix -> expand_prefix() result
+        self._total_len = 0
+        self._live = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._live
+
+    def _impact(self, tf: int, length: int) -> float:
+        avgdl = self._total_len / self._live if self._live else 1.0
+        return tf / (tf + self.k1 * (1 - self.b + self.b * length / avgdl))
+
+    def add(self, doc_id: str, kind: str, title: str, *fields, payload: dict = None):
+        """Index (or re-index) a document; ``title`` and every extra field are searchable."""
+        terms = tokenize(" ".join(map(str, (title, *fields))))
+        with self._lock:
+            self.remove(doc_id)
+            idx = len(self._docs)
+            self._docs.append({"id": doc_id, "kind": kind, "title": title, "payload": payload or {}})
+            self._doc_len.append(len(terms))
+            self._ids[doc_id] = idx
+            self._total_len += len(terms)
+            self._live += 1
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            self._terms_of.append(tuple(counts))
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    bisect.insort(self._sorted_terms, term)
+                    for end in range(1, len(term) + 1):
+                        self._prefix_cache.pop(term[:end], None)
+                postings[idx] = tf
+                self._update_champions(term, idx, tf, len(terms))
+
+    def _update_champions(self, term, idx, tf, length):
+        postings = self._postings[term]
+        heap = self._champions.get(term)
+        if heap is None:
+            if len(postings) <= self.champion_size:
+                return
+            heap = [(self._impact(t, self._doc_len[i]), i) for i, t in postings.items()]
+            self._champions[term] = heapq.nlargest(self.champion_size, heap)
+            heapq.heapify(self._champions[term])
+            return
+        entry = (self._impact(tf, length), idx)
+        if len(heap) < self.champion_size:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            idx = self._ids.pop(doc_id, None)
+            if idx is None:
+                return
+            for term in self._terms_of[idx]:
+                self._postings[term].pop(idx, None)
+            # Champion heaps may keep the stale idx; queries skip it via the postings check.
+            self._total_len -= self._doc_len[idx]
+            self._live -= 1
+            self._docs[idx] = None
+            self._terms_of[idx] = ()
+
+    def expand_prefix(self, prefix: str):
+        """Up to ``max_prefix_terms`` indexed terms starting with ``prefix``.
+
+        The prefix itself comes first when it is a term; the rest are the most frequent completions.
+        Results are cached until a new term with this prefix is indexed.
+        """
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + "\uffff")
+        exact = [prefix] if start < end and self._sorted_terms[start] == prefix else []
+        completions = self._sorted_terms[start + len(exact) : end]
+        limit = self.max_prefix_terms - len(exact)
+        if len(completions) > limit:
+            completions = heapq.nlargest(limit, completions, key=lambda t: len(self._postings[t]))
+        if len(self._prefix_cache) >= PREFIX_CACHE_SIZE:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = exact + completions
+        return exact + completions
+
+    def search(self, query: str, limit: int = 10, kinds=None, prefix: bool = True):
+        """BM25-ranked hits for ``query``; the last token also matches as a prefix when ``prefix``."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            terms = set(tokens)
+            if prefix:
+                terms.discard(tokens[-1])
+                terms.update(self.expand_prefix(tokens[-1]))
+            terms = sorted((t for t in terms if self._postings.get(t)), key=lambda t: len(self._postings[t]))
+            n = self._live
+            avgdl = self._total_len / n if n else 1.0
+            scores = {}
+            for term in terms:
+                postings = self._postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                heap = self._champions.get(term)
+                if heap is None:
+                    candidates = postings
+                else:
+                    candidates = {idx for _, idx in heap}
+                    candidates.update(idx for idx in scores if idx in postings)
+                for idx in candidates:
+                    tf = postings.get(idx)
+                    if tf is None:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[idx] / avgdl)
+                    scores[idx] = scores.get(idx, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            if kinds is not None:
+                scores = {idx: s for idx, s in scores.items() if self._docs[idx]["kind"] in kinds}
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [dict(self._docs[idx], score=score) for idx, score in best]
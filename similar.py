@@ -0,0 +1,357 @@
+import threading
+from array import array
+
+import numpy as np
+
+from analytics import SCHEMA as EVENTS_SCHEMA
+from analytics import connect
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS similar_engagement (
+        user_id TEXT NOT NULL,
+        reel_id TEXT NOT NULL,
+        weight INTEGER NOT NULL,
+        ts REAL NOT NULL,
+        PRIMARY KEY (user_id, reel_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS similar_engagement_recent
+        ON similar_engagement (reel_id, ts) WHERE weight > 0;
+    CREATE TABLE IF NOT EXISTS similar_degree (
+        reel_id TEXT PRIMARY KEY,
+        learners INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS similar_reels (
+        reel_id TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        neighbor_id TEXT NOT NULL,
+        score REAL NOT NULL,
+        PRIMARY KEY (reel_id, rank)
+    ) WITHOUT ROWID;
+"""
+
+# Net likes + saves per (learner, reel) in one seq range of the event log.
+# Unlikes and unsaves carry -1, so a weight of 0 means "no longer engaged".
+CHUNK_SQL = """
+    SELECT user_id, reel_id, SUM(value) AS delta, MAX(ts) AS ts
+    FROM events
+    WHERE seq > ? AND seq <= ? AND kind IN ('like', 'save') AND user_id IS NOT NULL
+    GROUP BY user_id, reel_id
+"""
+# Learners per reel move by the (learner, reel) weights that cross zero; run
+# before FOLD_SQL so the join still sees the old weights.
+DEGREE_SQL = f"""
+    INSERT INTO similar_degree (reel_id, learners)
+    SELECT chunk.reel_id, SUM((COALESCE(e.weight, 0) + chunk.delta > 0) - (COALESCE(e.weight, 0) > 0))
+    FROM ({CHUNK_SQL}) AS chunk
+    LEFT JOIN similar_engagement e ON e.user_id = chunk.user_id AND e.reel_id = chunk.reel_id
+    GROUP BY chunk.reel_id
+    ON CONFLICT (reel_id) DO UPDATE SET learners = learners + excluded.learners
+"""
+FOLD_SQL = f"""
+    INSERT INTO similar_engagement (user_id, reel_id, weight, ts)
+    SELECT user_id, reel_id, delta, ts FROM ({CHUNK_SQL}) WHERE true
+    ON CONFLICT (user_id, reel_id) DO UPDATE SET
+        weight = weight + excluded.weight,
+        ts = MAX(ts, excluded.ts)
+"""
+CHECKPOINT = "similar"
+
+
+def neighbor_table(
+    users, reels, degree, top_n: int = 20, targets=None, min_count: int = 1, max_pairs: int = 10_000_000
+):
+    """Top ``top_n`` co-engaged reels per reel from (learner, reel) engagement rows.
+
+    ``users`` and ``reels`` hold integer codes, one entry per engagement, with
+    each learner's rows contiguous; ``degree`` is the number of learners per
+    reel code. Two reels co-occur once per learner who engaged with both, and
+    a pair scores ``count / sqrt(degree[a] * degree[b])`` (cosine over the
+    learner x reel matrix). When the rows are a sample of ``a``'s learners,
+    its counts are scaled by ``degree[a]`` over the learners present. Pairs
+    are expanded one block of reels at a time, about ``max_pairs`` at once,
+    so memory stays bounded on large logs.
+
+    Returns ``(reel, rank, neighbor, score)`` arrays sorted by reel and rank,
+    only for the reel codes in ``targets`` when given.
+    """
+    users = np.asarray(users)
+    reels = np.asarray(reels, dtype=np.int64)
+    degree = np.asarray(degree, dtype=np.float64)
+    n = len(users)
+    empty = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64))
+    if n == 0:
+        return empty
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    row_start = np.repeat(starts, sizes)  # first row of each engagement's learner
+    row_size = np.repeat(sizes, sizes)
+    scale = degree / np.maximum(np.bincount(reels, minlength=len(degree)), 1)
+
+    order = np.argsort(reels, kind="stable")
+    if targets is not None:
+        order = order[np.isin(reels[order], np.asarray(targets, dtype=np.int64))]
+    if len(order) == 0:
+        return empty
+    sorted_reels = reels[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_reels[1:] != sorted_reels[:-1]])
+    pairs_before = np.r_[0, np.cumsum(row_size[order])]
+    cuts = [0]
+    for start in group_starts[1:].tolist():
+        if pairs_before[start] - pairs_before[cuts[-1]] >= max_pairs:
+            cuts.append(start)
+    cuts.append(len(order))
+
+    blocks = []
+    for lo, hi in zip(cuts, cuts[1:]):
+        rows = order[lo:hi]
+        size = row_size[rows]
+        total = int(size.sum())
+        left = np.repeat(reels[rows], size)
+        right = reels[np.repeat(row_start[rows] - (np.cumsum(size) - size), size) + np.arange(total)]
+        keep = left != right
+        keys, counts = np.unique(left[keep] * len(degree) + right[keep], return_counts=True)
+        if min_count > 1:
+            keys, counts = keys[counts >= min_count], counts[counts >= min_count]
+        a, b = np.divmod(keys, len(degree))
+        score = counts * scale[a] / np.sqrt(degree[a] * degree[b])
+        ranked = np.lexsort((b, -score, a))
+        a, b, score = a[ranked], b[ranked], score[ranked]
+        if not len(a):
+            continue
+        firsts = np.flatnonzero(np.r_[True, a[1:] != a[:-1]])
+        rank = np.arange(len(a)) - np.repeat(firsts, np.diff(np.r_[firsts, len(a)]))
+        top = rank < top_n
+        blocks.append((a[top], rank[top], b[top], score[top]))
+    if not blocks:
+        return empty
+    return tuple(np.concatenate(column) for column in zip(*blocks))
+
+
+class SimilarReels:
+    """Item-to-item "similar reels" from all learners' likes and saves.
+
+    ``catch_up`` folds new like/save events into per-(learner, reel) weights
+    and per-reel learner counts, checkpointed on the event ``seq`` like the
+    rollups, then recomputes the neighbour lists of just the reels that were
+    liked or saved, from each one's ``max_reel_learners`` most recent
+    learners. Other lists pick the change up at the next ``rebuild``, which
+    recomputes everything and caps each learner at their ``max_user_items``
+    most recent reels. The top ``top_n`` neighbours live in the
+    ``similar_reels`` table and in a dict, so lookups are O(1).
+    """
+
+    def __init__(
+        self,
+        path: str = "bite_sized.db",
+        top_n: int = 20,
+        max_user_items: int = 200,
+        max_reel_learners: int = 200,
+        chunk_size: int = 100_000,
+        max_incremental_reels: int = 1_000,
+    ):
+        self.path = path
+        self.top_n = top_n
+        self.max_user_items = max_user_items
+        self.max_reel_learners = max_reel_learners
+        self.chunk_size = chunk_size
+        self.max_incremental_reels = max_incremental_reels
+        with connect(path) as conn:
+            conn.executescript(EVENTS_SCHEMA)
+            conn.executescript(SCHEMA)
+        self._neighbors = None  # reel id -> [(neighbour id, score)], best first
+        self._lock = threading.Lock()  # one catch-up / rebuild at a time
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _table(self) -> dict:
+        neighbors = self._neighbors
+        if neighbors is None:
+            with self._load_lock:
+                if self._neighbors is None:
+                    with connect(self.path) as conn:
+                        loaded = {}
+                        for reel_id, neighbor_id, score in conn.execute(
+                            "SELECT reel_id, neighbor_id, score FROM similar_reels ORDER BY reel_id, rank"
+                        ):
+                            loaded.setdefault(reel_id, []).append((neighbor_id, score))
+                    self._neighbors = loaded
+                neighbors = self._neighbors
+        return neighbors
+
+    def neighbors(self, reel_id: str, limit: int = None):
+        """Ids of the reels most co-engaged with ``reel_id``, best first."""
+        return [neighbor for neighbor, _ in self._table().get(reel_id, ())[:limit]]
+
+    def blend(self, reel_ids, per_reel: int = 5):
+        """Neighbours of several reels merged by summed score, excluding the reels themselves."""
+        table = self._table()
+        seen = set(reel_ids)
+        scores = {}
+        for reel_id in seen:
+            for neighbor, score in table.get(reel_id, ())[:per_reel]:
+                if neighbor not in seen:
+                    scores[neighbor] = scores.get(neighbor, 0.0) + score
+        return sorted(scores, key=lambda neighbor: (-scores[neighbor], neighbor))
+
+    def __len__(self):
+        return len(self._table())
+
+    def catch_up(self, max_chunks: int = None, refresh: bool = True) -> int:
+        """Fold pending like/save events and refresh the affected reels; returns how many reels changed.
+
+        With ``refresh=False`` the events are only folded, e.g. ahead of a ``rebuild``.
+        """
+        with self._lock, connect(self.path) as conn:
+            row = conn.execute("SELECT seq FROM rollup_checkpoint WHERE name = ?", (CHECKPOINT,)).fetchone()
+            checkpoint = row[0] if row else 0
+            (head,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()
+            reels = set()
+            chunks = 0
+            while checkpoint < head and (max_chunks is None or chunks < max_chunks):
+                upper = min(checkpoint + self.chunk_size, head)
+                with conn:
+                    conn.execute(DEGREE_SQL, (checkpoint, upper))
+                    conn.execute(FOLD_SQL, (checkpoint, upper))
+                    conn.execute(
+                        "INSERT INTO rollup_checkpoint (name, seq) VALUES (?, ?) "
+                        "ON CONFLICT (name) DO UPDATE SET seq = excluded.seq",
+                        (CHECKPOINT, upper),
+                    )
+                reels.update(
+                    reel_id
+                    for (reel_id,) in conn.execute(
+                        "SELECT DISTINCT reel_id FROM events WHERE seq > ? AND seq <= ? "
+                        "AND kind IN ('like', 'save') AND user_id IS NOT NULL",
+                        (checkpoint, upper),
+                    )
+                )
+                checkpoint = upper
+                chunks += 1
+            if refresh and len(reels) > self.max_incremental_reels:
+                self._rebuild(conn)
+            elif refresh and reels:
+                self._refresh(conn, reels)
+        return len(reels)
+
+    def rebuild(self):
+        """Recompute every neighbour list from the folded engagement weights."""
+        with self._lock, connect(self.path) as conn:
+            self._rebuild(conn)
+
+    def _read(self, rows, reel_ids=None):
+        """Code ``(user_id, reel_id, ts)`` rows, grouped by learner, into arrays."""
+        coding = {reel_id: code for code, reel_id in enumerate(reel_ids or ())}
+        users, reels, stamps = array("q"), array("q"), array("d")
+        previous, user = None, -1
+        for user_id, reel_id, ts in rows:
+            if user_id != previous:
+                previous, user = user_id, user + 1
+            users.append(user)
+            reels.append(coding.setdefault(reel_id, len(coding)))
+            stamps.append(ts)
+        users, reels, stamps = np.frombuffer(users, np.int64), np.frombuffer(reels, np.int64), np.frombuffer(stamps)
+        # Keep each learner's most recent reels only: a heavy learner adds pairs quadratically.
+        order = np.lexsort((-stamps, users))
+        users, reels = users[order], reels[order]
+        if len(users):
+            starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+            rank = np.arange(len(users)) - np.repeat(starts, np.diff(np.r_[starts, len(users)]))
+            users, reels = users[rank < self.max_user_items], reels[rank < self.max_user_items]
+        return users, reels, list(coding)
+
+    def _rebuild(self, conn):
+        rows = conn.execute("SELECT user_id, reel_id, ts FROM similar_engagement WHERE weight > 0 ORDER BY user_id")
+        users, reels, ids = self._read(rows)
+        table = neighbor_table(users, reels, np.bincount(reels, minlength=len(ids)), self.top_n)
+        neighbors = self._store(conn, ids, table)
+        with self._load_lock:
+            self._neighbors = neighbors
+
+    def _refresh(self, conn, targets):
+        """Recompute the lists of ``targets`` from their most recent learners' engagements."""
+        table = self._table()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS similar_learners (user_id TEXT PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS similar_related (reel_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM similar_learners")
+        conn.execute("DELETE FROM similar_related")
+        for reel_id in targets:
+            conn.execute(
+                "INSERT OR IGNORE INTO similar_learners SELECT user_id FROM similar_engagement "
+                "WHERE reel_id = ? AND weight > 0 ORDER BY ts DESC LIMIT ?",
+                (reel_id, self.max_reel_learners),
+            )
+        rows = conn.execute(
+            "SELECT user_id, reel_id, ts FROM similar_engagement "
+            "WHERE user_id IN (SELECT user_id FROM similar_learners) AND weight > 0 ORDER BY user_id"
+        )
+        learners, reels, ids = self._read(rows)
+        conn.executemany("INSERT INTO similar_related VALUES (?)", ((reel_id,) for reel_id in ids))
+        coding = {reel_id: code for code, reel_id in enumerate(ids)}
+        degree = np.zeros(len(ids))
+        for reel_id, count in conn.execute(
+            "SELECT reel_id, learners FROM similar_degree WHERE reel_id IN (SELECT reel_id FROM similar_related)"
+        ):
+            degree[coding[reel_id]] = count
+        result = neighbor_table(
+            learners, reels, degree, self.top_n, targets=[coding[reel_id] for reel_id in targets if reel_id in coding]
+        )
+        conn.executemany("DELETE FROM similar_reels WHERE reel_id = ?", ((reel_id,) for reel_id in targets))
+        neighbors = self._store(conn, ids, result, replace=False)
+        for reel_id in targets:
+            if reel_id in neighbors:
+                table[reel_id] = neighbors[reel_id]
+            else:
+                table.pop(reel_id, None)
+
+    def _store(self, conn, ids, table, replace: bool = True) -> dict:
+        """Write neighbour rows (replacing the whole table by default); returns them as a dict."""
+        reel, rank, neighbor, score = (column.tolist() for column in table)
+        rows = [(ids[r], k, ids[b], s) for r, k, b, s in zip(reel, rank, neighbor, score)]
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM similar_reels")
+            conn.executemany("INSERT INTO similar_reels (reel_id, rank, neighbor_id, score) VALUES (?, ?, ?, ?)", rows)
+        neighbors = {}
+        for reel_id, _, neighbor_id, value in rows:
+            neighbors.setdefault(reel_id, []).append((neighbor_id, value))
+        return neighbors
+
+    def start(self, interval: float = 10.0, rebuild_every: int = 360):
+        """Keep catching up in a daemon thread every ``interval`` seconds, rebuilding every ``rebuild_every`` runs."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, args=(interval, rebuild_every), name="similar-reels", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval, rebuild_every):
+        runs = 0
+        while True:
+            self.catch_up()
+            runs += 1
+            if runs % rebuild_every == 0:
+                self.rebuild()
+            if self._stop.wait(interval):
+                return
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold new likes/saves into the similar-reels table, or rebuild it.")
+    parser.add_argument("--db", default="bite_sized.db")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every reel's neighbours")
+    args = parser.parse_args()
+    index = SimilarReels(args.db)
+    print(f"{index.catch_up(refresh=not args.rebuild)} reels changed")
+    if args.rebuild:
+        index.rebuild()
+    print(f"{len(index)} reels with neighbours")
+
+
+if __name__ == "__main__":
+    main()
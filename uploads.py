@@ -0,0 +1,278 @@
+import csv
+import io
+import json
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from analytics import connect
+from media import is_playable_url, parse_duration
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS uploads (
+        creator_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        upload_id TEXT NOT NULL,
+        ts REAL NOT NULL,
+        title TEXT NOT NULL,
+        topic TEXT NOT NULL,
+        difficulty TEXT NOT NULL,
+        duration INTEGER NOT NULL,
+        tags TEXT NOT NULL,
+        video_url TEXT NOT NULL,
+        PRIMARY KEY (creator_id, seq)
+    ) WITHOUT ROWID;
+"""
+COLUMNS = ("upload_id", "ts", "title", "topic", "difficulty", "duration", "tags", "video_url")
+
+DIFFICULTIES = ("Beginner", "Intermediate", "Advanced")
+MIN_SECONDS, MAX_SECONDS = 30, 90
+MAX_TITLE_LENGTH = 120
+MAX_REPORTED_ERRORS = 10_000
+
+
+class UploadStore:
+    """Creator uploads, read newest-first one page at a time with a ``seq`` cursor."""
+
+    def __init__(self, path: str = "bite_sized.db"):
+        self.path = path
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._lock = threading.Lock()  # serialises seq allocation between importers
+
+    def insert_many(self, creator_id: str, uploads) -> int:
+        """Insert validated uploads in one transaction; returns how many."""
+        now = time.time()
+        with self._lock, connect(self.path) as conn:
+            (last,) = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM uploads WHERE creator_id = ?", (creator_id,)
+            ).fetchone()
+            conn.executemany(
+                f"INSERT INTO uploads (creator_id, seq, {', '.join(COLUMNS)}) VALUES (?, ?, {', '.join('?' * len(COLUMNS))})",
+                [
+                    (creator_id, last + i, *(upload.get(c, now) if c == "ts" else upload[c] for c in COLUMNS))
+                    for i, upload in enumerate(uploads, start=1)
+                ],
+            )
+        return len(uploads)
+
+    def page(self, creator_id: str, before: int = None, limit: int = 20):
+        """Return ``(uploads, next_cursor)`` newest first; ``next_cursor`` is None on the last page."""
+        with connect(self.path) as conn:
+            rows = conn.execute(
+                f"SELECT seq, {', '.join(COLUMNS)} FROM uploads WHERE creator_id = ? AND seq < ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (creator_id, before if before is not None else 2**63 - 1, limit),
+            ).fetchall()
+        uploads = [dict(zip(("seq", *COLUMNS), row)) for row in rows]
+        next_cursor = rows[-1][0] if len(rows) == limit and rows[-1][0] > 1 else None
+        return uploads, next_cursor
+
+    def count(self, creator_id: str) -> int:
+        # seq is dense per creator and uploads are never deleted.
+        with connect(self.path) as conn:
+            (count,) = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM uploads WHERE creator_id = ?", (creator_id,)
+            ).fetchone()
+        return count
+
+    def iter_all(self, batch_size: int = 10_000):
+        with connect(self.path) as conn:
+            cursor = conn.execute(f"SELECT creator_id, {', '.join(COLUMNS)} FROM uploads")
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield dict(zip(("creator_id", *COLUMNS), row))
+
+
+def validate_upload(row: dict, topics) -> tuple:
+    """Normalise one submitted row; returns ``(upload, errors)`` with ``upload`` None when invalid."""
+    row = {str(key).strip().lower(): value for key, value in row.items() if key is not None}
+    errors = []
+    title = str(row.get("title") or "").strip()
+    if not title:
+        errors.append("title is required")
+    elif len(title) > MAX_TITLE_LENGTH:
+        errors.append(f"title is longer than {MAX_TITLE_LENGTH} characters")
+    topic = str(row.get("topic") or "").strip()
+    if topic not in topics:
+        errors.append(f"unknown topic {topic!r}")
+    difficulty = str(row.get("difficulty") or "Beginner").strip()
+    if difficulty not in DIFFICULTIES:
+        errors.append(f"unknown difficulty {difficulty!r}")
+    duration = parse_duration(str(row.get("duration") or "").strip())
+    if not MIN_SECONDS <= duration <= MAX_SECONDS:
+        errors.append(f"duration must be {MIN_SECONDS}-{MAX_SECONDS}s")
+    video_url = str(row.get("video_url") or "").strip()
+    if not is_playable_url(video_url):
+        errors.append("video_url is not a YouTube or http(s) link")
+    if errors:
+        return None, errors
+    upload = {
+        "upload_id": uuid.uuid4().hex,
+        "title": title,
+        "topic": topic,
+        "difficulty": difficulty,
+        "duration": duration,
+        "tags": str(row.get("tags") or "").strip(),
+        "video_url": video_url,
+    }
+    return upload, []
+
+
+def validate_chunk(rows, topics):
+    """Worker-pool entry point: ``[(line, row)]`` -> ``[(line, upload, errors)]``."""
+    results = []
+    for line, row in rows:
+        if isinstance(row, str):  # the reader could not parse this line
+            results.append((line, None, [row]))
+        else:
+            results.append((line, *validate_upload(row, topics)))
+    return results
+
+
+def error_report(errors) -> str:
+    """CSV text of ``(line, message)`` row errors."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(("line", "error"))
+    writer.writerows(errors)
+    return out.getvalue()
+
+
+def read_rows(fileobj, filename: str):
+    """Stream ``(line, row)`` pairs from a CSV or JSONL upload; unparseable lines yield an error string."""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    if filename.lower().endswith((".jsonl", ".ndjson")):
+        for line, raw in enumerate(text, start=1):
+            if not raw.strip():
+                continue
+            try:
+                row = json.loads(raw)
+            except ValueError as exc:
+                yield line, f"invalid JSON: {exc}"
+                continue
+            yield line, row if isinstance(row, dict) else "expected a JSON object"
+    else:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+
+
+class BulkImport:
+    """One background CSV/JSONL import.
+
+    A reader thread streams the file in chunks of ``chunk_rows``, validates
+    chunks in a process pool (at most two chunks in flight per worker) and
+    commits valid rows in batches of ``batch_rows``. Progress counters and
+    the first ``MAX_REPORTED_ERRORS`` row errors can be read at any time.
+    """
+
+    def __init__(
+        self,
+        store: UploadStore,
+        creator_id: str,
+        fileobj,
+        filename: str,
+        topics,
+        on_commit=None,
+        workers: int = 2,
+        chunk_rows: int = 500,
+        batch_rows: int = 2_000,
+    ):
+        self.store = store
+        self.creator_id = creator_id
+        self.filename = filename
+        self.topics = tuple(topics)
+        self.on_commit = on_commit
+        self.workers = workers
+        self.chunk_rows = chunk_rows
+        self.batch_rows = batch_rows
+        self.status = "running"
+        self.rows_read = 0
+        self.bytes_read = 0
+        self.rows_committed = 0
+        self.error_count = 0
+        self.errors = []  # (line, message)
+        self.started = time.time()
+        self.finished = None
+        self._fileobj = fileobj
+        fileobj.seek(0, io.SEEK_END)
+        self.total_bytes = fileobj.tell()
+        fileobj.seek(0)
+        self._batch = []
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bulk-import", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    @property
+    def progress(self) -> float:
+        if self.done or not self.total_bytes:
+            return 1.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def join(self, timeout: float = None):
+        self._thread.join(timeout)
+
+    def _chunks(self):
+        chunk = []
+        for item in read_rows(self._fileobj, self.filename):
+            chunk.append(item)
+            self.rows_read += 1
+            if len(chunk) >= self.chunk_rows:
+                self.bytes_read = self._fileobj.tell()
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _run(self):
+        try:
+            # spawn: forking a process that runs server threads is unsafe.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(self.workers, mp_context=context) as pool:
+                in_flight = deque()
+                for chunk in self._chunks():
+                    if self._cancel.is_set():
+                        break
+                    in_flight.append(pool.submit(validate_chunk, chunk, self.topics))
+                    if len(in_flight) >= 2 * self.workers:
+                        self._collect(in_flight.popleft().result())
+                while in_flight:
+                    self._collect(in_flight.popleft().result())
+            self._commit()
+            self.status = "cancelled" if self._cancel.is_set() else "done"
+        except Exception as exc:
+            self.errors.append((None, f"import stopped: {exc}"))
+            self.status = "failed"
+        finally:
+            self.finished = time.time()
+
+    def _collect(self, results):
+        for line, upload, errors in results:
+            if upload is None:
+                self.error_count += 1
+                if len(self.errors) < MAX_REPORTED_ERRORS:
+                    self.errors.append((line, "; ".join(errors)))
+                continue
+            self._batch.append(upload)
+            if len(self._batch) >= self.batch_rows:
+                self._commit()
+
+    def _commit(self):
+        if not self._batch or self._cancel.is_set():
+            return
+        batch, self._batch = self._batch, []
+        self.store.insert_many(self.creator_id, batch)
+        self.rows_committed += len(batch)
+        if self.on_commit is not None:
+            self.on_commit(batch)
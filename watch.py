@@ -0,0 +1,142 @@
+import datetime
+import time
+
+from analytics import connect
+from persistence import WriteBehindQueue
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS watch_daily (
+        user_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        seconds REAL NOT NULL DEFAULT 0,
+        completions INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day)
+    ) WITHOUT ROWID
+"""
+
+
+class WatchSessionTracker:
+    """Ingests playback heartbeats and keeps each learner's daily watch rollup.
+
+    ``heartbeat`` only enqueues. A background thread turns batches of
+    heartbeats into watched-seconds and completion deltas per (learner, day)
+    and upserts them into ``watch_daily``. Open sessions are tracked in
+    memory and dropped once idle, so memory is bounded by concurrent viewers.
+    ``on_complete(user_id, reel_id, ts)`` is called on that thread whenever a
+    session crosses the completion ratio.
+    """
+
+    def __init__(
+        self,
+        path: str = "bite_sized.db",
+        event_log=None,
+        on_complete=None,
+        max_gap: float = 30.0,
+        completion_ratio: float = 0.9,
+        idle_timeout: float = 600.0,
+        max_batch: int = 1000,
+        flush_interval: float = 1.0,
+    ):
+        self.path = path
+        self.event_log = event_log
+        self.on_complete = on_complete
+        self.max_gap = max_gap
+        self.completion_ratio = completion_ratio
+        self.idle_timeout = idle_timeout
+        with connect(path) as conn:
+            conn.execute(SCHEMA)
+        self._sessions = {}  # session_id -> [last_ts, last_position, completed]; writer thread only
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(self._aggregate, max_batch, flush_interval, name="watch-aggregator")
+
+    def heartbeat(
+        self,
+        user_id: str,
+        session_id: str,
+        reel_id: str,
+        position: float,
+        duration: float,
+        topic: str = None,
+        ts: float = None,
+    ):
+        """Report that ``session_id`` is at ``position`` seconds into a reel of ``duration`` seconds."""
+        self._writes.put((ts or time.time(), session_id, user_id, reel_id, position, duration, topic))
+
+    def _aggregate(self, heartbeats):
+        deltas = {}  # (user_id, day) -> [seconds, completions]
+        for ts, session_id, user_id, reel_id, position, duration, topic in sorted(heartbeats, key=lambda hb: hb[0]):
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = [ts, 0.0, False]
+            last_ts, last_position, completed = session
+            # Credit playback progress, capped by wall time and the heartbeat gap
+            # so seeks and stalled tabs do not inflate watch time.
+            watched = max(0.0, min(position - last_position, ts - last_ts, self.max_gap))
+            finished = not completed and duration > 0 and position >= duration * self.completion_ratio
+            session[:] = [ts, max(position, last_position), completed or finished]
+
+            if watched or finished:
+                day = datetime.datetime.fromtimestamp(ts).date().isoformat()
+                delta = deltas.setdefault((user_id, day), [0.0, 0])
+                delta[0] += watched
+                delta[1] += finished
+                if watched and self.event_log is not None:
+                    self.event_log.append("watch", reel_id, topic=topic, user_id=user_id, value=watched, ts=ts)
+                if finished and self.on_complete is not None:
+                    self.on_complete(user_id, reel_id, ts)
+
+        horizon = time.time() - self.idle_timeout
+        for session_id in [sid for sid, session in self._sessions.items() if session[0] < horizon]:
+            del self._sessions[session_id]
+
+        if deltas:
+            if self._writer_conn is None:
+                self._writer_conn = connect(self.path)
+            with self._writer_conn as conn:
+                conn.executemany(
+                    "INSERT INTO watch_daily (user_id, day, seconds, completions) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (user_id, day) DO UPDATE SET "
+                    "seconds = seconds + excluded.seconds, completions = completions + excluded.completions",
+                    [(user_id, day, seconds, completions) for (user_id, day), (seconds, completions) in deltas.items()],
+                )
+
+    def daily(self, user_id: str, first_day: datetime.date, last_day: datetime.date):
+        """Rollup rows for each day in [first_day, last_day], zero-filled, oldest first."""
+        with connect(self.path) as conn:
+            rows = {
+                day: (seconds, completions)
+                for day, seconds, completions in conn.execute(
+                    "SELECT day, seconds, completions FROM watch_daily "
+                    "WHERE user_id = ? AND day BETWEEN ? AND ?",
+                    (user_id, first_day.isoformat(), last_day.isoformat()),
+                )
+            }
+        daily = []
+        for offset in range((last_day - first_day).days + 1):
+            day = first_day + datetime.timedelta(days=offset)
+            seconds, completions = rows.get(day.isoformat(), (0.0, 0))
+            daily.append({"day": day, "seconds": seconds, "completions": completions})
+        return daily
+
+    def streak(self, user_id: str, today: datetime.date) -> int:
+        """Consecutive days with watch time up to ``today``; a streak ending yesterday still counts."""
+        streak, expected = 0, today
+        with connect(self.path) as conn:
+            for (day,) in conn.execute(
+                "SELECT day FROM watch_daily WHERE user_id = ? AND day <= ? AND seconds > 0 ORDER BY day DESC",
+                (user_id, today.isoformat()),
+            ):
+                day = datetime.date.fromisoformat(day)
+                if not streak and day == today - datetime.timedelta(days=1):
+                    expected = day
+                if day != expected:
+                    break
+                streak += 1
+                expected -= datetime.timedelta(days=1)
+        return streak
+
+    def flush(self, timeout: float = None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()
@@ -0,0 +1,257 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from analytics import connect
+from leaderboard import Leaderboard
+from persistence import WriteBehindQueue
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS xp_ledger (
+        user_id TEXT NOT NULL,
+        award_key TEXT NOT NULL,
+        ts REAL NOT NULL,
+        kind TEXT NOT NULL,
+        topic TEXT,
+        points INTEGER NOT NULL,
+        PRIMARY KEY (user_id, award_key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS xp_ledger_ts ON xp_ledger (ts);
+    CREATE TABLE IF NOT EXISTS xp_badges (
+        user_id TEXT NOT NULL,
+        badge TEXT NOT NULL,
+        ts REAL NOT NULL,
+        PRIMARY KEY (user_id, badge)
+    ) WITHOUT ROWID;
+"""
+
+XP_POINTS = {"like": 5, "save": 3, "quiz": 10, "course": 25}
+# Seed entries carry starting XP: they count globally but not toward weekly, topic or badge progress.
+SEED_KIND = "seed"
+
+# (badge, counter, threshold). Counters are award counts per kind plus "earned_xp".
+BADGE_RULES = (
+    ("Quiz Rookie", "earned_xp", 30),
+    ("Micro-Course Finisher", "earned_xp", 80),
+    ("Course Closer", "course", 1),
+    ("Quiz Whiz", "quiz", 10),
+)
+
+
+def week_start(ts: float) -> float:
+    """Start (Monday 00:00 UTC) of the week containing ``ts``."""
+    day = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).date()
+    monday = day - datetime.timedelta(days=day.weekday())
+    return datetime.datetime.combine(monday, datetime.time(), datetime.timezone.utc).timestamp()
+
+
+class _Learner:
+    """Award keys, counters and badges of one learner, loaded on first touch."""
+
+    __slots__ = ("keys", "counters", "badges")
+
+    def __init__(self):
+        self.keys = set()
+        self.counters = defaultdict(int)
+        self.badges = {}  # badge -> ts, in earning order
+
+
+class XPLedger:
+    """Append-only XP ledger with live leaderboards and event-driven badges.
+
+    ``award`` is idempotent per (learner, key): quiz and course awards use the
+    ``completed_quizzes`` keys, likes and saves use the reel id. Each new award
+    updates the global, weekly and topic leaderboards in O(log n). Only the
+    badge rules watching the counters that award changed are checked.
+    Rows are written by the write-behind queue. Award keys and badges are
+    cached for the ``max_learners`` most recently seen learners; others are
+    reloaded from SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str = "bite_sized.db",
+        rules=BADGE_RULES,
+        max_batch: int = 500,
+        flush_interval: float = 0.5,
+        max_learners: int = 10_000,
+    ):
+        self.path = path
+        self.max_learners = max_learners
+        self._rules = defaultdict(list)  # counter -> [(threshold, badge)], ascending
+        for badge, counter, threshold in rules:
+            self._rules[counter].append((threshold, badge))
+        for rules_for_counter in self._rules.values():
+            rules_for_counter.sort()
+        self._lock = threading.RLock()
+        self._learners = OrderedDict()  # user_id -> _Learner, least recently used first
+        self._evicted = False
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+            self._week = week_start(time.time())
+            self._global = Leaderboard(
+                conn.execute("SELECT user_id, SUM(points) FROM xp_ledger GROUP BY user_id")
+            )
+            self._weekly = self._load_week(conn, self._week)
+            topics = defaultdict(dict)
+            for topic, user_id, points in conn.execute(
+                "SELECT topic, user_id, SUM(points) FROM xp_ledger WHERE topic IS NOT NULL "
+                "AND kind != ? GROUP BY topic, user_id",
+                (SEED_KIND,),
+            ):
+                topics[topic][user_id] = points
+        self._topic_boards = {topic: Leaderboard(scores) for topic, scores in topics.items()}
+        self._writer_conn = None
+        self._writes = WriteBehindQueue(self._apply_batch, max_batch, flush_interval, name="xp-writer")
+
+    @staticmethod
+    def _load_week(conn, start: float) -> Leaderboard:
+        return Leaderboard(
+            conn.execute(
+                "SELECT user_id, SUM(points) FROM xp_ledger WHERE ts >= ? AND kind != ? GROUP BY user_id",
+                (start, SEED_KIND),
+            )
+        )
+
+    def _apply_batch(self, rows):
+        if self._writer_conn is None:
+            self._writer_conn = connect(self.path)
+        with self._writer_conn as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO xp_ledger (user_id, award_key, ts, kind, topic, points) VALUES (?, ?, ?, ?, ?, ?)",
+                [row for table, row in rows if table == "xp_ledger"],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO xp_badges (user_id, badge, ts) VALUES (?, ?, ?)",
+                [row for table, row in rows if table == "xp_badges"],
+            )
+
+    def _learner(self, user_id: str) -> _Learner:
+        learner = self._learners.get(user_id)
+        if learner is not None:
+            self._learners.move_to_end(user_id)
+            return learner
+        if self._evicted:
+            # An evicted learner's last awards may still be queued; reload them too.
+            self._writes.flush()
+        learner = _Learner()
+        with connect(self.path) as conn:
+            for key, kind, points in conn.execute(
+                "SELECT award_key, kind, points FROM xp_ledger WHERE user_id = ?", (user_id,)
+            ):
+                learner.keys.add(key)
+                self._count(learner, kind, points)
+            for badge, ts in conn.execute(
+                "SELECT badge, ts FROM xp_badges WHERE user_id = ? ORDER BY ts", (user_id,)
+            ):
+                learner.badges[badge] = ts
+        self._learners[user_id] = learner
+        while len(self._learners) > self.max_learners:
+            self._learners.popitem(last=False)
+            self._evicted = True
+        # Catch up on rules added since this learner's last award.
+        self._evaluate(user_id, learner, list(self._rules), time.time())
+        return learner
+
+    @staticmethod
+    def _count(learner: _Learner, kind: str, points: int):
+        if kind == SEED_KIND:
+            return
+        learner.counters[kind] += 1
+        learner.counters["earned_xp"] += points
+
+    def _evaluate(self, user_id: str, learner: _Learner, counters, ts: float):
+        earned = []
+        for counter in counters:
+            value = learner.counters[counter]
+            for threshold, badge in self._rules.get(counter, ()):
+                if threshold > value:
+                    break
+                if badge not in learner.badges:
+                    learner.badges[badge] = ts
+                    earned.append(badge)
+                    self._writes.put(("xp_badges", (user_id, badge, ts)))
+        return earned
+
+    def award(self, user_id: str, key: str, kind: str, points: int = None, topic: str = None, ts: float = None):
+        """Record an award once per (learner, key).
+
+        Returns the badges this award unlocked (often empty), or None when ``key`` was already awarded.
+        """
+        points = XP_POINTS[kind] if points is None else points
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            learner = self._learner(user_id)
+            if key in learner.keys:
+                return None
+            learner.keys.add(key)
+            # Roll the weekly board over first: the rebuild reads the ledger, which must not hold this award yet.
+            weekly = None if kind == SEED_KIND else self._board("weekly")
+            self._writes.put(("xp_ledger", (user_id, key, ts, kind, topic, points)))
+            self._global.add(user_id, points)
+            if weekly is None:
+                return []
+            weekly.add(user_id, points)
+            if topic is not None:
+                board = self._topic_boards.get(topic)
+                if board is None:
+                    board = self._topic_boards[topic] = Leaderboard()
+                board.add(user_id, points)
+            self._count(learner, kind, points)
+            return self._evaluate(user_id, learner, (kind, "earned_xp"), ts)
+
+    def has(self, user_id: str, key: str) -> bool:
+        with self._lock:
+            return key in self._learner(user_id).keys
+
+    def badges(self, user_id: str):
+        with self._lock:
+            return list(self._learner(user_id).badges)
+
+    def _board(self, scope: str, topic: str = None) -> Leaderboard:
+        if scope == "global":
+            return self._global
+        if scope == "weekly":
+            start = week_start(time.time())
+            if start != self._week:
+                # A new week starts empty; older weeks stay in the ledger.
+                self._writes.flush()
+                with connect(self.path) as conn:
+                    self._weekly = self._load_week(conn, start)
+                self._week = start
+            return self._weekly
+        if scope == "topic":
+            return self._topic_boards.get(topic) or Leaderboard()
+        raise ValueError(f"Unknown leaderboard scope: {scope}")
+
+    def total(self, user_id: str) -> int:
+        with self._lock:
+            return self._global.score(user_id)
+
+    def top(self, n: int = 10, scope: str = "global", topic: str = None):
+        """``[(rank, user_id, xp)]`` for the best ``n`` learners of a scope ("global", "weekly" or "topic")."""
+        with self._lock:
+            return self._board(scope, topic).top(n)
+
+    def rank(self, user_id: str, scope: str = "global", topic: str = None):
+        with self._lock:
+            return self._board(scope, topic).rank(user_id)
+
+    def around(self, user_id: str, radius: int = 2, scope: str = "global", topic: str = None):
+        with self._lock:
+            return self._board(scope, topic).around(user_id, radius)
+
+    def size(self, scope: str = "global", topic: str = None) -> int:
+        with self._lock:
+            return len(self._board(scope, topic))
+
+    def topics(self):
+        with self._lock:
+            return sorted(self._topic_boards)
+
+    def flush(self, timeout: float = None):
+        return self._writes.flush(timeout)
+
+    def close(self):
+        self._writes.close()